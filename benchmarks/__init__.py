@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput and memory benchmarks of related, run with: python -m benchmarks
+"""
+
+from .datasets import DATASETS
+from .runner import OPERATIONS, run, compare, save, load
+
+__all__ = [
+    "DATASETS",
+    "OPERATIONS",
+    "run",
+    "compare",
+    "save",
+    "load",
+]
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Command line interface of the benchmarks, e.g.
+
+    python -m benchmarks --scale 1000 --output results.json
+    python -m benchmarks --baseline results.json --threshold 0.2
+"""
+import argparse
+import sys
+
+from .datasets import DATASETS
+from .runner import OPERATIONS, run, compare, save, load
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time related load, dump and round trip operations.")
+    parser.add_argument("--scale", type=int, default=1000,
+                        help="number of records of each dataset")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of timed calls of each operation")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS),
+                        help="datasets to run (default: all)")
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS,
+                        help="operations to run (default: all)")
+    parser.add_argument("--output", help="file to save the results to")
+    parser.add_argument("--baseline", help="results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed relative regression (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    results = run(scale=args.scale, repeat=args.repeat,
+                  datasets=args.datasets, operations=args.operations)
+
+    for name, result in results["results"].items():
+        peak = result["peak_bytes"]
+        print("{:<24} {:>10.2f} ms {:>12}".format(
+            name, result["seconds"] * 1000,
+            "-" if peak is None else "{:,} B".format(peak)))
+
+    if args.output:
+        save(results, args.output)
+
+    if args.baseline:
+        regressions = compare(results, load(args.baseline), args.threshold)
+
+        for name, metric, before, after, ratio in regressions:
+            print("REGRESSION {} {}: {} -> {} ({:+.0%})".format(
+                name, metric, before, after, ratio - 1))
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic datasets built from the example models found in the tests folder.
+Each dataset function takes a scale (n) and returns the model class and the
+raw (JSON compatible) dictionary of a document with about n records.
+"""
+import sys
+from collections import OrderedDict
+from datetime import date, timedelta
+from os.path import abspath, dirname, join
+
+import related
+
+TESTS_DIR = join(dirname(dirname(abspath(__file__))), "tests")
+if TESTS_DIR not in sys.path:
+    sys.path.insert(0, TESTS_DIR)
+
+from ex02_compose_v3_2.models import Compose  # noqa E402
+from ex04_contact.models import Person  # noqa E402
+from ex06_json.models import StoreData  # noqa E402
+from ex08_self_reference.models import Node  # noqa E402
+
+
+@related.immutable
+class Contacts(object):
+    people = related.SequenceField(Person)
+
+
+def compose(n):
+    """ Compose file with n services, each with short and long form ports. """
+    services = OrderedDict()
+
+    for i in range(n):
+        port = OrderedDict([("target", 443), ("published", 9000 + i % 1000),
+                            ("protocol", "tcp"), ("mode", "host")])
+        services["service%d" % i] = OrderedDict([
+            ("image", "registry.example.com/app%d:latest" % i),
+            ("ports", ["%d:80" % (8000 + i % 1000), port]),
+            ("volumes", ["/data/%d:/var/lib/data" % i]),
+            ("command", "run --worker %d" % i),
+        ])
+
+    return Compose, OrderedDict([("version", "3.2"), ("services", services)])
+
+
+def store(n):
+    """ Store data with n days of sales. """
+    start = date(2017, 1, 1)
+    days = []
+
+    for i in range(n):
+        days.append(OrderedDict([
+            ("date", (start + timedelta(days=i)).strftime("%Y-%m-%d")),
+            ("logged_on", "19:20"),
+            ("open_at", "08:00:00"),
+            ("closed_on", "19:00:00"),
+            ("customers", 100 + i % 400),
+            ("day_type", "Holiday" if i % 7 == 0 else "Normal"),
+            ("sales", round(1000 + i * 1.5, 2)),
+        ]))
+
+    return StoreData, OrderedDict([
+        ("name", "Acme store"),
+        ("id", 982),
+        ("created_on", "12/21/2017 14:21:55"),
+        ("data_from", "2017-01-01T00:00:00"),
+        ("data_to", "2017-12-31T23:59:59"),
+        ("days", days),
+        ("price", "98237.448"),
+    ])
+
+
+def contacts(n):
+    """ Contact list of n people with an address and education history. """
+    people = []
+
+    for i in range(n):
+        people.append(OrderedDict([
+            ("name", "Person %d" % i),
+            ("age", 20 + i % 60),
+            ("address", OrderedDict([("street", "%d Main St" % i),
+                                     ("city", "Springfield"),
+                                     ("zipcode", "%05d" % (i % 100000))])),
+            ("education", [
+                OrderedDict([("school", "State University"),
+                             ("degree", "Bachelor's"),
+                             ("field_of_study", "Physics"),
+                             ("from_year", 1990 + i % 20),
+                             ("to_year", 1994 + i % 20)]),
+            ]),
+        ]))
+
+    return Contacts, OrderedDict([("people", people)])
+
+
+def nodes(n):
+    """ Self-referential tree of n nodes, each with up to 3 children. """
+    all_nodes = [OrderedDict([("name", "node0")])]
+
+    for i in range(1, n):
+        node = OrderedDict([("name", "node%d" % i)])
+        parent = all_nodes[(i - 1) // 3]
+        slot = (i - 1) % 3
+
+        if slot == 0:
+            parent["node_child"] = node
+        elif slot == 1:
+            parent.setdefault("node_list", []).append(node)
+        else:
+            parent.setdefault("node_map", OrderedDict())[node["name"]] = node
+
+        all_nodes.append(node)
+
+    return Node, all_nodes[0]
+
+
+DATASETS = OrderedDict([
+    ("compose", compose),
+    ("store", store),
+    ("contacts", contacts),
+    ("nodes", nodes),
+])
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Times the load, dump and round trip operations of related on the synthetic
+datasets, records their peak memory and compares results with a baseline.
+"""
+import gc
+import json
+import platform
+import time
+from collections import OrderedDict
+
+import related
+
+from .datasets import DATASETS
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover (python 2)
+    tracemalloc = None
+
+timer = getattr(time, "perf_counter", time.time)
+
+OPERATIONS = ("from_json", "from_yaml", "to_dict", "to_json", "to_yaml",
+              "round_trip")
+
+# dumped documents must load back into the model (e.g. the private short form
+# of the compose Port is not an __init__ argument), see ex02_compose_v3_2.
+DUMP_KWARGS = dict(suppress_private_attr=True, suppress_empty_values=True)
+
+
+def prepare(cls, data):
+    """
+    Returns the operations of a dataset as name to (no argument) function.
+    The inputs (model, json and yaml strings) are built upfront, so that
+    only the operation itself is measured.
+    """
+    json_text = json.dumps(data)
+    yaml_text = related.to_yaml(data)
+    model = related.from_json(json_text, cls)
+
+    return OrderedDict([
+        ("from_json", lambda: related.from_json(json_text, cls)),
+        ("from_yaml", lambda: related.from_yaml(yaml_text, cls)),
+        ("to_dict", lambda: related.to_dict(model, **DUMP_KWARGS)),
+        ("to_json", lambda: related.to_json(model, **DUMP_KWARGS)),
+        ("to_yaml", lambda: related.to_yaml(model, **DUMP_KWARGS)),
+        ("round_trip", lambda: related.from_json(
+            related.to_json(model, **DUMP_KWARGS), cls)),
+    ])
+
+
+def measure(func, repeat):
+    """
+    Returns the best and mean duration (seconds) of repeat calls of func,
+    and the peak memory (bytes) allocated by a single call (if tracemalloc
+    is available).
+    """
+    durations = []
+
+    for _ in range(repeat):
+        gc.collect()
+        start = timer()
+        func()
+        durations.append(timer() - start)
+
+    peak_bytes = None
+    if tracemalloc is not None:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return OrderedDict([
+        ("seconds", min(durations)),
+        ("mean_seconds", sum(durations) / len(durations)),
+        ("peak_bytes", peak_bytes),
+    ])
+
+
+def run(scale=1000, repeat=5, datasets=None, operations=None):
+    """
+    Run the benchmarks and return the machine-readable results.
+
+    :param scale: number of records of each dataset
+    :param repeat: number of timed calls of each operation
+    :param datasets: names of the datasets to run (default: all)
+    :param operations: names of the operations to run (default: all)
+    :return: dictionary of the environment and the result of each
+             "<dataset>.<operation>" benchmark.
+    """
+    results = OrderedDict()
+
+    for dataset in datasets or DATASETS:
+        cls, data = DATASETS[dataset](scale)
+        prepared = prepare(cls, data)
+
+        for operation in operations or OPERATIONS:
+            name = "%s.%s" % (dataset, operation)
+            results[name] = measure(prepared[operation], repeat)
+
+    return OrderedDict([
+        ("python", platform.python_version()),
+        ("related", related.__version__),
+        ("scale", scale),
+        ("repeat", repeat),
+        ("results", results),
+    ])
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compare results with baseline results of the same benchmarks.
+
+    :param results: results returned by run
+    :param baseline: results returned by an earlier run
+    :param threshold: allowed relative increase (0.1 = 10%) of the best
+                      duration or of the peak memory of a benchmark
+    :return: list of (benchmark, metric, baseline, current, ratio) tuples
+             of the regressions found.
+    """
+    regressions = []
+    previous = baseline.get("results", {})
+
+    for name, current in results["results"].items():
+        if name not in previous:
+            continue
+
+        for metric in ("seconds", "peak_bytes"):
+            before, after = previous[name].get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+
+            ratio = after / float(before)
+            if ratio > 1 + threshold:
+                regressions.append((name, metric, before, after, ratio))
+
+    return regressions
+
+
+def save(results, path):
+    with open(path, "w") as stream:
+        json.dump(results, stream, indent=4)
+
+
+def load(path):
+    with open(path) as stream:
+        return json.load(stream)
@@ -27,11 +27,14 @@ setup(
 
     include_package_data=True,
 
+    python_requires=">=3.5",
+
     install_requires=[
-        "attrs",
+        # cache_hash and kw_only need 18.2, private attrs APIs are used by
+        # the generated __init__, interning and memoize (e.g. _config)
+        "attrs>=18.2.0,<23",
         "PyYAML",
         "future",
-        "singledispatch;python_version<'3.4'",
         "python-dateutil",
     ],
 
@@ -52,10 +55,8 @@ setup(
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
         'Natural Language :: English',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
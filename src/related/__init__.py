@@ -9,8 +9,11 @@ from .decorators import (
 from .types import (
     ImmutableDict,
     TypedSequence,
+    TypedArray,
     TypedMapping,
     TypedSet,
+    IndexedSequence,
+    IndexedMapping,
 )
 
 from .fields import (
@@ -32,17 +35,42 @@ from .fields import (
 )
 
 from .functions import (
+    SerializationOptions,
     from_json,
+    from_json_lines,
     from_yaml,
+    from_yaml_all,
     is_model,
     to_dict,
     to_json,
+    to_json_lines,
     to_model,
     to_yaml,
+    to_yaml_all,
 )
 
 from . import dispatchers  # noqa F401
 
+from .batch import (
+    BatchResult,
+    from_json_lines_file,
+    to_models,
+)
+
+from .encoders import (
+    ModelJSONEncoder,
+    iter_json,
+    to_json_stream,
+)
+
+from .interning import InternTable
+from .trust import Trusted
+
+from .binary import (
+    from_bytes,
+    to_bytes,
+)
+
 __all__ = [
     # decorators.py
     "mutable",
@@ -52,8 +80,11 @@ __all__ = [
     # types.py
     "ImmutableDict",
     "TypedSequence",
+    "TypedArray",
     "TypedMapping",
     "TypedSet",
+    "IndexedSequence",
+    "IndexedMapping",
 
     # fields.py
     "BooleanField",
@@ -73,13 +104,38 @@ __all__ = [
     "DecimalField",
 
     # functions.py
+    "SerializationOptions",
     "from_json",
+    "from_json_lines",
     "from_yaml",
+    "from_yaml_all",
     "is_model",
     "to_dict",
     "to_json",
+    "to_json_lines",
     "to_model",
     "to_yaml",
+    "to_yaml_all",
+
+    # batch.py
+    "BatchResult",
+    "from_json_lines_file",
+    "to_models",
+
+    # encoders.py
+    "ModelJSONEncoder",
+    "iter_json",
+    "to_json_stream",
+
+    # interning.py
+    "InternTable",
+
+    # trust.py
+    "Trusted",
+
+    # binary.py
+    "from_bytes",
+    "to_bytes",
 ]
 
 
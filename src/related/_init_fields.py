@@ -1,5 +1,6 @@
-from attr import validators, NOTHING
-from .validators import composite
+from attr import NOTHING
+from six import string_types
+from . import validators
 
 
 def init_default(required, default, optional_default):
@@ -23,13 +24,28 @@ def init_validator(required, cls, *additional_validators):
     Create an attrs validator based on the cls provided and required setting.
     :param bool required: whether the field is required in a given model.
     :param cls: the expected class type of object value.
-    :return: attrs validator chained correctly (e.g. optional(instance_of))
+    :return: attrs validator equivalent to the chained validators (e.g.
+             optional(instance_of)), compiled into a single function.
     """
-    validator = validators.instance_of(cls)
+    return validators.field(cls, required, *additional_validators)
 
-    if additional_validators:
-        additional_validators = list(additional_validators)
-        additional_validators.append(validator)
-        validator = composite(*additional_validators)
 
-    return validator if required else validators.optional(validator)
+def init_indexes(index, unique):
+    """
+    Returns the indexes of a SequenceField or MappingField.
+
+    :param index: attribute name (or names) of the items to index.
+    :param unique: attribute name (or names) of the items to index, that
+                   must be unique within the field.
+    :return: tuple of (attribute name, unique) pairs.
+    """
+    index, unique = _names(index), _names(unique)
+    indexes = [(name, False) for name in index if name not in unique]
+    indexes.extend((name, True) for name in unique)
+    return tuple(indexes)
+
+
+def _names(names):
+    if isinstance(names, string_types):
+        return (names,)
+    return tuple(names or ())
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+import mmap
+import os
+from collections import OrderedDict
+from concurrent.futures import (
+    Executor, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+)
+from itertools import islice
+from multiprocessing import cpu_count
+
+from attr import attrs, attrib
+from six import string_types, binary_type
+
+from .functions import from_json, to_model
+
+# smallest byte range of a file loaded by from_json_lines_file by default
+MIN_RANGE_SIZE = 1 << 20
+
+EXECUTORS = {
+    "process": ProcessPoolExecutor,
+    "thread": ThreadPoolExecutor,
+}
+
+
+@attrs(frozen=True, slots=True)
+class BatchResult(object):
+    """
+    Result of the conversion of the record at index (its position in the
+    input, or the byte offset of its line in a JSON Lines file) of a batch:
+    either the converted value or the error that was raised.
+    """
+    index = attrib()
+    value = attrib(default=None)
+    error = attrib(default=None)
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def to_models(cls, records, workers=None, chunk_size=256, executor="process",
+              ordered=True):
+    """
+    Generator that converts records (dictionaries or JSON strings) into
+    instances of cls in parallel, in chunks of records converted by the
+    workers of a process (or thread) pool.
+
+    A record that fails to convert does not abort the batch, its error is
+    reported in its BatchResult instead. Only a few chunks per worker are
+    pending at any time, so records can be a (large) lazy iterable.
+
+    Processes sidestep the GIL but pickle the records and results, threads
+    only help when the conversion itself releases the GIL.
+
+    :param cls: class type to convert the records into
+    :param records: iterable of dictionaries or JSON strings
+    :param workers: number of workers (default: number of CPUs)
+    :param chunk_size: number of records converted per task
+    :param executor: "process", "thread" or a concurrent.futures.Executor
+                     (which is used as is and not shut down)
+    :param ordered: if True, yield results in the order of the records,
+                    otherwise yield the results of each chunk once done
+    :return: generator of BatchResult
+    """
+    workers = workers or cpu_count()
+    tasks = ((range(start, start + len(chunk)), convert_chunk,
+              (cls, start, chunk))
+             for start, chunk in _chunks(records, chunk_size))
+
+    return _run(executor, workers, tasks, ordered)
+
+
+def from_json_lines_file(path, cls, workers=None, range_size=None,
+                         executor="process", ordered=True):
+    """
+    Generator that converts each line of a (large) JSON Lines file into an
+    instance of cls in parallel. The file is memory-mapped and split into
+    newline-aligned byte ranges, each range is read, parsed and converted
+    by a worker of a process (or thread) pool.
+
+    The index of each BatchResult is the byte offset of its line in the
+    file. Blank lines are skipped.
+
+    :param path: path of the JSON Lines file
+    :param cls: class type to convert the lines into
+    :param workers: number of workers (default: number of CPUs)
+    :param range_size: approximate number of bytes per range (default: the
+                       file size divided by 4 ranges per worker, at least
+                       MIN_RANGE_SIZE)
+    :param executor: "process", "thread" or a concurrent.futures.Executor
+                     (which is used as is and not shut down)
+    :param ordered: if True, yield results in the order of the lines,
+                    otherwise yield the results of each range once done
+    :return: generator of BatchResult
+    """
+    workers = workers or cpu_count()
+    size = os.path.getsize(path)
+    range_size = range_size or max(size // (workers * 4), MIN_RANGE_SIZE)
+
+    # a failed range is reported as a single error at its start offset
+    tasks = (([start], convert_range, (cls, path, start, end))
+             for start, end in _byte_ranges(path, size, range_size))
+
+    return _run(executor, workers, tasks, ordered)
+
+
+def convert_record(cls, record):
+    """ Convert a dictionary or JSON string record into cls. """
+    if isinstance(record, (string_types, binary_type)):
+        return from_json(record, cls)
+    return to_model(cls, record)
+
+
+def convert_chunk(cls, start, records):
+    """ Returns the BatchResult of each record, starting at index start. """
+    return _convert_records(cls, enumerate(records, start))
+
+
+def convert_range(cls, path, start, end):
+    """
+    Returns the BatchResult of each (non-blank) line of the newline-aligned
+    byte range [start, end) of a JSON Lines file, indexed by byte offset.
+    """
+    with open(path, "rb") as stream:
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        return _convert_records(cls, _iter_lines(mapped, start, end))
+    finally:
+        mapped.close()
+
+
+def _convert_records(cls, indexed_records):
+    results = []
+
+    for index, record in indexed_records:
+        try:
+            results.append(BatchResult(index, convert_record(cls, record)))
+        except Exception as e:
+            results.append(BatchResult(index, error=e))
+
+    return results
+
+
+def _iter_lines(mapped, start, end):
+    """ Yields the (offset, line) of each non-blank line of a range. """
+    mapped.seek(start)
+    offset = start
+
+    while offset < end:
+        line = mapped.readline().strip()
+        if line:
+            yield offset, line
+        offset = mapped.tell()
+
+
+def _byte_ranges(path, size, range_size):
+    """ Yields the (start, end) newline-aligned byte ranges of a file. """
+    if not size:
+        return
+
+    with open(path, "rb") as stream:
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        start = 0
+        while start < size:
+            newline = mapped.find(b"\n", min(start + range_size, size) - 1)
+            end = size if newline == -1 else newline + 1
+            yield start, end
+            start = end
+    finally:
+        mapped.close()
+
+
+def _run(executor, workers, tasks, ordered):
+    pool = _executor(executor, workers)
+
+    try:
+        for result in _submit(pool, tasks, workers * 2, ordered):
+            yield result
+
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+
+
+def _executor(executor, workers):
+    if isinstance(executor, Executor):
+        return executor
+
+    if executor not in EXECUTORS:
+        raise ValueError("Invalid executor: {} (expected {} or an Executor)"
+                         .format(executor, " or ".join(sorted(EXECUTORS))))
+
+    return EXECUTORS[executor](max_workers=workers)
+
+
+def _chunks(records, chunk_size):
+    """ Yields (start index, list of records) chunks of the records. """
+    records = iter(records)
+    start = 0
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+
+        yield start, chunk
+        start += len(chunk)
+
+
+def _submit(pool, tasks, max_pending, ordered):
+    # indices of the records (reported on failure) of each pending future
+    pending = OrderedDict()
+
+    for indices, func, args in tasks:
+        pending[pool.submit(func, *args)] = indices
+
+        for result in _collect(pending, ordered, max_pending - 1):
+            yield result
+
+    for result in _collect(pending, ordered, 0):
+        yield result
+
+
+def _collect(pending, ordered, keep):
+    """ Yields results of pending chunks until at most keep are pending. """
+    while len(pending) > keep:
+        if ordered:
+            done = [next(iter(pending))]
+        else:
+            completed = wait(pending, return_when=FIRST_COMPLETED).done
+            done = [future for future in pending if future in completed]
+
+        for future in done:
+            indices = pending.pop(future)
+            for result in _task_results(future, indices):
+                yield result
+
+
+def _task_results(future, indices):
+    try:
+        return future.result()
+    except Exception as e:
+        # the whole task failed (e.g. a result could not be pickled)
+        return [BatchResult(index, error=e) for index in indices]
@@ -0,0 +1,600 @@
+# -*- coding: utf-8 -*-
+"""
+Compact binary encoding of related models, driven by their field
+definitions: the fields of a model are written in their definition order,
+without their key names, each with a native encoding of its type.
+
+    data = related.to_bytes(store)
+    store = related.from_bytes(data, StoreData)
+
+The data starts with a header made of a magic number, the version of the
+format and a fingerprint of the schema of the model (the names and types
+of its fields, recursively). Data encoded for another schema (e.g. by an
+older definition of the model) is rejected with a ValueError instead of
+being decoded into the wrong fields, so the format is meant for caches and
+for exchanges between processes that share the model definitions, not for
+long term storage.
+
+Encodings:
+
+- int: zigzag varint, bool: 1 byte, float: 8 bytes (IEEE 754)
+- str and URL: varint length and UTF-8 bytes
+- Decimal: sign, varint coefficient and zigzag varint exponent
+- UUID: 16 bytes
+- date: varint ordinal, time: varint microseconds of the day and utc
+  offset, datetime: both (tzinfo is restored as a fixed utc offset)
+- Enum: varint index of the member
+- models: varint bit mask of the None fields, then the other fields
+- sequences, sets and mappings: varint length and items (mappings: key
+  and item), TypedArray: varint length and raw little endian array
+"""
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from attr._make import fields
+from future.moves.urllib.parse import ParseResult, urlparse
+from six import string_types
+
+from .converters import ClassConverter
+from .functions import construct, is_model
+from . import trust
+from .types import (
+    TypedArray, TypedMapping, TypedSet, ORDERED_DICT
+)
+
+MAGIC = b"RLB"
+VERSION = 1
+
+_header = struct.Struct("<3sBI")
+_double = struct.Struct("<d")
+
+# microseconds of a second, minute and hour
+_SECOND = 1000000
+_MINUTE = 60 * _SECOND
+_HOUR = 60 * _MINUTE
+
+# ModelCodecs being built by this thread by class, see model_codec
+_local = threading.local()
+
+
+def to_bytes(obj):
+    """
+    Encode a related object into bytes, see the binary module.
+
+    :param obj: instance of a related class (@mutable or @immutable)
+    :return: bytes of the header and the encoded object
+    """
+    codec = model_codec(obj.__class__)
+    out = bytearray(_header.pack(MAGIC, VERSION, codec.fingerprint()))
+    codec.encode(out, obj)
+    return bytes(out)
+
+
+def from_bytes(data, cls, trusted=False):
+    """
+    Decode an object of a related class (cls) from bytes encoded by
+    to_bytes. The objects are constructed like to_model does.
+
+    :param data: bytes (or bytearray) encoded by to_bytes
+    :param cls: related class of the encoded object
+    :param trusted: skip the validators of the fields, see trust.Trusted
+    :return: instance of cls
+    """
+    if trusted:
+        with trust.Trusted():
+            return from_bytes(data, cls)
+
+    codec = model_codec(cls)
+    check_header(data, cls, codec.fingerprint())
+
+    try:
+        obj, pos = trust.record(codec.decode, data, _header.size)
+    except (IndexError, struct.error):
+        raise ValueError("Truncated binary data for {}".format(
+            cls.__name__))
+
+    if pos != len(data):
+        raise ValueError("{} trailing bytes after the binary data for {}"
+                         .format(len(data) - pos, cls.__name__))
+    return obj
+
+
+def check_header(data, cls, fingerprint):
+    """ Raise a ValueError unless data starts with a header for cls. """
+    if len(data) < _header.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not related binary data")
+
+    _, version, encoded_fingerprint = _header.unpack_from(data)
+    if version != VERSION:
+        raise ValueError("Unsupported binary format version {} "
+                         "(expected {})".format(version, VERSION))
+
+    if encoded_fingerprint != fingerprint:
+        raise ValueError("Schema mismatch: the data was encoded for another "
+                         "definition of {} (schema {:08x}, expected {:08x})"
+                         .format(cls.__name__, encoded_fingerprint,
+                                 fingerprint))
+
+
+def schema(cls):
+    """
+    Returns the description of the schema of a related class, from which
+    its fingerprint is computed, e.g. "ex.Pet(name:str,age:int?...)".
+    """
+    return model_codec(cls).schema(set())
+
+
+def model_codec(cls):
+    """
+    Returns the ModelCodec of a related class, built on the first call and
+    cached on the class once compiled. The codecs being built by a thread
+    are kept in a map of that thread (so that models can reference
+    themselves) and only published on their classes when all of them are
+    compiled: other threads never see a codec that is not complete, and
+    none is cached if compiling fails.
+    """
+    codec = cls.__dict__.get('__related_binary__')
+    if codec is not None:
+        return codec
+
+    building = getattr(_local, "building", None)
+    if building is not None:
+        return _build_codec(cls, building)
+
+    _local.building = building = {}
+    try:
+        codec = _build_codec(cls, building)
+    finally:
+        _local.building = None
+
+    for built_cls, built in building.items():
+        setattr(built_cls, '__related_binary__', built)
+    return codec
+
+
+def _build_codec(cls, building):
+    """ Returns the ModelCodec of cls built (or being built) by a thread. """
+    codec = building.get(cls)
+    if codec is None:
+        codec = building[cls] = ModelCodec(cls)
+        codec.compile()
+    return codec
+
+
+class Codec(object):
+    """
+    Encoding of a type of values: encode(out, value) appends the bytes of
+    a value to a bytearray, decode(data, pos) returns the value read at pos
+    and the position of the next value.
+    """
+
+    __slots__ = ('name', 'encode', 'decode')
+
+    def __init__(self, name, encode, decode):
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+    def schema(self, seen):
+        return self.name
+
+
+class ModelCodec(object):
+    """ Encoding of the objects of a related class. """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.names = ()
+        self.codecs = ()
+        self._fingerprint = None
+
+    def compile(self):
+        attributes = fields(self.cls)
+        self.names = tuple(a.name for a in attributes)
+        self.codecs = tuple(field_codec(self.cls, a) for a in attributes)
+
+    def fingerprint(self):
+        if self._fingerprint is None:
+            schema = self.schema(set()).encode("utf-8")
+            self._fingerprint = zlib.crc32(schema) & 0xffffffff
+        return self._fingerprint
+
+    def schema(self, seen):
+        name = "{}.{}".format(self.cls.__module__, self.cls.__name__)
+        if self.cls in seen:
+            return name
+
+        seen.add(self.cls)
+        return "{}({})".format(name, ",".join(
+            "{}:{}".format(field_name, codec.schema(seen))
+            for field_name, codec in zip(self.names, self.codecs)))
+
+    def encode(self, out, obj):
+        values = [getattr(obj, name) for name in self.names]
+
+        # bit i of the mask is set if the value of field i is None
+        mask, bit = 0, 1
+        for value in values:
+            if value is None:
+                mask |= bit
+            bit <<= 1
+
+        encode_uint(out, mask)
+        for value, codec in zip(values, self.codecs):
+            if value is not None:
+                codec.encode(out, value)
+
+    def decode(self, data, pos):
+        mask, pos = decode_uint(data, pos)
+        kwargs = {}
+
+        for name, codec in zip(self.names, self.codecs):
+            if mask & 1:
+                kwargs[name] = None
+            else:
+                kwargs[name], pos = codec.decode(data, pos)
+            mask >>= 1
+
+        return construct(self.cls, kwargs), pos
+
+
+def field_codec(cls, attribute):
+    """
+    Returns the codec of the values of a field (attribute) of cls, based on
+    its converter (ChildField and container fields) or validator.
+    """
+    converter = attribute.converter
+    container = getattr(converter, "container", None)
+
+    if container is TypedArray:
+        return array_codec(converter.cls)
+    if container is not None and issubclass(container, TypedMapping):
+        return mapping_codec(value_codec(converter.cls))
+    if container is not None:
+        return items_codec(value_codec(converter.cls),
+                           set if issubclass(container, TypedSet) else list)
+    if isinstance(converter, ClassConverter):
+        return value_codec(converter.cls)
+
+    validator = attribute.validator
+    checks = getattr(validator, "checks", None)
+    if checks is None:
+        raise TypeError("No binary encoding for the field {} of {}".format(
+            attribute.name, cls.__name__))
+    return value_codec(checks.cls)
+
+
+def value_codec(cls):
+    """ Returns the codec of the values of a class, see field_codec. """
+    if cls == string_types or cls in string_types:
+        return STR
+    if cls in CODECS:
+        return CODECS[cls]
+    if isinstance(cls, type) and issubclass(cls, Enum):
+        return enum_codec(cls)
+    if is_model(cls):
+        return model_codec(cls)
+    raise TypeError("No binary encoding for {!r}".format(cls))
+
+
+def encode_uint(out, value):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_uint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_int(out, value):
+    encode_uint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def decode_int(data, pos):
+    value, pos = decode_uint(data, pos)
+    return (-(value >> 1) - 1 if value & 1 else value >> 1), pos
+
+
+def encode_str(out, value):
+    value = value.encode("utf-8")
+    encode_uint(out, len(value))
+    out += value
+
+
+def decode_str(data, pos):
+    length, pos = decode_uint(data, pos)
+    end = pos + length
+    if end > len(data):
+        raise IndexError(end)
+    return data[pos:end].decode("utf-8"), end
+
+
+def encode_bool(out, value):
+    out.append(1 if value else 0)
+
+
+def decode_bool(data, pos):
+    return data[pos] != 0, pos + 1
+
+
+def encode_float(out, value):
+    out += _double.pack(value)
+
+
+def decode_float(data, pos):
+    return _double.unpack_from(data, pos)[0], pos + 8
+
+
+def encode_decimal(out, value):
+    sign, digits, exponent = value.as_tuple()
+
+    # NaN and Infinity (their exponent is a letter) are encoded as strings
+    if not isinstance(exponent, int):
+        out.append(2)
+        encode_str(out, str(value))
+        return
+
+    out.append(sign)
+    encode_uint(out, int("".join(map(str, digits))))
+    encode_int(out, exponent)
+
+
+def decode_decimal(data, pos):
+    sign = data[pos]
+    if sign == 2:
+        value, pos = decode_str(data, pos + 1)
+        return Decimal(value), pos
+
+    coefficient, pos = decode_uint(data, pos + 1)
+    exponent, pos = decode_int(data, pos)
+    digits = tuple(map(int, str(coefficient)))
+    return Decimal((sign, digits, exponent)), pos
+
+
+def encode_uuid(out, value):
+    out += value.bytes
+
+
+def decode_uuid(data, pos):
+    end = pos + 16
+    if end > len(data):
+        raise IndexError(end)
+    return UUID(bytes=bytes(data[pos:end])), end
+
+
+def encode_url(out, value):
+    encode_str(out, value.geturl())
+
+
+def decode_url(data, pos):
+    value, pos = decode_str(data, pos)
+    return urlparse(value), pos
+
+
+def encode_date(out, value):
+    encode_uint(out, value.toordinal())
+
+
+def decode_date(data, pos):
+    ordinal, pos = decode_uint(data, pos)
+    return date.fromordinal(ordinal), pos
+
+
+def encode_time(out, value):
+    encode_uint(out, value.hour * _HOUR + value.minute * _MINUTE +
+                value.second * _SECOND + value.microsecond)
+    encode_offset(out, value.utcoffset())
+
+
+def decode_time(data, pos):
+    value, pos = decode_uint(data, pos)
+    tzinfo, pos = decode_offset(data, pos)
+    return _time(value, tzinfo), pos
+
+
+def encode_datetime(out, value):
+    encode_uint(out, value.toordinal())
+    encode_time(out, value.timetz())
+
+
+def decode_datetime(data, pos):
+    ordinal, pos = decode_uint(data, pos)
+    value, pos = decode_time(data, pos)
+    return datetime.combine(date.fromordinal(ordinal), value), pos
+
+
+def encode_offset(out, offset):
+    if offset is None:
+        out.append(0)
+    else:
+        out.append(1)
+        encode_int(out, (offset.days * 86400 + offset.seconds) * _SECOND +
+                   offset.microseconds)
+
+
+def decode_offset(data, pos):
+    if data[pos] == 0:
+        return None, pos + 1
+
+    offset, pos = decode_int(data, pos + 1)
+    return timezone(timedelta(microseconds=offset)), pos
+
+
+def _time(value, tzinfo):
+    hour, value = divmod(value, _HOUR)
+    minute, value = divmod(value, _MINUTE)
+    second, microsecond = divmod(value, _SECOND)
+    return time(hour, minute, second, microsecond, tzinfo)
+
+
+STR = Codec("str", encode_str, decode_str)
+
+CODECS = {
+    bool: Codec("bool", encode_bool, decode_bool),
+    int: Codec("int", encode_int, decode_int),
+    float: Codec("float", encode_float, decode_float),
+    str: STR,
+    Decimal: Codec("decimal", encode_decimal, decode_decimal),
+    UUID: Codec("uuid", encode_uuid, decode_uuid),
+    ParseResult: Codec("url", encode_url, decode_url),
+    date: Codec("date", encode_date, decode_date),
+    datetime: Codec("datetime", encode_datetime, decode_datetime),
+    time: Codec("time", encode_time, decode_time),
+}
+
+
+def enum_codec(cls):
+    """ Returns the codec of the members of an Enum class, by index. """
+    members = list(cls)
+    indexes = dict((member, i) for i, member in enumerate(members))
+
+    def encode(out, value):
+        encode_uint(out, indexes[value])
+
+    def decode(data, pos):
+        index, pos = decode_uint(data, pos)
+        return members[index], pos
+
+    name = "{}.{}[{}]".format(cls.__module__, cls.__name__,
+                              ",".join(member.name for member in members))
+    return Codec(name, encode, decode)
+
+
+class ItemsCodec(Codec):
+    """
+    Codec of the sequences, sets and mappings of the values of a codec.
+    Their items are each preceded by a presence byte if any of them is None.
+    """
+
+    __slots__ = ('codec',)
+
+    def __init__(self, codec, name, encode, decode):
+        super(ItemsCodec, self).__init__(name, encode, decode)
+        self.codec = codec
+
+    def schema(self, seen):
+        return "{}[{}]".format(self.name, self.codec.schema(seen))
+
+
+def items_codec(codec, factory):
+    """ Returns the codec of a sequence (list) or set of values. """
+    encode_item, decode_item = codec.encode, codec.decode
+
+    def encode(out, values):
+        encode_uint(out, len(values))
+        encode_items(out, values, encode_item)
+
+    def decode(data, pos):
+        length, pos = decode_uint(data, pos)
+        values, pos = decode_items(data, pos, length, decode_item)
+        return factory(values), pos
+
+    name = "set" if factory is set else "list"
+    return ItemsCodec(codec, name, encode, decode)
+
+
+def mapping_codec(codec):
+    """ Returns the codec of a mapping of str keys to values. """
+    encode_item, decode_item = codec.encode, codec.decode
+
+    # the keys are written first, then the values
+    def encode(out, values):
+        values = values.dict
+        encode_uint(out, len(values))
+        for key in values:
+            encode_str(out, key)
+        encode_items(out, values.values(), encode_item)
+
+    def decode(data, pos):
+        length, pos = decode_uint(data, pos)
+        keys = []
+        for _ in range(length):
+            key, pos = decode_str(data, pos)
+            keys.append(key)
+
+        values, pos = decode_items(data, pos, length, decode_item)
+        return ORDERED_DICT(zip(keys, values)), pos
+
+    return ItemsCodec(codec, "map", encode, decode)
+
+
+def encode_items(out, values, encode_item):
+    """
+    Append the values of a container, each preceded by a presence byte if
+    any of them is None (as told by the byte written first).
+    """
+    nullable = any(value is None for value in values)
+    out.append(nullable)
+
+    if not nullable:
+        for value in values:
+            encode_item(out, value)
+        return
+
+    for value in values:
+        out.append(value is not None)
+        if value is not None:
+            encode_item(out, value)
+
+
+def decode_items(data, pos, length, decode_item):
+    """ Returns the list of values read at pos, see encode_items. """
+    nullable, pos = data[pos], pos + 1
+    values = []
+
+    for _ in range(length):
+        if nullable:
+            pos += 1
+            if data[pos - 1] == 0:
+                values.append(None)
+                continue
+
+        value, pos = decode_item(data, pos)
+        values.append(value)
+
+    return values, pos
+
+
+def array_codec(cls):
+    """ Returns the codec of a TypedArray of cls (int, float or bool). """
+    typecode = TypedArray.typecode(cls)
+    itemsize = array(typecode).itemsize
+    swap = sys.byteorder != "little"
+
+    def encode(out, values):
+        values = values.list
+        if swap:  # pragma: no cover (big endian)
+            values = array(typecode, values)
+            values.byteswap()
+        encode_uint(out, len(values))
+        out += values.tobytes()
+
+    def decode(data, pos):
+        length, pos = decode_uint(data, pos)
+        end = pos + length * itemsize
+        if end > len(data):
+            raise IndexError(end)
+
+        values = array(typecode)
+        values.frombytes(bytes(data[pos:end]))
+        if swap:  # pragma: no cover (big endian)
+            values.byteswap()
+        return values, end
+
+    return Codec("array[{}]".format(typecode), encode, decode)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Specialized __init__ of the related classes, generated in place of the
+__init__ of attrs. Each field is converted and set like attrs does, but
+the checks of the validators created by the fields (validators.field) are
+inlined in the generated method instead of being called through a chain
+of validator objects, which is most of the cost of constructing a model.
+
+The generated method keeps the names attrs uses for the converters,
+validators and attributes in its globals (e.g. __attr_converter_name), so
+that it can be instrumented like the __init__ of attrs.
+"""
+import itertools
+import linecache
+
+from attr import Factory, NOTHING, _config
+from attr._make import fields, _frozen_setattrs, _hash_cache_field
+from six import exec_
+
+_counter = itertools.count()
+
+# names of the generated code that attribute names must not shadow
+_reserved = frozenset(["self", "NOTHING", "_config", "_setattr"])
+
+
+def install_init(cls):
+    """
+    Replace the __init__ of a related class by a specialized one, unless
+    cls uses attrs features that it does not support (__attrs_pre_init__,
+    init=False or kw_only attributes) or reserved attribute names.
+
+    :param cls: class processed by attrs
+    :return: cls
+    """
+    if hasattr(cls, "__attrs_pre_init__") or \
+            any(not a.init or a.kw_only or a.name in _reserved
+                for a in fields(cls)):
+        return cls
+
+    init = cls.__dict__["__init__"]
+    method = compile_init(cls)
+    method.__qualname__ = init.__qualname__
+    method.__annotations__ = init.__annotations__
+    cls.__init__ = method
+    return cls
+
+
+def compile_init(cls):
+    """
+    Generate the __init__ of a related class (cls).
+
+    :param cls: class processed by attrs
+    :return: __init__ function
+    """
+    frozen = cls.__setattr__ is _frozen_setattrs
+    namespace = {"NOTHING": NOTHING, "_config": _config,
+                 "_setattr": object.__setattr__}
+    args, lines, checks = [], [], []
+
+    for a in fields(cls):
+        args.append(_argument(a, namespace, lines))
+
+        if frozen:
+            lines.append("_setattr(self, %r, %s)" % (a.name, a.name))
+        else:
+            lines.append("self.%s = %s" % (a.name, a.name))
+
+        if a.validator is not None:
+            checks.extend(_checks(a, namespace))
+
+    if checks:
+        lines.append("if _config._run_validators is True:")
+        lines.extend("    " + line for line in checks)
+
+    lines.extend(_finish(cls))
+    source = "def __init__(self, %s):\n    %s\n" % (
+        ", ".join(args), "\n    ".join(lines or ["pass"]))
+    filename = "<related generated init %s.%s-%d>" % (
+        cls.__module__, cls.__name__, next(_counter))
+
+    exec_(compile(source, filename, "exec"), namespace)
+    linecache.cache[filename] = (len(source), None,
+                                 source.splitlines(True), filename)
+    return namespace["__init__"]
+
+
+def _argument(a, namespace, lines):
+    """
+    Returns the argument of attribute a, adding the lines that store its
+    (default and converted) value in a local variable named after a.
+    """
+    arg = a.name.lstrip("_")
+    default = a.default
+
+    if isinstance(default, Factory):
+        factory = "__attr_factory_" + a.name
+        namespace[factory] = default.factory
+        lines.append("if %s is NOTHING:" % arg)
+        lines.append("    %s = %s(%s)" % (
+            arg, factory, "self" if default.takes_self else ""))
+        default = "NOTHING"
+
+    elif default is not NOTHING:
+        namespace["__attr_default_" + a.name] = default
+        default = "__attr_default_" + a.name
+
+    if a.converter is not None:
+        converter = "__attr_converter_" + a.name
+        namespace[converter] = a.converter
+        lines.append("%s = %s(%s)" % (a.name, converter, arg))
+    elif arg != a.name:
+        lines.append("%s = %s" % (a.name, arg))
+
+    return arg if default is NOTHING else "%s=%s" % (arg, default)
+
+
+def _finish(cls):
+    """ Returns the lines run once the attributes are set and validated. """
+    lines = []
+    if hasattr(cls, "__attrs_post_init__"):
+        lines.append("self.__attrs_post_init__()")
+
+    # reset after __attrs_post_init__, like attrs does
+    if hasattr(cls, _hash_cache_field):
+        lines.append("_setattr(self, %r, None)" % _hash_cache_field)
+    return lines
+
+
+def _checks(a, namespace):
+    """ Returns the lines validating the value of attribute a. """
+    namespace["__attr_" + a.name] = a
+    checks = getattr(a.validator, "checks", None)
+
+    if checks is not None:
+        return checks.source("self", "__attr_" + a.name, a.name, namespace,
+                             suffix="_" + a.name)
+
+    namespace["__attr_validator_" + a.name] = a.validator
+    return ["__attr_validator_%s(self, __attr_%s, self.%s)" % (
+        a.name, a.name, a.name)]
@@ -1,131 +1,322 @@
-from collections import OrderedDict
+from array import array
 from uuid import UUID
 from future.moves.urllib.parse import urlparse
 from six import string_types
 from datetime import datetime
+from functools import partial
 from inspect import isfunction
 from dateutil import parser
 from importlib import import_module
+from weakref import WeakSet
 
-from .types import TypedSequence, TypedMapping, TypedSet
-from .functions import to_model
+from .types import (
+    TypedSequence, TypedArray, TypedMapping, TypedSet, IndexedSequence,
+    IndexedMapping, ORDERED_DICT, DEFAULT_DATETIME_FORMAT
+)
+from . import interning
+from .functions import to_model, model_converter, project_value
+from .lazy import LazyValue
+from .instrumentation import record_miss
 
 CHILD_ERROR_MSG = "Failed to convert value ({}) to child object class ({}). " \
                   + "... [Original error message: {}]"
 
+# converters that reference their class by name, see reset_resolved_classes
+_named_references = WeakSet()
 
-def to_child_field(cls):
+# shared tzinfo instances by utc offset, see parse_iso_datetime
+_timezones = {}
+_MAX_TIMEZONES = 1024
+
+try:
+    _fromisoformat = datetime.fromisoformat
+except AttributeError:  # pragma: no cover (python < 3.7)
+    def _fromisoformat(value):
+        formatter = "%Y-%m-%dT%H:%M:%S.%f" if "." in value \
+            else "%Y-%m-%dT%H:%M:%S"
+        return datetime.strptime(value, formatter)
+
+
+class ClassConverter(object):
+    """
+    Base class of the converters that are related to another class. If the
+    class is referenced by name (str), it is resolved on first use and then
+    cached on the converter.
+
+    A lazy converter returns values as a LazyValue, converted by convert_raw
+    and validated by validator on first access of the field (see
+    lazy.LazyAttribute). None means lazy only if the class of the field is.
+
+    Containers are created frozen (hashable and unchangeable) by frozen
+    converters, i.e. the fields of immutable models with cache_hash=True.
+    """
+
+    # validator of the field, see lazy.lazy_attrib
+    validator = None
+
+    # typed container class of the values (e.g. TypedSequence), if any
+    container = None
+
+    frozen = False
+
+    def __init__(self, cls, lazy=None):
+        self.lazy = lazy
+        self._cls = cls
+        self._resolved = None
+        self._convert = None
+
+        if isinstance(cls, str):
+            _named_references.add(self)
+        else:
+            self._resolved = cls
+
+    @property
+    def cls(self):
+        if self._resolved is None:
+            self._resolved = resolve_class(self._cls)
+        return self._resolved
+
+    @property
+    def convert(self):
+        """ Function that coerces a single value into an instance of cls. """
+        if self._convert is None:
+            self._convert = model_converter(self.cls)
+        return self._convert
+
+    def __call__(self, value):
+        if self.lazy:
+            return LazyValue(value, self)
+        return self.convert_raw(value)
+
+    def reset(self):
+        """ Forget the resolved class, it is resolved again on next use. """
+        if isinstance(self._cls, str):
+            self._resolved = None
+            self._convert = None
+
+
+def reset_resolved_classes():
+    """
+    Invalidate the classes cached by every converter referencing its class
+    by name (e.g. "ex08_self_reference.models.Node"). Useful for tests and
+    after reloading the module that defines the referenced class.
+    """
+    for converter in list(_named_references):
+        converter.reset()
+
+
+def container_factory(container, indexed, indexes=()):
+    """
+    Returns the callable that creates the typed containers of a field: the
+    container class, or its indexed subclass if the field has indexes.
+
+    :param container: typed container class (e.g. TypedSequence).
+    :param indexed: indexed subclass of container (e.g. IndexedSequence).
+    :param indexes: (attribute name, unique) pairs of the indexes.
+    :return: container class or indexed class bound to indexes.
+    """
+    if indexes:
+        return partial(indexed, indexes=indexes)
+    return container
+
+
+def to_child_field(cls, lazy=None):
     """
     Returns an callable instance that will convert a value to a Child object.
 
     :param cls: Valid class type of the Child.
+    :param lazy: convert values on first access of the field.
     :return: instance of ChildConverter.
     """
 
-    class ChildConverter(object):
-
-        def __init__(self, cls):
-            self._cls = cls
+    class ChildConverter(ClassConverter):
 
-        @property
-        def cls(self):
-            return resolve_class(self._cls)
-
-        def __call__(self, value):
+        def convert_raw(self, value):
+            cls = self.cls
             try:
-                return to_model(self.cls, value)
+                return to_model(cls, value)
             except ValueError as e:
-                error_msg = CHILD_ERROR_MSG.format(value, self.cls, str(e))
+                error_msg = CHILD_ERROR_MSG.format(value, cls, str(e))
                 raise ValueError(error_msg)
 
-    return ChildConverter(cls)
+        def project(self, value, tree):
+            return project_value(self.cls, value, tree)
 
+    return ChildConverter(cls, lazy)
 
-def to_sequence_field(cls):
+
+def to_sequence_field(cls, lazy=None, compact=False, indexes=()):
     """
     Returns a callable instance that will convert a value to a Sequence.
 
     :param cls: Valid class type of the items in the Sequence.
-    :return: instance of the SequenceConverter.
+    :param lazy: convert values on first access of the field.
+    :param compact: store the (int, float or bool) items in a TypedArray.
+    :param indexes: (attribute name, unique) pairs of the indexes of the
+                    items, see IndexedSequence.
+    :return: instance of the SequenceConverter (or ArrayConverter).
     """
-    class SequenceConverter(object):
+    if compact:
+        if indexes:
+            raise TypeError("Compact sequences cannot be indexed")
+        return to_array_field(cls, lazy)
+
+    sequence = container_factory(TypedSequence, IndexedSequence, indexes)
 
-        def __init__(self, cls):
-            self._cls = cls
+    class SequenceConverter(ClassConverter):
 
-        @property
-        def cls(self):
-            return resolve_class(self._cls)
+        container = TypedSequence
 
-        def __call__(self, values):
+        def convert_raw(self, values):
+            convert = self.convert
             values = values or []
-            args = [to_model(self.cls, value) for value in values]
-            return TypedSequence(cls=self.cls, args=args)
+            return self.sequence([convert(value) for value in values])
+
+        def project(self, values, tree):
+            cls, tree = self.cls, tree.get("*", tree)
+            return self.sequence([project_value(cls, value, tree)
+                                  for value in values or []])
+
+        def sequence(self, args):
+            return sequence(cls=self.cls, args=args, check=False,
+                            frozen=self.frozen)
 
-    return SequenceConverter(cls)
+    return SequenceConverter(cls, lazy)
 
 
-def to_set_field(cls):
+def to_array_field(cls, lazy=None):
+    """
+    Returns a callable instance that will convert a value to a TypedArray.
+
+    :param cls: int, float or bool, the class of the items of the array.
+    :param lazy: convert values on first access of the field.
+    :return: instance of the ArrayConverter.
+    """
+    TypedArray.typecode(cls)
+
+    class ArrayConverter(ClassConverter):
+
+        container = TypedArray
+
+        def convert_raw(self, values):
+            typecode = TypedArray.typecode(self.cls)
+            values = values or []
+
+            # values of the right type (e.g. parsed numbers) are copied as is
+            try:
+                args = array(typecode, values)
+            except (TypeError, OverflowError):
+                convert = self.convert
+                args = array(typecode, [convert(value) for value in values])
+
+            return TypedArray(cls=self.cls, args=args, check=False,
+                              frozen=self.frozen)
+
+        def project(self, values, tree):
+            return self.convert_raw(values)
+
+    return ArrayConverter(cls, lazy)
+
+
+def to_set_field(cls, lazy=None):
     """
     Returns a callable instance that will convert a value to a Sequence.
 
     :param cls: Valid class type of the items in the Sequence.
+    :param lazy: convert values on first access of the field.
     :return: instance of the SequenceConverter.
     """
-    class SetConverter(object):
-
-        def __init__(self, cls):
-            self._cls = cls
+    class SetConverter(ClassConverter):
 
-        @property
-        def cls(self):
-            return resolve_class(self._cls)
+        container = TypedSet
 
-        def __call__(self, values):
+        def convert_raw(self, values):
+            convert = self.convert
             values = values or set()
-            args = {to_model(self.cls, value) for value in values}
-            return TypedSet(cls=self.cls, args=args)
+            args = {convert(value) for value in values}
+            return TypedSet(cls=self.cls, args=args, check=False,
+                            frozen=self.frozen)
 
-    return SetConverter(cls)
+        def project(self, values, tree):
+            cls, tree = self.cls, tree.get("*", tree)
+            args = {project_value(cls, value, tree) for value in values or []}
+            return TypedSet(cls=cls, args=args, check=False,
+                            frozen=self.frozen)
 
+    return SetConverter(cls, lazy)
 
-def to_mapping_field(cls, key):  # pragma: no mccabe
+
+def to_mapping_field(cls, key, lazy=None, indexes=()):  # pragma: no mccabe
     """
     Returns a callable instance that will convert a value to a Mapping.
 
     :param cls: Valid class type of the items in the Sequence.
     :param key: Attribute name of the key value in each item of cls instance.
+    :param lazy: convert values on first access of the field.
+    :param indexes: (attribute name, unique) pairs of the indexes of the
+                    items, see IndexedMapping.
     :return: instance of the MappingConverter.
     """
-    class MappingConverter(object):
+    mapping = container_factory(TypedMapping, IndexedMapping, indexes)
 
-        def __init__(self, cls, key):
-            self._cls = cls
-            self.key = key
+    class MappingConverter(ClassConverter):
 
-        @property
-        def cls(self):
-            return resolve_class(self._cls)
+        container = TypedMapping
 
-        def __call__(self, values):
-            kwargs = OrderedDict()
+        def __init__(self, cls, key, lazy):
+            super(MappingConverter, self).__init__(cls, lazy)
+            self.key = key
+
+        def convert_raw(self, values):
+            kwargs = ORDERED_DICT()
 
             if isinstance(values, TypedMapping):
-                return values
+                if (values.frozen or not self.frozen) and \
+                        (isinstance(values, IndexedMapping) or not indexes):
+                    return values
+                values = values.dict
 
             if not isinstance(values, (type({}), type(None))):
                 raise TypeError("Invalid type : {}".format(type(values)))
 
+            # only items that were not converted need to be type checked
+            convert = self.convert
+            check = False
             if values:
                 for key_value, item in values.items():
                     if isinstance(item, dict):
                         item[self.key] = key_value
-                        item = to_model(self.cls, item)
+                        item = convert(item)
+                    else:
+                        check = True
                     kwargs[key_value] = item
 
-            return TypedMapping(cls=self.cls, kwargs=kwargs, key=self.key)
+            return self.mapping(kwargs, check)
+
+        def project(self, values, tree):
+            # items are selected by their key value (or all of them by *)
+            kwargs = ORDERED_DICT()
+            default_tree = tree.get("*")
+
+            for key_value, item in (values or {}).items():
+                item_tree = tree.get(key_value, default_tree)
+                if item_tree is None:
+                    continue
+
+                if isinstance(item, dict):
+                    item[self.key] = key_value
+                    if item_tree is not True:
+                        item_tree = dict(item_tree, **{self.key: True})
+
+                kwargs[key_value] = project_value(self.cls, item, item_tree)
+
+            return self.mapping(kwargs, False)
+
+        def mapping(self, kwargs, check):
+            return mapping(cls=self.cls, kwargs=kwargs, key=self.key,
+                           check=check, frozen=self.frozen)
 
-    return MappingConverter(cls, key)
+    return MappingConverter(cls, key, lazy)
 
 
 def str_if_not_none(value):
@@ -138,6 +329,9 @@ def str_if_not_none(value):
     if not(value is None or isinstance(value, string_types)):
         value = str(value)
 
+    if interning.active:
+        value = interning.intern_string(value)
+
     return value
 
 
@@ -208,25 +402,77 @@ def to_date_field(formatter):
     return DateConverter(formatter)
 
 
-def to_datetime_field(formatter):
+def to_datetime_field(formatter, strict=False):
     """
     Returns a callable instance that will convert a string to a DateTime.
 
+    Strings are parsed with the native ISO 8601 parser for the default
+    "ISO_FORMAT" formatter, or with strptime for any other formatter. Unless
+    strict, strings that fail to parse are passed to the (slow) dateutil
+    parser instead of raising a ValueError.
+
     :param formatter: String that represents data format for parsing.
+    :param strict: if True, never fall back to the dateutil parser.
     :return: instance of the DateTimeConverter.
     """
     class DateTimeConverter(object):
 
-        def __init__(self, formatter):
+        def __init__(self, formatter, strict):
             self.formatter = formatter
+            self.strict = strict
 
         def __call__(self, value):
             if isinstance(value, string_types):
-                value = parser.parse(value)
+                value = parse_datetime(value, self.formatter, self.strict)
 
             return value
 
-    return DateTimeConverter(formatter)
+    return DateTimeConverter(formatter, strict)
+
+
+def parse_datetime(value, formatter, strict=False):
+    """
+    Returns a datetime parsed from a string, see to_datetime_field.
+
+    :param value: string to parse
+    :param formatter: strptime format or "ISO_FORMAT"
+    :param strict: if True, never fall back to the dateutil parser.
+    :return: datetime object
+    """
+    try:
+        if formatter == DEFAULT_DATETIME_FORMAT:
+            return parse_iso_datetime(value)
+        return datetime.strptime(value, formatter)
+
+    except ValueError:
+        if strict:
+            raise
+        record_miss()
+        return parser.parse(value)
+
+
+def parse_iso_datetime(value):
+    """
+    Returns a datetime parsed from an ISO 8601 string by the native parser.
+    Parsed values with the same utc offset share the same tzinfo instance.
+
+    :param value: ISO 8601 string (e.g. 2017-12-18T00:00:00+01:00)
+    :return: datetime object
+    """
+    value = _fromisoformat(value)
+    tzinfo = value.tzinfo
+
+    if tzinfo is not None:
+        offset = tzinfo.utcoffset(value)
+        shared = _timezones.get(offset)
+
+        if shared is None and len(_timezones) < _MAX_TIMEZONES:
+            shared = _timezones.setdefault(offset, tzinfo)
+
+        if shared is not None and shared is not tzinfo:
+            value = value.replace(tzinfo=shared)
+
+    return value
 
 
 def to_time_field(formatter):
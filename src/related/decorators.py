@@ -1,30 +1,82 @@
 import inspect
 
 from attr import attrs
+from attr._make import fields, _hash_cache_field
 
+from .codegen import install_init
 from .functions import to_model, to_dict, is_model
+from .instrumentation import register_model
+from .lazy import install_lazy_attributes, make_lazy
 
 
-def mutable(maybe_cls=None, strict=False):
+def mutable(maybe_cls=None, strict=False, lazy=False, slots=False):
 
     def wrap(cls):
-        wrapped = attrs(cls)
+        if lazy:
+            make_lazy(cls)
+        wrapped = attrs(cls, slots=slots)
         wrapped.__related_strict__ = strict
-        return wrapped
+        install_lazy_attributes(wrapped)
+        install_init(wrapped)
+        return register_model(wrapped)
 
     return wrap(maybe_cls) if maybe_cls is not None else wrap
 
 
-def immutable(maybe_cls=None, strict=False):
+def immutable(maybe_cls=None, strict=False, lazy=False, cache_hash=False):
 
     def wrap(cls):
-        wrapped = attrs(cls, frozen=True, slots=True)
+        if lazy:
+            make_lazy(cls)
+        wrapped = attrs(cls, frozen=True, slots=True, cache_hash=cache_hash)
         wrapped.__related_strict__ = strict
-        return wrapped
+        if cache_hash:
+            _freeze_containers(wrapped)
+            _hash_eq(wrapped)
+        install_lazy_attributes(wrapped)
+        install_init(wrapped)
+        return register_model(wrapped)
 
     return wrap(maybe_cls) if maybe_cls is not None else wrap
 
 
+def _freeze_containers(cls):
+    """
+    Make the converters of the sequence, set and mapping fields of cls
+    create frozen (hashable) containers, that cache their hash like cls.
+    """
+    for a in fields(cls):
+        if getattr(a.converter, "frozen", None) is False:
+            a.converter.frozen = True
+
+
+def _hash_eq(cls):
+    """
+    Short-circuit the equality of cls on identity and on the mismatch of
+    the hashes cached by both instances (cache_hash=True). Hashes are not
+    computed for the comparison: the fields may be unhashable (e.g. a
+    ChildField of a mutable model), which equality supports.
+    """
+    eq = cls.__eq__
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if other.__class__ is self.__class__ and \
+                _hashes_differ(self, other):
+            return False
+        return eq(self, other)
+
+    cls.__eq__ = __eq__
+
+
+def _hashes_differ(inst, other):
+    """ True if both instances cached their hash and the hashes differ. """
+    own = getattr(inst, _hash_cache_field, None)
+    theirs = getattr(other, _hash_cache_field, None)
+    return own is not None and theirs is not None and own != theirs
+
+
 def _get_annotation_map(func, **kwargs):
     annotation_map = kwargs.copy()
 
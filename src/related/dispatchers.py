@@ -1,108 +1,109 @@
 from decimal import Decimal
 from future.moves.urllib.parse import ParseResult
-from collections import OrderedDict
 from enum import Enum
 from uuid import UUID
 from datetime import date, datetime, time
 
-from attr._compat import iteritems
+from six import iteritems
 
-from .functions import to_dict
+from .functions import options_to_dict, register_to_dict
 from .types import (
-    TypedSequence, TypedMapping, TypedSet, DEFAULT_DATE_FORMAT,
+    TypedSequence, TypedArray, TypedMapping, TypedSet, DEFAULT_DATE_FORMAT,
     DEFAULT_DATETIME_FORMAT, DEFAULT_TIME_FORMAT
 )
 
 
-@to_dict.register(list)  # noqa F811
-@to_dict.register(set)
-@to_dict.register(tuple)
-def _(obj, **kwargs):
-    suppress_empty_values = kwargs.get("suppress_empty_values", False)
-    retain_collection_types = kwargs.get("retain_collection_types", False)
+@register_to_dict(list, set, tuple)  # noqa F811
+def _(obj, options, formatter):
+    if not options.suppress_empty_values or len(obj):
+        cf = obj.__class__ if options.retain_collection_types else list
+        return cf([options_to_dict(i, options, formatter) for i in obj])
 
-    if not suppress_empty_values or len(obj):
-        cf = obj.__class__ if retain_collection_types else list
-        return cf([to_dict(i, **kwargs) for i in obj])
 
-
-@to_dict.register(dict)  # noqa F811
-def _(obj, **kwargs):
-    suppress_empty_values = kwargs.get("suppress_empty_values", False)
-    dict_factory = kwargs.get("dict_factory", OrderedDict)
+@register_to_dict(dict)  # noqa F811
+def _(obj, options, formatter):
+    suppress_empty_values = options.suppress_empty_values
 
     items = []
     for kk, vv in iteritems(obj):
-        vv = to_dict(vv, **kwargs)
+        vv = options_to_dict(vv, options, formatter)
         if (not suppress_empty_values) or (vv is not None):
-            items.append((to_dict(kk, **kwargs), vv))
+            items.append((options_to_dict(kk, options, formatter), vv))
 
     if not suppress_empty_values or len(items):
-        return dict_factory(items)
+        return options.dict_factory(items)
+
 
+@register_to_dict(TypedSequence)  # noqa F811
+def _(obj, options, formatter):
+    return options_to_dict(obj.list, options, formatter)
 
-@to_dict.register(TypedSequence)  # noqa F811
-def _(obj, **kwargs):
-    return to_dict(obj.list, **kwargs)
 
+@register_to_dict(TypedArray)  # noqa F811
+def _(obj, options, formatter):
+    # int, float and bool items are their own to_dict
+    if not options.suppress_empty_values or len(obj):
+        return obj.tolist()
 
-@to_dict.register(TypedSet)  # noqa F811
-def _(obj, **kwargs):
-    return to_dict(obj.set, **kwargs)
 
+@register_to_dict(TypedSet)  # noqa F811
+def _(obj, options, formatter):
+    return options_to_dict(obj.set, options, formatter)
 
-@to_dict.register(TypedMapping)  # noqa F811
-def _(obj, **kwargs):
-    suppress_map_key_values = kwargs.get("suppress_map_key_values", False)
-    suppress_empty_values = kwargs.get("suppress_empty_values", False)
-    rv = kwargs.get("dict_factory", OrderedDict)()
+
+@register_to_dict(TypedMapping)  # noqa F811
+def _(obj, options, formatter):
+    suppress_map_key_values = options.suppress_map_key_values
+    rv = options.dict_factory()
 
     items = obj.items()
 
     for key_value, item in items:
-        sub_dict = to_dict(item, **kwargs)
+        sub_dict = options_to_dict(item, options, formatter)
         if suppress_map_key_values:
-            sub_dict.pop(obj.key)
+            # a new dict: sub_dict may be shared (e.g. memoized)
+            sub_dict = options.dict_factory(
+                (k, v) for k, v in iteritems(sub_dict) if k != obj.key)
         rv[key_value] = sub_dict
 
-    if not suppress_empty_values or len(items):
+    if not options.suppress_empty_values or len(items):
         return rv
 
 
-@to_dict.register(Enum)  # noqa F811
-def _(obj, **kwargs):
+@register_to_dict(Enum)  # noqa F811
+def _(obj, options, formatter):
     return obj.value
 
 
-@to_dict.register(UUID)  # noqa F811
-def _(obj, **kwargs):
+@register_to_dict(UUID)  # noqa F811
+def _(obj, options, formatter):
     return str(obj)
 
 
-@to_dict.register(ParseResult)  # noqa F811
-def _(obj, **kwargs):
+@register_to_dict(ParseResult)  # noqa F811
+def _(obj, options, formatter):
     return obj.geturl()
 
 
-@to_dict.register(date)  # noqa F811
-def _(obj, **kwargs):
-    formatter = kwargs.get('formatter') or DEFAULT_DATE_FORMAT
+@register_to_dict(date)  # noqa F811
+def _(obj, options, formatter):
+    formatter = formatter or DEFAULT_DATE_FORMAT
     return obj.strftime(formatter)
 
 
-@to_dict.register(datetime)  # noqa F811
-def _(obj, **kwargs):
-    formatter = kwargs.get('formatter') or DEFAULT_DATETIME_FORMAT
+@register_to_dict(datetime)  # noqa F811
+def _(obj, options, formatter):
+    formatter = formatter or DEFAULT_DATETIME_FORMAT
     return (obj.isoformat() if formatter == "ISO_FORMAT"
             else obj.strftime(formatter))
 
 
-@to_dict.register(time)  # noqa F811
-def _(obj, **kwargs):
-    formatter = kwargs.get('formatter') or DEFAULT_TIME_FORMAT
+@register_to_dict(time)  # noqa F811
+def _(obj, options, formatter):
+    formatter = formatter or DEFAULT_TIME_FORMAT
     return obj.strftime(formatter)
 
 
-@to_dict.register(Decimal)  # noqa F811
-def _(obj, **kwargs):
+@register_to_dict(Decimal)  # noqa F811
+def _(obj, options, formatter):
     return str(obj)
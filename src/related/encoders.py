@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+import json
+from operator import attrgetter
+
+from six import iteritems, string_types, integer_types
+
+from . import dispatchers  # noqa F401
+from .functions import (
+    to_dict, to_dict_fields, is_model, options_to_dict, SerializationOptions
+)
+from .lazy import has_lazy_attributes, raw_getattr
+from .types import TypedSequence, TypedMapping, TypedSet
+
+INFINITY = float('inf')
+
+# to_dict implementations of the types walked by the ModelJSONEncoder. Any
+# other implementation (e.g. registered with to_dict.register) is called and
+# its (small) result is encoded as is.
+_TO_DICT_DEFAULT = to_dict.dispatch(object)
+_TO_DICT_LIST = to_dict.dispatch(list)
+_TO_DICT_DICT = to_dict.dispatch(dict)
+_TO_DICT_SEQUENCE = to_dict.dispatch(TypedSequence)
+_TO_DICT_SET = to_dict.dispatch(TypedSet)
+_TO_DICT_MAPPING = to_dict.dispatch(TypedMapping)
+
+# items of the values converted to lists, by to_dict implementation
+_LIST_ITEMS = {
+    _TO_DICT_LIST: lambda value: value,
+    _TO_DICT_SEQUENCE: attrgetter('list'),
+    _TO_DICT_SET: attrgetter('set'),
+}
+
+
+class ModelJSONEncoder(json.JSONEncoder):
+    """
+    JSONEncoder that walks the related object graph while encoding, instead
+    of building the complete tree of dictionaries with to_dict upfront.
+
+    The chunks produced by iterencode join into the same string as
+    json.dumps(to_dict(obj, **to_dict_kwargs)) with the same encoder
+    options, including key names, formatters and suppression flags.
+
+    :param to_dict_kwargs: keyword arguments that would be passed to to_dict
+                           (or a SerializationOptions instance as options)
+    :param kwargs: keyword arguments of json.JSONEncoder (e.g. indent)
+    """
+
+    def __init__(self, to_dict_kwargs=None, **kwargs):
+        super(ModelJSONEncoder, self).__init__(**kwargs)
+        self.to_dict_kwargs = to_dict_kwargs or {}
+
+        indent = self.indent
+        self.indent_str = ' ' * indent if isinstance(indent, int) else indent
+
+        if self.ensure_ascii:
+            self.encode_str = json.encoder.encode_basestring_ascii
+        else:
+            self.encode_str = json.encoder.encode_basestring
+
+        self._model_fields = {}
+
+    def iterencode(self, o, _one_shot=False):
+        options = SerializationOptions.from_kwargs(self.to_dict_kwargs)
+        formatter = self.to_dict_kwargs.get('formatter')
+        return _or_null(self._iter_value(o, options, formatter, 0))
+
+    # An _iter_* method yields the JSON chunks of a value and yields nothing
+    # at all when to_dict would have returned None for that value.
+
+    def _iter_value(self, value, options, formatter, level):
+        impl = to_dict.dispatch(value.__class__)
+
+        if impl is _TO_DICT_DEFAULT:
+            if is_model(value.__class__):
+                return self._iter_model(value, options, level)
+            return self._iter_plain(value, level)
+
+        chunks = self._iter_collection(impl, value, options, formatter, level)
+        if chunks is None:
+            chunks = self._iter_plain(
+                options_to_dict(value, options, formatter), level)
+
+        return chunks
+
+    def _iter_collection(self, impl, value, options, formatter, level):
+        if impl is _TO_DICT_DICT:
+            return self._iter_dict(value, options, formatter, level)
+
+        if impl is _TO_DICT_MAPPING:
+            return self._iter_mapping(value, options, formatter, level)
+
+        items = _LIST_ITEMS.get(impl)
+        if items is not None and not options.retain_collection_types:
+            return self._iter_list(items(value), options, formatter, level)
+
+    def _iter_model(self, obj, options, level, exclude_key=None):
+        # formatter is not cascaded down, see related_obj_to_dict
+        specs = self._fields(obj.__class__, options.suppress_private_attr)
+        get_value = raw_getattr if options.raw_lazy_values and \
+            has_lazy_attributes(obj.__class__) else getattr
+
+        def pairs():
+            for name, key_name, formatter in specs:
+                if key_name != exclude_key:
+                    value = get_value(obj, name)
+                    yield key_name, self._iter_value(value, options,
+                                                     formatter, level + 1)
+
+        return self._iter_object(pairs(), level,
+                                 skip_none=options.suppress_empty_values,
+                                 none_if_empty=False)
+
+    def _iter_list(self, items, options, formatter, level):
+        def encode(item, item_level):
+            return self._iter_value(item, options, formatter, item_level)
+
+        return self._iter_array(items, encode, level,
+                                none_if_empty=options.suppress_empty_values)
+
+    def _iter_dict(self, obj, options, formatter, level):
+        items = [(options_to_dict(kk, options, formatter), vv)
+                 for kk, vv in iteritems(obj)]
+        if self.sort_keys:
+            items.sort(key=lambda item: item[0])
+
+        pairs = ((kk, self._iter_value(vv, options, formatter, level + 1))
+                 for kk, vv in items)
+
+        return self._iter_object(pairs, level,
+                                 skip_none=options.suppress_empty_values,
+                                 none_if_empty=options.suppress_empty_values)
+
+    def _iter_mapping(self, obj, options, formatter, level):
+        items = list(obj.items())
+        if self.sort_keys:
+            items.sort(key=lambda item: item[0])
+
+        def pairs():
+            for key_value, item in items:
+                if not options.suppress_map_key_values:
+                    chunks = self._iter_value(item, options, formatter,
+                                              level + 1)
+
+                elif (is_model(item.__class__) and
+                      to_dict.dispatch(item.__class__) is _TO_DICT_DEFAULT):
+                    chunks = self._iter_model(item, options, level + 1,
+                                              exclude_key=obj.key)
+
+                else:
+                    sub_dict = options_to_dict(item, options, formatter)
+                    sub_dict = options.dict_factory(
+                        (k, v) for k, v in iteritems(sub_dict)
+                        if k != obj.key)
+                    chunks = self._iter_plain(sub_dict, level + 1)
+
+                yield key_value, chunks
+
+        return self._iter_object(pairs(), level, skip_none=False,
+                                 none_if_empty=options.suppress_empty_values)
+
+    def _iter_plain(self, o, level):
+        """ Encode a value returned by to_dict (e.g. str, int or dict). """
+        if o is None:
+            return iter(())
+
+        text = self._encode_scalar(o)
+        if text is not None:
+            return iter((text,))
+
+        if isinstance(o, (list, tuple)):
+            return self._iter_array(o, self._iter_plain, level,
+                                    none_if_empty=False)
+
+        if isinstance(o, dict):
+            items = list(iteritems(o))
+            if self.sort_keys:
+                items.sort(key=lambda item: item[0])
+
+            pairs = ((kk, self._iter_plain(vv, level + 1))
+                     for kk, vv in items)
+            return self._iter_object(pairs, level, skip_none=False,
+                                     none_if_empty=False)
+
+        return self._iter_plain(self.default(o), level)
+
+    def _encode_scalar(self, o):
+        """ JSON text of a str, bool, int or float, None for other types. """
+        if isinstance(o, string_types):
+            return self.encode_str(o)
+
+        if o is True or o is False:
+            return 'true' if o else 'false'
+
+        if isinstance(o, integer_types):
+            return int.__repr__(o)
+
+        if isinstance(o, float):
+            return self._encode_float(o)
+
+    def _iter_array(self, items, encode, level, none_if_empty):
+        if not len(items):
+            if not none_if_empty:
+                yield '[]'
+            return
+
+        level += 1
+        newline_indent = self._newline_indent(level)
+        separator = self.item_separator + newline_indent
+
+        yield '[' + newline_indent
+
+        for index, item in enumerate(items):
+            if index:
+                yield separator
+
+            for chunk in _or_null(encode(item, level)):
+                yield chunk
+
+        yield self._newline_indent(level - 1) + ']'
+
+    def _iter_object(self, pairs, level, skip_none, none_if_empty):
+        level += 1
+        newline_indent = self._newline_indent(level)
+        separator = self.item_separator + newline_indent
+        started = False
+
+        for key, first, chunks in self._iter_members(pairs, skip_none):
+            yield separator if started else '{' + newline_indent
+            started = True
+
+            yield key + self.key_separator + first
+            for chunk in chunks:
+                yield chunk
+
+        if started:
+            yield self._newline_indent(level - 1) + '}'
+
+        elif not none_if_empty:
+            yield '{}'
+
+    def _iter_members(self, pairs, skip_none):
+        """ Yields the encoded key, first chunk and chunks of each member. """
+        for key, chunks in pairs:
+            key = self._encode_key(key)
+            if key is None:
+                continue  # skipkeys
+
+            first = next(chunks, None)
+            if first is None:
+                if skip_none:
+                    continue
+                first = 'null'
+
+            yield key, first, chunks
+
+    def _fields(self, cls, suppress_private_attr):
+        key = (cls, suppress_private_attr)
+        specs = self._model_fields.get(key)
+
+        if specs is None:
+            specs = to_dict_fields(cls)
+            if suppress_private_attr:
+                specs = [f for f in specs if not f[0].startswith("_")]
+            if self.sort_keys:
+                specs = sorted(specs, key=lambda f: f[1])
+            specs = self._model_fields[key] = tuple(specs)
+
+        return specs
+
+    def _newline_indent(self, level):
+        if self.indent_str is None:
+            return ''
+        return '\n' + self.indent_str * level
+
+    def _encode_key(self, key):
+        if isinstance(key, string_types):
+            pass
+        elif isinstance(key, float):
+            key = self._encode_float(key)
+        elif key is True or key is False or key is None:
+            key = {True: 'true', False: 'false', None: 'null'}[key]
+        elif isinstance(key, integer_types):
+            key = int.__repr__(key)
+        elif self.skipkeys:
+            return None
+        else:
+            raise TypeError("keys must be str, int, float, bool or None, "
+                            "not {}".format(key.__class__.__name__))
+
+        return self.encode_str(key)
+
+    def _encode_float(self, o):
+        if o != o:
+            text = 'NaN'
+        elif o == INFINITY:
+            text = 'Infinity'
+        elif o == -INFINITY:
+            text = '-Infinity'
+        else:
+            return float.__repr__(o)
+
+        if not self.allow_nan:
+            raise ValueError(
+                "Out of range float values are not JSON compliant: " +
+                repr(o))
+
+        return text
+
+
+def _or_null(chunks):
+    """ Yields the chunks, or 'null' if there are none. """
+    empty = True
+
+    for chunk in chunks:
+        empty = False
+        yield chunk
+
+    if empty:
+        yield 'null'
+
+
+def iter_json(obj, indent=4, sort_keys=True, **kwargs):
+    """
+    Generator of the chunks of the JSON representation of an object, as
+    returned by to_json, without building the complete dictionary first.
+
+    :param obj: object to convert to json
+    :param indent: indent json by number of spaces
+    :param sort_keys: sort json output by key if true
+    :param kwargs: arguments to pass to to_dict
+    :return: generator of json strings
+    """
+    encoder = ModelJSONEncoder(to_dict_kwargs=kwargs, indent=indent,
+                               sort_keys=sort_keys)
+    return encoder.iterencode(obj)
+
+
+def to_json_stream(obj, stream, indent=4, sort_keys=True, buffer_size=65536,
+                   **kwargs):
+    """
+    Write the JSON representation of an object (see to_json) to a stream
+    while the object graph is walked, in writes of about buffer_size chars.
+
+    :param obj: object to convert to json
+    :param stream: file-like object to write the json to
+    :param indent: indent json by number of spaces
+    :param sort_keys: sort json output by key if true
+    :param buffer_size: number of characters to buffer between writes
+    :param kwargs: arguments to pass to to_dict
+    :return: number of characters written
+    """
+    buffer = []
+    buffered = 0
+    written = 0
+
+    for chunk in iter_json(obj, indent, sort_keys, **kwargs):
+        buffer.append(chunk)
+        buffered += len(chunk)
+
+        if buffered >= buffer_size:
+            stream.write("".join(buffer))
+            written += buffered
+            buffer = []
+            buffered = 0
+
+    stream.write("".join(buffer))
+    return written + buffered
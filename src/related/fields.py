@@ -8,6 +8,7 @@ from datetime import date, datetime, time
 from six import string_types
 
 from . import _init_fields, types, converters, validators
+from .lazy import lazy_attrib
 
 
 def BooleanField(default=NOTHING, required=True, repr=True, cmp=True,
@@ -30,7 +31,7 @@ def BooleanField(default=NOTHING, required=True, repr=True, cmp=True,
 
 
 def ChildField(cls, default=NOTHING, required=True, repr=True, cmp=True,
-               key=None, metadata=None):
+               key=None, metadata=None, lazy=None):
     """
     Create new child field on a model.
 
@@ -41,15 +42,16 @@ def ChildField(cls, default=NOTHING, required=True, repr=True, cmp=True,
     :param bool cmp: include this field in generated comparison.
     :param string key: override name of the value when converted to dict.
     :param dict metadata: an arbitrary mapping, might be used by third-party components.
+    :param bool lazy: convert the value on first access (default: lazy setting of the class).
     """
     default = _init_fields.init_default(required, default, None)
-    converter = converters.to_child_field(cls)
+    converter = converters.to_child_field(cls, lazy)
     validator = _init_fields.init_validator(
         required, object if isinstance(cls, str) else cls
     )
     metadata = _field_metadata(metadata, key=key)
-    return attrib(default=default, converter=converter, validator=validator,
-                  repr=repr, cmp=cmp, metadata=metadata, type=cls)
+    return lazy_attrib(converter, validator, default=default, repr=repr,
+                       cmp=cmp, metadata=metadata, type=cls)
 
 
 def DateField(formatter=types.DEFAULT_DATE_FORMAT, default=NOTHING,
@@ -75,7 +77,8 @@ def DateField(formatter=types.DEFAULT_DATE_FORMAT, default=NOTHING,
 
 
 def DateTimeField(formatter=types.DEFAULT_DATETIME_FORMAT, default=NOTHING,
-                  required=True, repr=True, cmp=True, key=None, metadata=None):
+                  required=True, repr=True, cmp=True, key=None, metadata=None,
+                  strict=False):
     """
     Create new datetime field on a model.
 
@@ -86,10 +89,11 @@ def DateTimeField(formatter=types.DEFAULT_DATETIME_FORMAT, default=NOTHING,
     :param bool cmp: include this field in generated comparison.
     :param string key: override name of the value when converted to dict.
     :param dict metadata: an arbitrary mapping, might be used by third-party components.
+    :param bool strict: parse strings only with the formatter, never dateutil.
     """
     default = _init_fields.init_default(required, default, None)
     validator = _init_fields.init_validator(required, datetime)
-    converter = converters.to_datetime_field(formatter)
+    converter = converters.to_datetime_field(formatter, strict)
     metadata = _field_metadata(metadata, formatter=formatter, key=key)
     return attrib(default=default, converter=converter, validator=validator,
                   repr=repr, cmp=cmp,
@@ -159,7 +163,7 @@ def IntegerField(default=NOTHING, required=True, repr=True, cmp=True,
 
 
 def MappingField(cls, child_key, default=NOTHING, required=True, repr=False,
-                 key=None, metadata=None):
+                 key=None, metadata=None, lazy=None, index=None, unique=None):
     """
     Create new mapping field on a model.
 
@@ -171,13 +175,17 @@ def MappingField(cls, child_key, default=NOTHING, required=True, repr=False,
     :param bool cmp: include this field in generated comparison.
     :param string key: override name of the value when converted to dict.
     :param dict metadata: an arbitrary mapping, might be used by third-party components.
+    :param bool lazy: convert the value on first access (default: lazy setting of the class).
+    :param index: attribute name(s) of the items to index, see IndexedMapping.
+    :param unique: attribute name(s) of the items to index that must be unique.
     """
     default = _init_fields.init_default(required, default, OrderedDict())
-    converter = converters.to_mapping_field(cls, child_key)
+    indexes = _init_fields.init_indexes(index, unique)
+    converter = converters.to_mapping_field(cls, child_key, lazy, indexes)
     validator = _init_fields.init_validator(required, types.TypedMapping)
     metadata = _field_metadata(metadata, key=key)
-    return attrib(default=default, converter=converter, validator=validator,
-                  repr=repr, metadata=metadata)
+    return lazy_attrib(converter, validator, default=default, repr=repr,
+                       metadata=metadata)
 
 
 def RegexField(regex, default=NOTHING, required=True, repr=True, cmp=True,
@@ -202,7 +210,8 @@ def RegexField(regex, default=NOTHING, required=True, repr=True, cmp=True,
                   metadata=metadata)
 
 
-def SequenceField(cls, default=NOTHING, required=True, repr=False, key=None, metadata=None):
+def SequenceField(cls, default=NOTHING, required=True, repr=False, key=None, metadata=None,
+                  lazy=None, compact=False, index=None, unique=None):
     """
     Create new sequence field on a model.
 
@@ -213,16 +222,22 @@ def SequenceField(cls, default=NOTHING, required=True, repr=False, key=None, met
     :param bool cmp: include this field in generated comparison.
     :param string key: override name of the value when converted to dict.
     :param dict metadata: an arbitrary mapping, might be used by third-party components.
+    :param bool lazy: convert the value on first access (default: lazy setting of the class).
+    :param bool compact: store int, float or bool values in an array (TypedArray).
+    :param index: attribute name(s) of the items to index, see IndexedSequence.
+    :param unique: attribute name(s) of the items to index that must be unique.
     """
     default = _init_fields.init_default(required, default, [])
-    converter = converters.to_sequence_field(cls)
+    indexes = _init_fields.init_indexes(index, unique)
+    converter = converters.to_sequence_field(cls, lazy, compact, indexes)
     validator = _init_fields.init_validator(required, types.TypedSequence)
     metadata = _field_metadata(metadata, key=key)
-    return attrib(default=default, converter=converter, validator=validator,
-                  repr=repr, metadata=metadata, type=default)
+    return lazy_attrib(converter, validator, default=default, repr=repr,
+                       metadata=metadata, type=default)
 
 
-def SetField(cls, default=NOTHING, required=True, repr=False, key=None, metadata=None):
+def SetField(cls, default=NOTHING, required=True, repr=False, key=None, metadata=None,
+             lazy=None):
     """
     Create new set field on a model.
 
@@ -233,13 +248,14 @@ def SetField(cls, default=NOTHING, required=True, repr=False, key=None, metadata
     :param bool cmp: include this field in generated comparison.
     :param string key: override name of the value when converted to dict.
     :param dict metadata: an arbitrary mapping, might be used by third-party components.
+    :param bool lazy: convert the value on first access (default: lazy setting of the class).
     """
     default = _init_fields.init_default(required, default, set())
-    converter = converters.to_set_field(cls)
+    converter = converters.to_set_field(cls, lazy)
     validator = _init_fields.init_validator(required, types.TypedSet)
     metadata = _field_metadata(metadata, key=key)
-    return attrib(default=default, converter=converter, validator=validator,
-                  repr=repr, metadata=metadata)
+    return lazy_attrib(converter, validator, default=default, repr=repr,
+                       metadata=metadata)
 
 
 def StringField(default=NOTHING, required=True, repr=True, cmp=True,
@@ -2,16 +2,31 @@ from __future__ import absolute_import, division, print_function
 
 from collections import OrderedDict
 from enum import Enum
+from functools import singledispatch
 
 import yaml
 import json
 
-from attr._make import fields
+from attr import attrs, attrib, evolve, Factory, NOTHING
+from attr._make import fields, _hash_cache_field
+from six import string_types
 
-try:
-    from functools import singledispatch
-except ImportError:
-    from singledispatch import singledispatch
+from . import interning, trust
+from .lazy import has_lazy_attributes, raw_getattr
+
+# use the libyaml based classes when PyYAML was built with them
+DEFAULT_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+DEFAULT_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# cache of the Dumper/Loader classes created by ordered_dumper/ordered_loader
+_yaml_classes = {}
+
+# options based to_dict implementations by their kwargs based counterpart
+# registered with to_dict, see register_to_dict
+_options_impls = {}
+
+# cache of the to_dict results of frozen objects, see memoize.enable
+_to_dict_cache = None
 
 
 @singledispatch
@@ -24,7 +39,9 @@ def to_dict(obj, **kwargs):
 
     :param obj: object instance
     :param kwargs: keyword arguments such as suppress_private_attr,
-                   suppress_empty_values, dict_factory
+                   suppress_empty_values, dict_factory (use dict for the
+                   fastest, unordered output) or a SerializationOptions
+                   instance passed as options
     :return: converted dictionary.
     """
 
@@ -38,70 +55,274 @@ def to_dict(obj, **kwargs):
         return obj
 
 
+@attrs(frozen=True, slots=True)
+class SerializationOptions(object):
+    """
+    Options of a to_dict conversion. Resolved once from the keyword
+    arguments of the top-level to_dict call and then passed down by
+    reference to every nested conversion.
+    """
+    suppress_private_attr = attrib(default=False)
+    suppress_empty_values = attrib(default=False)
+    suppress_map_key_values = attrib(default=False)
+    retain_collection_types = attrib(default=False)
+    dict_factory = attrib(default=OrderedDict)
+
+    # dump lazy fields that were never accessed from their raw value
+    raw_lazy_values = attrib(default=False)
+
+    # any other keyword arguments, as sorted (key, value) pairs
+    extras = attrib(default=())
+
+    @classmethod
+    def from_kwargs(cls, kwargs):
+        """ Resolve the options from the keyword arguments of to_dict. """
+        extras = tuple(sorted(
+            (k, v) for k, v in kwargs.items()
+            if k not in _OPTION_NAMES and k != "formatter"))
+
+        options = kwargs.get("options")
+        if options is not None:
+            return options.updated(kwargs, extras)
+
+        return cls(kwargs.get("suppress_private_attr", False),
+                   kwargs.get("suppress_empty_values", False),
+                   kwargs.get("suppress_map_key_values", False),
+                   kwargs.get("retain_collection_types", False),
+                   kwargs.get("dict_factory", OrderedDict),
+                   kwargs.get("raw_lazy_values", False),
+                   extras)
+
+    def updated(self, kwargs, extras):
+        """
+        Returns the options with the explicit keyword arguments of to_dict
+        applied over them, e.g. changed by a custom to_dict implementation
+        before converting its values (which passes options=self along).
+        """
+        changes = dict((name, kwargs[name]) for name in _OPTION_NAMES
+                       if name in kwargs and name != "options" and
+                       kwargs[name] != getattr(self, name))
+        if extras and extras != self.extras:
+            changes["extras"] = extras
+        return evolve(self, **changes) if changes else self
+
+    def to_kwargs(self, formatter=None):
+        """ Keyword arguments for the kwargs based to_dict functions. """
+        kwargs = dict(self.extras)
+        kwargs.update(suppress_private_attr=self.suppress_private_attr,
+                      suppress_empty_values=self.suppress_empty_values,
+                      suppress_map_key_values=self.suppress_map_key_values,
+                      retain_collection_types=self.retain_collection_types,
+                      dict_factory=self.dict_factory,
+                      raw_lazy_values=self.raw_lazy_values,
+                      formatter=formatter,
+                      options=self)
+        return kwargs
+
+
+_OPTION_NAMES = frozenset(["suppress_private_attr", "suppress_empty_values",
+                           "suppress_map_key_values",
+                           "retain_collection_types", "dict_factory",
+                           "raw_lazy_values", "options"])
+
+
+def options_to_dict(obj, options, formatter=None):
+    """
+    Convert an object into dictionary, like to_dict, using already resolved
+    SerializationOptions. Implementations registered with register_to_dict
+    are called directly, custom to_dict implementations with kwargs.
+
+    :param obj: object instance
+    :param options: SerializationOptions instance
+    :param formatter: formatter of the field the object is the value of
+    :return: converted dictionary.
+    """
+    impl = to_dict.dispatch(obj.__class__)
+    options_impl = _options_impls.get(impl)
+
+    if options_impl is not None:
+        return options_impl(obj, options, formatter)
+
+    return impl(obj, **options.to_kwargs(formatter))
+
+
+def register_to_dict(*types):
+    """
+    Decorator that registers an options based to_dict implementation, with
+    the signature (obj, options, formatter), for each of the given types.
+
+    A kwargs based wrapper is what gets registered with to_dict, so that
+    to_dict.dispatch and calls to to_dict(obj, **kwargs) keep working.
+    """
+
+    def wrap(func):
+
+        def kwargs_impl(obj, **kwargs):
+            options = SerializationOptions.from_kwargs(kwargs)
+            return func(obj, options, kwargs.get('formatter'))
+
+        for cls in types:
+            to_dict.register(cls)(kwargs_impl)
+
+        _options_impls[kwargs_impl] = func
+        return func
+
+    return wrap
+
+
+def _default_to_dict(obj, options, formatter):
+    if is_model(obj.__class__):
+        return model_to_dict(obj, options)
+    return obj
+
+
+_options_impls[to_dict.registry[object]] = _default_to_dict
+
+
 def related_obj_to_dict(obj, **kwargs):
     """ Covert a known related object to a dictionary. """
 
-    # Explicitly discard formatter kwarg, should not be cascaded down.
-    kwargs.pop('formatter', None)
+    # formatter kwarg is discarded, should not be cascaded down.
+    options = SerializationOptions.from_kwargs(kwargs)
+    return model_to_dict(obj, options)
 
-    # If True, remove fields that start with an underscore (e.g. _secret)
-    suppress_private_attr = kwargs.get("suppress_private_attr", False)
 
-    # if True, don't store fields with None values into dictionary.
-    suppress_empty_values = kwargs.get("suppress_empty_values", False)
+def model_to_dict(obj, options):
+    """
+    Convert a related object to a dictionary with its class serializer, or
+    return its cached dictionary (see memoize) if the object is frozen.
+    """
+    serializer = model_serializer(obj.__class__)
+    if _to_dict_cache is not None:
+        return _to_dict_cache.get(obj, options, serializer)
+    return serializer(obj, options)
 
-    # get list of attrs fields
-    attrs = fields(obj.__class__)
 
-    # instantiate return dict, use OrderedDict type by default
-    return_dict = kwargs.get("dict_factory", OrderedDict)()
+def model_serializer(cls):
+    """
+    Returns the to_dict serializer of a related class (cls), compiled once
+    by compile_to_dict and cached on the class itself.
+    """
+    serializer = cls.__dict__.get('__related_to_dict__')
+    if serializer is None:
+        serializer = compile_to_dict(cls)
+        setattr(cls, '__related_to_dict__', serializer)
+    return serializer
 
-    for a in attrs:
 
-        # skip if private attr and flag tells you to skip
-        if suppress_private_attr and a.name.startswith("_"):
-            continue
+def to_dict_fields(cls):
+    """
+    Returns the fields of a related class (cls) as converted by to_dict, as
+    a tuple of (attribute name, key name, formatter) triples that is built
+    once and cached on the class.
 
+    :param cls: related class (@mutable or @immutable)
+    :return: tuple of (name, key_name, formatter) tuples
+    """
+    specs = cls.__dict__.get('__related_to_dict_fields__')
+    if specs is not None:
+        return specs
+
+    specs = []
+    for a in fields(cls):
         metadata = a.metadata or {}
 
+        # field name can be overridden by the metadata field
+        key_name = metadata.get('key') or a.name
+
         # formatter is a related-specific `attrs` meta field
         #   see fields.DateField
         formatter = metadata.get('formatter')
 
-        # get value and call to_dict on it, passing the kwargs/formatter
-        value = getattr(obj, a.name)
-        value = to_dict(value, formatter=formatter, **kwargs)
+        specs.append((a.name, key_name, formatter))
 
-        # check flag, skip None values
-        if suppress_empty_values and value is None:
-            continue
+    specs = tuple(specs)
+    setattr(cls, '__related_to_dict_fields__', specs)
+    return specs
 
-        # field name can be overridden by the metadata field
-        key_name = a.metadata.get('key') or a.name
 
-        # store converted / formatted value into return dictionary
-        return_dict[key_name] = value
+def compile_to_dict(cls):
+    """
+    Build a to_dict serializer specialized for a related class (cls).
+
+    The field names, keys and formatters are looked up once here, instead
+    of for every field of every object converted by related_obj_to_dict.
+
+    :param cls: related class (@mutable or @immutable)
+    :return: function(obj, options) that returns the converted dictionary.
+    """
+    all_fields = to_dict_fields(cls)
+    public_fields = tuple(f for f in all_fields if not f[0].startswith("_"))
+
+    lazy = has_lazy_attributes(cls)
+
+    def serializer(obj, options):
+        # lazy fields never accessed are dumped unconverted only on request
+        get_value = raw_getattr if lazy and options.raw_lazy_values \
+            else getattr
+
+        # If True, remove fields that start with an underscore (e.g. _secret)
+        if options.suppress_private_attr:
+            selected = public_fields
+        else:
+            selected = all_fields
 
-    return return_dict
+        # if True, don't store fields with None values into dictionary.
+        suppress_empty_values = options.suppress_empty_values
 
+        # plain dict output is built in a single comprehension
+        if options.dict_factory is dict and not suppress_empty_values:
+            return {key_name: options_to_dict(get_value(obj, name), options,
+                                              formatter)
+                    for name, key_name, formatter in selected}
 
-def to_model(cls, value):
+        # instantiate return dict, use OrderedDict type by default
+        return_dict = options.dict_factory()
+
+        for name, key_name, formatter in selected:
+            # get value and convert it, passing the options/formatter
+            value = options_to_dict(get_value(obj, name), options,
+                                    formatter)
+
+            # check flag, skip None values
+            if suppress_empty_values and value is None:
+                continue
+
+            # store converted / formatted value into return dictionary
+            return_dict[key_name] = value
+
+        return return_dict
+
+    return serializer
+
+
+def to_model(cls, value, projection=None, trusted=False):
     """
     Coerce a value into a model object based on a class-type (cls).
     :param cls: class type to coerce into
     :param value: value to be coerced
+    :param projection: field paths to convert, see compile_projection
+    :param trusted: skip the validators of the fields, see trust.Trusted
     :return: original value or coerced value (value')
     """
 
-    if isinstance(value, cls) or value is None:
+    if trusted:
+        with trust.Trusted():
+            return to_model(cls, value, projection)
+
+    elif projection is not None:
+        value = trust.record(project_value, cls, value,
+                             compile_projection(projection))
+
+    elif isinstance(value, cls) or value is None:
         pass  # skip if right type or value is None
 
     elif issubclass(cls, Enum):
         value = cls(value)
 
     elif is_model(cls) and isinstance(value, dict):
-        value = convert_key_to_attr_names(cls, value)
-        value = cls(**value)
+        value = construction_plan(cls).to_attr_kwargs(value)
+        value = construct(cls, value)
 
     else:
         value = cls(value)
@@ -109,24 +330,269 @@ def to_model(cls, value):
     return value
 
 
+def model_converter(cls):
+    """
+    Returns a function equivalent to calling to_model(cls, value), with
+    the decision on how values are coerced into cls made once upfront.
+    Used by the converters of fields that convert many values at a time.
+
+    :param cls: class type to coerce into
+    :return: function(value) returning the original or coerced value
+    """
+    if is_model(cls):
+        return _model_value_converter(cls, construction_plan(cls))
+
+    # Enum and other classes are constructed from the value itself
+    return _value_converter(cls)
+
+
+def _value_converter(cls):
+
+    def convert(value):
+        if isinstance(value, cls) or value is None:
+            return value
+        return cls(value)
+
+    return convert
+
+
+def _model_value_converter(cls, plan):
+
+    def convert(value):
+        if isinstance(value, cls) or value is None:
+            return value
+        if isinstance(value, dict):
+            return construct(cls, plan.to_attr_kwargs(value))
+        return cls(value)
+
+    return convert
+
+
+def construct(cls, kwargs):
+    """
+    Construct a related class (cls) from keyword arguments by attribute
+    name, like cls(**kwargs), within the active Trusted context (which may
+    skip validation) and InternTable (which may return an equal instance).
+    """
+    if trust.active:
+        value = trust.construct(cls, kwargs, construct_unchecked)
+    else:
+        value = cls(**kwargs)
+
+    if interning.active:
+        value = interning.intern_model(value)
+
+    return value
+
+
+def construct_unchecked(cls, kwargs):
+    """
+    Construct a related class (cls) from keyword arguments by attribute
+    name, converting the values like cls(**kwargs) without running the
+    validators of the fields.
+    """
+    inst = cls.__new__(cls)
+
+    for a, _ in construction_plan(cls).attributes:
+        if a.name in kwargs:
+            value = kwargs[a.name]
+        elif a.default is NOTHING:
+            raise TypeError("%s() missing required argument: %r" %
+                            (cls.__name__, a.name))
+        else:
+            value = _default(a, inst)
+
+        if a.converter is not None:
+            value = a.converter(value)
+
+        # frozen classes reject setattr, set the attribute like attrs does
+        object.__setattr__(inst, a.name, value)
+
+    return _initialized(inst)
+
+
 def convert_key_to_attr_names(cls, original):
     """ convert key names to their corresponding attribute names """
-    attrs = fields(cls)
-    updated = {}
-    keys_pulled = set()
-
-    for a in attrs:
-        key_name = a.metadata.get('key') or a.name
-        if key_name in original:
-            updated[a.name] = original.get(key_name)
-            keys_pulled.add(key_name)
-
-    if getattr(cls, '__related_strict__', False):
-        extra = set(original.keys()) - keys_pulled
-        if len(extra):
+    return dict(construction_plan(cls).to_attr_kwargs(original))
+
+
+def construction_plan(cls):
+    """
+    Returns the ConstructionPlan of a related class, building it on the
+    first call and caching it on the class for subsequent calls.
+
+    :param cls: related class (@mutable or @immutable)
+    :return: ConstructionPlan instance
+    """
+    plan = cls.__dict__.get('__related_plan__')
+    if plan is None:
+        plan = ConstructionPlan(cls)
+        setattr(cls, '__related_plan__', plan)
+    return plan
+
+
+class ConstructionPlan(object):
+    """
+    Precomputed information needed to construct a related class from a
+    dictionary: the key to attribute name pairs, the set of allowed keys
+    for strict mode and the converter of each attribute.
+    """
+
+    __slots__ = ('cls', 'key_names', 'allowed_keys', 'strict', 'identity',
+                 'converters', 'attributes')
+
+    def __init__(self, cls):
+        attrs = fields(cls)
+        self.cls = cls
+        self.key_names = tuple((a.metadata.get('key') or a.name, a.name)
+                               for a in attrs)
+        self.attributes = tuple((a, a.metadata.get('key') or a.name)
+                                for a in attrs)
+        self.allowed_keys = frozenset(key for key, _ in self.key_names)
+        self.strict = getattr(cls, '__related_strict__', False)
+        self.identity = all(key == name for key, name in self.key_names)
+        self.converters = dict((a.name, a.converter) for a in attrs
+                               if a.converter is not None)
+
+    def check_keys(self, original):
+        """ Raise a ValueError for keys that are not fields (strict mode). """
+        if self.strict and not self.allowed_keys.issuperset(original):
+            extra = set(original.keys()) - self.allowed_keys
             raise ValueError("Extra keys (strict mode): {}".format(extra))
 
-    return updated
+    def to_attr_kwargs(self, original):
+        """ convert key names to their corresponding attribute names """
+
+        # fast path: every key is already the attribute name
+        if self.identity and self.allowed_keys.issuperset(original):
+            return original
+
+        self.check_keys(original)
+
+        updated = {}
+        for key_name, name in self.key_names:
+            if key_name in original:
+                updated[name] = original[key_name]
+
+        return updated
+
+
+def compile_projection(paths):
+    """
+    Compile field paths into a projection tree. Each path is made of the
+    (key) names of fields separated by dots, where * (or [*]) stands for
+    every item of a sequence, set or mapping field, e.g. "services.*.image"
+    or "days[*].sales". The * of sequence and set items can be omitted.
+
+    :param paths: field path, iterable of field paths or an already
+                  compiled tree
+    :return: dict of name to sub-tree, or True for a complete subtree
+    """
+    if isinstance(paths, dict):
+        return paths
+
+    if isinstance(paths, string_types):
+        paths = (paths,)
+
+    tree = {}
+    for path in paths:
+        parts = [part for part in path.replace("[*]", ".*").split(".")
+                 if part]
+        if parts:
+            _add_projection_path(tree, parts)
+
+    return tree
+
+
+def _add_projection_path(tree, parts):
+    node = tree
+    for part in parts[:-1]:
+        node = node.setdefault(part, {})
+        if node is True:
+            return  # a parent is already selected as a whole
+
+    node[parts[-1]] = True
+
+
+def project_value(cls, value, tree):
+    """
+    Coerce a value into cls like to_model, converting only the fields
+    selected by a projection tree (see compile_projection).
+    """
+    if tree is True or not isinstance(value, dict) or not is_model(cls):
+        return model_converter(cls)(value)
+
+    return project_model(cls, value, tree)
+
+
+def project_model(cls, value, tree):
+    """
+    Construct a related class (cls) from a dictionary, converting and
+    validating only the fields selected by the projection tree. The other
+    fields are set to None, even if they are required, and their values
+    are never converted. Like construct, the extra keys are rejected in
+    strict mode, the validators are skipped for trusted records (see
+    trust.Trusted) and the model is interned (see interning.InternTable).
+    """
+    plan = construction_plan(cls)
+    plan.check_keys(value)
+    validate = not trust.active or trust.validating()
+    inst = cls.__new__(cls)
+
+    for a, key in plan.attributes:
+        subtree = tree.get(key)
+        field_value = None
+
+        if subtree:
+            field_value = value[key] if key in value else _default(a, inst)
+            field_value = _project_field(inst, a, field_value, subtree,
+                                         validate)
+
+        # frozen classes reject setattr, set the attribute like attrs does
+        object.__setattr__(inst, a.name, field_value)
+
+    inst = _initialized(inst)
+    return interning.intern_model(inst) if interning.active else inst
+
+
+def _initialized(inst):
+    """ Complete an instance whose attributes were set without __init__. """
+
+    # cached hash of cache_hash=True classes, reset by __init__ of attrs
+    if hasattr(inst.__class__, _hash_cache_field):
+        object.__setattr__(inst, _hash_cache_field, None)
+
+    post_init = getattr(inst, "__attrs_post_init__", None)
+    if post_init is not None:
+        post_init()
+
+    return inst
+
+
+def _default(attribute, inst):
+    default = attribute.default
+    if default is NOTHING:
+        return None
+    if isinstance(default, Factory):
+        return default.factory(inst) if default.takes_self \
+            else default.factory()
+    return default
+
+
+def _project_field(inst, attribute, value, subtree, validate=True):
+    converter = attribute.converter
+    project = getattr(converter, "project", None)
+
+    if subtree is not True and project is not None:
+        value = project(value, subtree)
+    elif converter is not None:
+        value = converter.convert_raw(value) if project else converter(value)
+
+    validator = attribute.validator or getattr(converter, "validator", None)
+    if validate and validator is not None:
+        validator(inst, attribute, value)
+
+    return value
 
 
 def is_model(cls):
@@ -141,7 +607,7 @@ def is_model(cls):
     return getattr(cls, "__attrs_attrs__", None) is not None
 
 
-def to_yaml(obj, stream=None, dumper_cls=yaml.Dumper, default_flow_style=False,
+def to_yaml(obj, stream=None, dumper_cls=None, default_flow_style=False,
             **kwargs):
     """
     Serialize a Python object into a YAML stream with OrderedDict and
@@ -154,10 +620,46 @@ def to_yaml(obj, stream=None, dumper_cls=yaml.Dumper, default_flow_style=False,
 
     :param data: python object to be serialized
     :param stream: to be serialized to
-    :param Dumper: base Dumper class to extend.
+    :param Dumper: base Dumper class to extend (default: DEFAULT_YAML_DUMPER)
+    :param kwargs: arguments to pass to to_dict
+    :return: stream if provided, string if stream is None
+    """
+    obj_dict = to_dict(obj, **kwargs)
+
+    return yaml.dump(obj_dict, stream, ordered_dumper(dumper_cls),
+                     default_flow_style=default_flow_style)
+
+
+def to_yaml_all(objs, stream=None, dumper_cls=None,
+                default_flow_style=False, **kwargs):
+    """
+    Serialize an iterable of Python objects into a multi-document YAML
+    stream. Each object is converted via to_dict only when its document
+    is written, so the documents are never all held in memory at once.
+
+    :param objs: iterable of python objects to be serialized
+    :param stream: to be serialized to
+    :param Dumper: base Dumper class to extend (default: DEFAULT_YAML_DUMPER)
     :param kwargs: arguments to pass to to_dict
     :return: stream if provided, string if stream is None
     """
+    obj_dicts = (to_dict(obj, **kwargs) for obj in objs)
+
+    return yaml.dump_all(obj_dicts, stream, ordered_dumper(dumper_cls),
+                         default_flow_style=default_flow_style)
+
+
+def ordered_dumper(dumper_cls=None):
+    """
+    Returns a Dumper class that extends dumper_cls to represent
+    OrderedDict objects as regular (ordered) YAML mappings. The class
+    is created once per dumper_cls and then reused.
+    """
+    dumper_cls = dumper_cls or DEFAULT_YAML_DUMPER
+    key = ("dumper", dumper_cls)
+    cached = _yaml_classes.get(key)
+    if cached is not None:
+        return cached
 
     class OrderedDumper(dumper_cls):
         pass
@@ -169,17 +671,54 @@ def to_yaml(obj, stream=None, dumper_cls=yaml.Dumper, default_flow_style=False,
 
     OrderedDumper.add_representer(OrderedDict, dict_representer)
 
-    obj_dict = to_dict(obj, **kwargs)
-
-    return yaml.dump(obj_dict, stream, OrderedDumper,
-                     default_flow_style=default_flow_style)
+    return _yaml_classes.setdefault(key, OrderedDumper)
 
 
-def from_yaml(stream, cls=None, loader_cls=yaml.Loader,
-              object_pairs_hook=OrderedDict, **extras):
+def from_yaml(stream, cls=None, loader_cls=None,
+              object_pairs_hook=OrderedDict, projection=None, trusted=False,
+              **extras):
     """
     Convert a YAML stream into a class via the OrderedLoader class.
+    Only the field paths of the projection are converted, if any, and
+    trusted skips the validators of the fields.
+    """
+    loader = ordered_loader(loader_cls, object_pairs_hook)
+    yaml_dict = yaml.load(stream, loader) or {}
+    yaml_dict.update(extras)
+    return to_model(cls, yaml_dict, projection, trusted) if cls \
+        else yaml_dict
+
+
+def from_yaml_all(stream, cls=None, loader_cls=None,
+                  object_pairs_hook=OrderedDict, projection=None,
+                  trusted=False, **extras):
+    """
+    Generator that converts each document of a multi-document YAML stream
+    into the specified class, as soon as the document has been loaded.
+    """
+    loader = ordered_loader(loader_cls, object_pairs_hook)
+    if projection is not None:
+        projection = compile_projection(projection)
+
+    for yaml_dict in yaml.load_all(stream, loader):
+        yaml_dict = yaml_dict or {}
+        if extras:
+            yaml_dict.update(extras)
+        yield to_model(cls, yaml_dict, projection, trusted) if cls \
+            else yaml_dict
+
+
+def ordered_loader(loader_cls=None, object_pairs_hook=OrderedDict):
     """
+    Returns a Loader class that extends loader_cls to construct
+    YAML mappings using the object_pairs_hook (e.g. OrderedDict). The
+    class is created once per loader_cls and object_pairs_hook pair.
+    """
+    loader_cls = loader_cls or DEFAULT_YAML_LOADER
+    key = ("loader", loader_cls, object_pairs_hook)
+    cached = _yaml_classes.get(key)
+    if cached is not None:
+        return cached
 
     class OrderedLoader(loader_cls):
         pass
@@ -192,9 +731,7 @@ def from_yaml(stream, cls=None, loader_cls=yaml.Loader,
         yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
         construct_mapping)
 
-    yaml_dict = yaml.load(stream, OrderedLoader) or {}
-    yaml_dict.update(extras)
-    return cls(**yaml_dict) if cls else yaml_dict
+    return _yaml_classes.setdefault(key, OrderedLoader)
 
 
 def to_json(obj, indent=4, sort_keys=True, **kwargs):
@@ -209,12 +746,76 @@ def to_json(obj, indent=4, sort_keys=True, **kwargs):
     return json.dumps(obj_dict, indent=indent, sort_keys=sort_keys)
 
 
-def from_json(stream, cls=None, object_pairs_hook=OrderedDict, **extras):
+def from_json(stream, cls=None, object_pairs_hook=OrderedDict,
+              projection=None, trusted=False, **extras):
     """
     Convert a JSON string or stream into specified class.
+    Only the field paths of the projection are converted, if any, and
+    trusted skips the validators of the fields.
     """
     stream = stream.read() if hasattr(stream, 'read') else stream
     json_dict = json.loads(stream, object_pairs_hook=object_pairs_hook)
     if extras:
         json_dict.update(extras)  # pragma: no cover
-    return to_model(cls, json_dict) if cls else json_dict
+    return to_model(cls, json_dict, projection, trusted) if cls \
+        else json_dict
+
+
+def from_json_lines(stream, cls=None, object_pairs_hook=OrderedDict,
+                    projection=None, trusted=False, **extras):
+    """
+    Generator that converts each line of a JSON Lines stream (or any other
+    iterable of JSON strings) into the specified class. Only a single line
+    is held in memory at a time, blank lines are skipped.
+    """
+    if projection is not None:
+        projection = compile_projection(projection)
+
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield from_json(line, cls, object_pairs_hook, projection,
+                            trusted, **extras)
+
+
+def to_json_lines(objs, stream, sort_keys=True, buffer_size=65536,
+                  flush=False, **kwargs):
+    """
+    Serialize an iterable of objects into a JSON Lines stream, one compact
+    JSON document per line. Lines are buffered and written together once
+    buffer_size characters have been collected.
+
+    :param objs: iterable of objects to convert to dictionary and output
+    :param stream: file-like object to write the lines to
+    :param sort_keys: sort json output by key if true
+    :param buffer_size: number of characters to buffer between writes
+    :param flush: flush the stream after every write if true
+    :param kwargs: arguments to pass to to_dict
+    :return: number of lines written
+    """
+    encoder = json.JSONEncoder(sort_keys=sort_keys, separators=(',', ':'))
+    buffer = []
+    buffered = 0
+    count = 0
+
+    for obj in objs:
+        line = encoder.encode(to_dict(obj, **kwargs)) + "\n"
+        buffer.append(line)
+        buffered += len(line)
+        count += 1
+
+        if buffered >= buffer_size:
+            _write_buffer(stream, buffer, flush)
+            buffer = []
+            buffered = 0
+
+    if buffer:
+        _write_buffer(stream, buffer, flush)
+
+    return count
+
+
+def _write_buffer(stream, buffer, flush):
+    stream.write("".join(buffer))
+    if flush:
+        stream.flush()
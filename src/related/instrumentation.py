@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in counters of the calls, cumulative time and fast-path misses of each
+related model and field, when loading (construction and field converters)
+and dumping (to_dict) objects.
+
+Instrumentation costs nothing while disabled: enable() swaps instrumented
+__init__ methods, field converters and to_dict serializers into the model
+classes and disable() puts the original ones back.
+
+    from related import instrumentation
+
+    instrumentation.enable()
+    ...
+    print(instrumentation.to_prometheus())
+
+Counters are updated without locking, so counts recorded concurrently by
+several threads are approximate.
+"""
+import threading
+import time
+from collections import OrderedDict
+from weakref import WeakSet
+
+from attr._make import fields
+
+from .functions import (
+    to_dict, to_dict_fields, options_to_dict, _options_impls
+)
+from .lazy import has_lazy_attributes, raw_getattr
+
+timer = getattr(time, "perf_counter", time.time)
+
+LOAD = "load"
+DUMP = "dump"
+
+# classes decorated by mutable/immutable, see register_model
+_models = WeakSet()
+
+# originals replaced by the instrumented versions, by class
+_originals = {}
+
+# counters by (model, field, direction), field is None for the model itself
+_counters = {}
+
+_local = threading.local()
+_enabled = False
+
+
+class Counter(object):
+    """ Call count, cumulative seconds and fast-path misses of a target. """
+
+    __slots__ = ('calls', 'seconds', 'misses')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.misses = 0
+
+    def add(self, seconds):
+        self.calls += 1
+        self.seconds += seconds
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable():
+    """ Start recording, instrumenting every registered model class. """
+    global _enabled
+    if not _enabled:
+        _enabled = True
+        for cls in list(_models):
+            _instrument(cls)
+
+
+def disable():
+    """ Stop recording and restore the original methods and converters. """
+    global _enabled
+    if _enabled:
+        _enabled = False
+        for cls in list(_originals):
+            _restore(cls)
+
+
+def reset():
+    """ Discard all the recorded counters. """
+    for counter in list(_counters.values()):
+        counter.__init__()
+
+
+def register_model(cls):
+    """
+    Register a model class (called by the mutable and immutable decorators)
+    so that it is instrumented while instrumentation is enabled.
+    """
+    _models.add(cls)
+    if _enabled:
+        _instrument(cls)
+    return cls
+
+
+def record_miss():
+    """
+    Count a fast-path miss (e.g. a DateTimeField value parsed by dateutil)
+    for the field being converted, if instrumentation is enabled.
+    """
+    counter = getattr(_local, "counter", None)
+    if _enabled and counter is not None:
+        counter.misses += 1
+
+
+def snapshot():
+    """
+    Returns a copy of the counters recorded so far.
+
+    :return: dictionary of (model, field, direction) to a dictionary of the
+             calls, seconds and misses. The field is None for the counters
+             of the model as a whole (e.g. __init__ or to_dict of a model).
+    """
+    return OrderedDict(
+        (key, OrderedDict([("calls", counter.calls),
+                           ("seconds", counter.seconds),
+                           ("misses", counter.misses)]))
+        for key, counter in sorted(_counters.items(),
+                                   key=lambda item: _sort_key(item[0])))
+
+
+def to_prometheus(prefix="related"):
+    """
+    Returns the counters in the Prometheus text exposition format.
+
+    :param prefix: prefix of the metric names
+    :return: str
+    """
+    metrics = (("calls", "calls_total", "Number of calls."),
+               ("seconds", "seconds_total", "Cumulative time in seconds."),
+               ("misses", "fast_path_misses_total",
+                "Number of values that missed the fast path."))
+    values = snapshot()
+    lines = []
+
+    for key, suffix, help_text in metrics:
+        name = "%s_%s" % (prefix, suffix)
+        lines.append("# HELP %s %s" % (name, help_text))
+        lines.append("# TYPE %s counter" % name)
+
+        for (model, field, direction), counter in values.items():
+            labels = 'model="%s",field="%s",direction="%s"' % (
+                _escape(model), _escape(field or ""), direction)
+            lines.append("%s{%s} %r" % (name, labels, counter[key]))
+
+    return "\n".join(lines) + "\n"
+
+
+def _sort_key(key):
+    model, field, direction = key
+    return model, field or "", direction
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"') \
+        .replace("\n", "\\n")
+
+
+def _counter(model, field, direction):
+    key = (model, field, direction)
+    counter = _counters.get(key)
+    if counter is None:
+        counter = _counters.setdefault(key, Counter())
+    return counter
+
+
+def _model_name(cls):
+    return "%s.%s" % (cls.__module__, cls.__name__)
+
+
+def _instrument(cls):
+    if cls in _originals or "__init__" not in cls.__dict__:
+        return
+
+    model = _model_name(cls)
+    init = cls.__dict__["__init__"]
+    converters = {}
+
+    # attrs calls the converters of __init__ through its globals
+    init_globals = getattr(init, "__globals__", {})
+    for a in fields(cls):
+        global_name = "__attr_converter_" + a.name
+        converter = init_globals.get(global_name)
+        if converter is not None and converter is a.converter:
+            converters[global_name] = converter
+            init_globals[global_name] = _instrument_converter(
+                converter, _counter(model, a.name, LOAD))
+
+    serializer = cls.__dict__.get("__related_to_dict__")
+    _originals[cls] = (init, converters, serializer)
+
+    cls.__init__ = _instrument_init(init, _counter(model, None, LOAD))
+    setattr(cls, "__related_to_dict__", _instrument_serializer(cls, model))
+
+
+def _restore(cls):
+    init, converters, serializer = _originals.pop(cls)
+
+    cls.__init__ = init
+    init.__globals__.update(converters)
+
+    if serializer is None:
+        delattr(cls, "__related_to_dict__")
+    else:
+        setattr(cls, "__related_to_dict__", serializer)
+
+
+def _instrument_init(init, counter):
+
+    def __init__(self, *args, **kwargs):
+        start = timer()
+        try:
+            init(self, *args, **kwargs)
+        finally:
+            counter.add(timer() - start)
+
+    __init__.__wrapped__ = init
+    return __init__
+
+
+def _instrument_converter(converter, counter):
+
+    def convert(value):
+        previous = getattr(_local, "counter", None)
+        _local.counter = counter
+        start = timer()
+        try:
+            return converter(value)
+        finally:
+            counter.add(timer() - start)
+            _local.counter = previous
+
+    return convert
+
+
+def _instrument_serializer(cls, model):
+    """
+    Same as functions.compile_to_dict, timing each field and counting the
+    values converted by a custom (kwargs based) to_dict as misses.
+    """
+    all_fields = tuple((name, key_name, formatter,
+                        _counter(model, name, DUMP))
+                       for name, key_name, formatter in to_dict_fields(cls))
+    public_fields = tuple(f for f in all_fields if not f[0].startswith("_"))
+    model_counter = _counter(model, None, DUMP)
+    lazy = has_lazy_attributes(cls)
+
+    def serializer(obj, options):
+        model_start = timer()
+        get_value = raw_getattr if lazy and options.raw_lazy_values \
+            else getattr
+
+        if options.suppress_private_attr:
+            selected = public_fields
+        else:
+            selected = all_fields
+
+        return_dict = options.dict_factory()
+
+        for name, key_name, formatter, counter in selected:
+            value = get_value(obj, name)
+            if to_dict.dispatch(value.__class__) not in _options_impls:
+                counter.misses += 1
+
+            start = timer()
+            value = options_to_dict(value, options, formatter)
+            counter.add(timer() - start)
+
+            if options.suppress_empty_values and value is None:
+                continue
+
+            return_dict[key_name] = value
+
+        model_counter.add(timer() - model_start)
+        return return_dict
+
+    return serializer
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in interning of the values loaded by from_json, from_yaml and to_model
+(and the other loading functions): equal immutable models are resolved to
+a single shared instance and equal StringField values to a single string.
+
+    with related.InternTable() as table:
+        store = related.from_json(text, StoreData)
+
+    table.stats()  # models and strings shared, bytes saved
+
+A table is active in the thread that entered it, for the duration of the
+with block. It keeps its interned values until it is discarded, so that
+reusing a table shares the values of several loads; its counters are
+reset each time it is entered, they report the savings of a single load.
+
+Only frozen models that are hashable are interned, which excludes models
+with lazy fields and models with sequence, set or mapping fields unless
+they cache their hash (@immutable(cache_hash=True)). Models are shared if
+their values are identical, not only equal: e.g. Decimal("1.0") and
+Decimal("1.00"), or the same instant with different utc offsets, are
+equal but dumped differently.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+from collections.abc import MutableMapping, MutableSet
+from uuid import UUID
+
+from attr._make import fields, _frozen_setattrs
+
+from .lazy import has_lazy_attributes
+from .types import FrozenContainer
+
+_local = threading.local()
+_lock = threading.Lock()
+
+# classes of the values that are equal only if identical, see _value_key
+_SCALARS = frozenset([str, int, bool, type(None), UUID])
+
+# number of tables entered in any thread, checked before the thread-local
+# table so that loading costs (almost) nothing while interning is unused
+active = 0
+
+
+class InternTable(object):
+    """
+    Table of the interned models and strings, a context manager that
+    interns the values loaded in its with block.
+    """
+
+    def __init__(self):
+        self.models = {}
+        self.strings = {}
+        self.reset()
+
+    def reset(self):
+        """ Reset the counters (the interned values are kept). """
+        self.models_shared = 0
+        self.strings_shared = 0
+        self.bytes_saved = 0
+
+    def __enter__(self):
+        global active
+        stack = _stack()
+        if self not in stack:
+            self.reset()
+        stack.append(self)
+
+        with _lock:
+            active += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        global active
+        _stack().pop()
+
+        with _lock:
+            active -= 1
+
+    def intern_model(self, obj):
+        """ Returns the interned instance equal to obj (or obj itself). """
+        cls = obj.__class__
+        if cls.__setattr__ is not _frozen_setattrs or \
+                has_lazy_attributes(cls):
+            return obj
+
+        try:
+            hash(obj)
+        except TypeError:
+            return obj  # unhashable (e.g. a list or a mutable container)
+
+        shared = self.models.setdefault(_model_key(obj), obj)
+
+        if shared is not obj:
+            self.models_shared += 1
+            self.bytes_saved += _model_size(obj)
+        return shared
+
+    def intern_string(self, value):
+        """ Returns the interned string equal to value (or value itself). """
+        shared = self.strings.setdefault(value, value)
+
+        if shared is not value:
+            self.strings_shared += 1
+            self.bytes_saved += sys.getsizeof(value)
+        return shared
+
+    def stats(self):
+        """
+        Returns the savings of the current (or last) with block.
+
+        :return: dictionary of the number of models and strings shared
+                 instead of duplicated and of the (approximate) bytes saved,
+                 and of the number of models and strings interned.
+        """
+        return OrderedDict([("models_shared", self.models_shared),
+                            ("strings_shared", self.strings_shared),
+                            ("bytes_saved", self.bytes_saved),
+                            ("models", len(self.models)),
+                            ("strings", len(self.strings))])
+
+
+def current_table():
+    """ Returns the innermost InternTable entered by this thread, if any. """
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def intern_model(obj):
+    """ Intern a model with the current table of this thread, if any. """
+    table = current_table()
+    return obj if table is None else table.intern_model(obj)
+
+
+def intern_string(value):
+    """ Intern a string with the current table of this thread, if any. """
+    table = current_table()
+    if table is None or value is None:
+        return value
+    return table.intern_string(value)
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _model_key(obj):
+    """
+    Returns the key of a model in the table of the interned models, equal
+    for models of the same class with identical values only.
+    """
+    return (obj.__class__,) + tuple(_value_key(getattr(obj, a.name))
+                                    for a in fields(obj.__class__))
+
+
+def _value_key(value):
+    """ Returns a key equal for identical values only, see _model_key. """
+    cls = value.__class__
+    if cls in _SCALARS:
+        return cls, value
+
+    if getattr(cls, "__attrs_attrs__", None) is not None:
+        return id(value)  # loaded children are interned before their parent
+
+    if isinstance(value, FrozenContainer):
+        return cls, _container_key(value)
+
+    # e.g. Decimal, float or datetime, whose equal values can differ
+    return cls, repr(value)
+
+
+def _container_key(container):
+    if isinstance(container, MutableMapping):
+        return frozenset((k, _value_key(v)) for k, v in container.items())
+    if isinstance(container, MutableSet):
+        return frozenset(_value_key(v) for v in container)
+    return tuple(_value_key(v) for v in container)
+
+
+def _model_size(obj):
+    """
+    Approximate size of a duplicate model, its interned children being
+    shared: the object itself and its (frozen) typed containers.
+    """
+    size = sys.getsizeof(obj)
+
+    for a in fields(obj.__class__):
+        value = getattr(obj, a.name)
+        if isinstance(value, FrozenContainer):
+            size += sys.getsizeof(value)
+
+    return size
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+from attr import attrib
+from attr._make import fields, _CountingAttr
+
+
+class LazyValue(object):
+    """
+    Value (e.g. the raw dict or list) of a lazy field, converted and then
+    validated by its converter on first access of the field, see
+    LazyAttribute.
+    """
+
+    __slots__ = ('raw', 'converter')
+
+    def __init__(self, raw, converter):
+        self.raw = raw
+        self.converter = converter
+
+    def resolve(self, inst, attribute):
+        """ Convert and validate the raw value for the field attribute. """
+        value = self.converter.convert_raw(self.raw)
+
+        validator = self.converter.validator
+        if validator is not None:
+            validator(inst, attribute, value)
+
+        return value
+
+    def __repr__(self):
+        return "LazyValue({!r})".format(self.raw)
+
+
+class LazyAttribute(object):
+    """
+    Descriptor of a lazy field that converts its LazyValue on first access
+    and stores the converted value in place of the LazyValue.
+
+    :param attribute: attrs Attribute of the field
+    :param slot: member descriptor of the field for slotted classes
+    """
+
+    def __init__(self, attribute, slot=None):
+        self.attribute = attribute
+        self.name = attribute.name
+        self.slot = slot
+
+    def raw(self, inst):
+        """ Returns the stored (LazyValue or converted) value. """
+        if self.slot is not None:
+            return self.slot.__get__(inst, type(inst))
+
+        try:
+            return inst.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+    def __get__(self, inst, owner=None):
+        if inst is None:
+            return self
+
+        value = self.raw(inst)
+        if isinstance(value, LazyValue):
+            value = value.resolve(inst, self.attribute)
+            self.__set__(inst, value)
+
+        return value
+
+    def __set__(self, inst, value):
+        if self.slot is not None:
+            self.slot.__set__(inst, value)
+        else:
+            inst.__dict__[self.name] = value
+
+
+def lazy_attrib(converter, validator, **kwargs):
+    """
+    Create an attrs attribute converted by a ClassConverter. The validator
+    is kept by the converter, to validate the values of the field once they
+    are converted when the field is lazy (instead of in __init__).
+    """
+    converter.validator = validator
+    if converter.lazy:
+        validator = None
+    return attrib(converter=converter, validator=validator, **kwargs)
+
+
+def make_lazy(cls):
+    """
+    Make the fields created with lazy=None in the body of a class lazy,
+    called on a lazy class before it is processed by attrs.
+    """
+    for value in list(cls.__dict__.values()):
+        converter = getattr(value, "converter", None)
+
+        if isinstance(value, _CountingAttr) and \
+                getattr(converter, "lazy", False) is None:
+            converter.lazy = True
+            value._validator = None
+
+
+def install_lazy_attributes(cls):
+    """
+    Install a LazyAttribute on a related class for each of its lazy fields.
+
+    :param cls: related class (@mutable or @immutable)
+    :return: cls
+    """
+    for a in fields(cls):
+        if getattr(a.converter, "lazy", False):
+            slot = cls.__dict__.get(a.name)
+            setattr(cls, a.name, LazyAttribute(a, slot))
+            cls.__related_lazy__ = True
+
+    # the state of slotted classes is already read with getattr by attrs
+    if has_lazy_attributes(cls) and "__getstate__" not in cls.__dict__:
+        cls.__getstate__ = _resolved_state
+
+    return cls
+
+
+def _resolved_state(inst):
+    """
+    Returns the __dict__ of inst to pickle, with its lazy fields converted:
+    a LazyValue references the converter of its field, which is local to
+    the function that created it and so cannot be pickled.
+    """
+    state = dict(inst.__dict__)
+    for name, value in state.items():
+        if isinstance(value, LazyValue):
+            state[name] = getattr(inst, name)
+    return state
+
+
+def has_lazy_attributes(cls):
+    """ Returns True if a related class has any lazy field. """
+    return getattr(cls, "__related_lazy__", False)
+
+
+def raw_getattr(obj, name):
+    """
+    Returns the value of the field of obj like getattr, except for lazy
+    fields that were never accessed: their raw value is returned as is,
+    without converting it.
+    """
+    descriptor = getattr(type(obj), name, None)
+    if isinstance(descriptor, LazyAttribute):
+        value = descriptor.raw(obj)
+        return value.raw if isinstance(value, LazyValue) else value
+
+    return getattr(obj, name)
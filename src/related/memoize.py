@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in cache of the to_dict results of frozen (@immutable) objects, by
+object and SerializationOptions, so that objects shared by many converted
+documents (e.g. a configuration embedded in every response) are converted
+only once.
+
+    from related import memoize
+
+    memoize.enable(maxsize=1024)
+    ...
+    memoize.info()  # hits, misses, size and maxsize
+
+Cached dictionaries are returned as fresh copies, that callers can change
+(the results of the objects nested in a cached result are part of it and
+copied with it). With enable(copy=False), they are returned as is and
+shared by every caller, and must be treated as read-only. The objects
+themselves must not change either, which includes the
+content of their typed containers (frozen with @immutable(cache_hash=True)).
+
+Entries are held by weak reference to their objects, they are evicted once
+their object is garbage collected or, least recently used first, once the
+cache holds maxsize entries.
+"""
+import threading
+from collections import OrderedDict
+from weakref import ref
+
+from attr._make import _frozen_setattrs
+
+from . import functions
+
+DEFAULT_MAXSIZE = 1024
+
+
+class ToDictCache(object):
+    """
+    Bounded (LRU) cache of the to_dict results of frozen objects, keyed by
+    object identity and SerializationOptions.
+
+    :param maxsize: maximum number of cached results
+    :param copy: return a fresh copy of the cached results
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, copy=True):
+        self.maxsize = maxsize
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+
+        # results by (id of object, options), least recently used first
+        self._results = OrderedDict()
+
+        # weak reference and cached options by id of object
+        self._objects = {}
+        self._lock = threading.RLock()
+
+        # depth of the nested conversions of cached objects, by thread
+        self._local = threading.local()
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, obj, options, serializer):
+        """
+        Returns the cached result of serializer(obj, options), converting
+        and caching it first if needed. Objects that are not frozen (or not
+        weakly referenceable) and unhashable options are never cached.
+        """
+        if obj.__class__.__setattr__ is not _frozen_setattrs:
+            return serializer(obj, options)
+
+        try:
+            key = (id(obj), options)
+            with self._lock:
+                result = self._results.pop(key)
+                self._results[key] = result
+                self.hits += 1
+
+        except KeyError:
+            result = self._convert(obj, options, serializer)
+            self._add(obj, key, result)
+
+        except TypeError:
+            return serializer(obj, options)  # unhashable options extras
+
+        # copied once with the result they are nested in, if any
+        nested = getattr(self._local, "depth", 0)
+        return _copy(result) if self.copy and not nested else result
+
+    def _convert(self, obj, options, serializer):
+        local = self._local
+        local.depth = getattr(local, "depth", 0) + 1
+        try:
+            return serializer(obj, options)
+        finally:
+            local.depth -= 1
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self._objects.clear()
+
+    def _add(self, obj, key, result):
+        with self._lock:
+            self.misses += 1
+            entry = self._objects.get(key[0])
+
+            if entry is None:
+                try:
+                    entry = (ref(obj, self._callback(key[0])), [])
+                except TypeError:
+                    return  # not weakly referenceable
+
+                self._objects[key[0]] = entry
+
+            entry[1].append(key[1])
+            self._results[key] = result
+
+            while len(self._results) > self.maxsize:
+                self._evict(next(iter(self._results)))
+
+    def _evict(self, key):
+        del self._results[key]
+
+        obj_id, options = key
+        all_options = self._objects[obj_id][1]
+        all_options.remove(options)
+        if not all_options:
+            del self._objects[obj_id]
+
+    def _callback(self, obj_id):
+        cache = ref(self)
+
+        def collected(_):
+            self_ = cache()
+            if self_ is not None:
+                self_._discard(obj_id)
+
+        return collected
+
+    def _discard(self, obj_id):
+        with self._lock:
+            entry = self._objects.pop(obj_id, None)
+            for options in entry[1] if entry else ():
+                self._results.pop((obj_id, options), None)
+
+
+def _copy(value):
+    """ Copy of the dictionaries, lists and sets of a to_dict result. """
+    if isinstance(value, dict):
+        return value.__class__((k, _copy(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def enable(maxsize=DEFAULT_MAXSIZE, copy=True):
+    """
+    Cache the to_dict results of frozen objects, replacing (and clearing)
+    any cache already enabled.
+
+    :param maxsize: maximum number of cached results
+    :param copy: return fresh copies (False: the shared cached results,
+                 that must be treated as read-only)
+    :return: the ToDictCache
+    """
+    functions._to_dict_cache = ToDictCache(maxsize, copy)
+    return functions._to_dict_cache
+
+
+def disable():
+    """ Stop caching and discard the cached results. """
+    functions._to_dict_cache = None
+
+
+def is_enabled():
+    return functions._to_dict_cache is not None
+
+
+def clear():
+    """ Discard the cached results, if enabled. """
+    if functions._to_dict_cache is not None:
+        functions._to_dict_cache.clear()
+
+
+def info():
+    """
+    Returns the statistics of the cache.
+
+    :return: dictionary of the hits, misses, size and maxsize of the cache,
+             or None if disabled.
+    """
+    cache = functions._to_dict_cache
+    if cache is None:
+        return None
+
+    return OrderedDict([("hits", cache.hits),
+                        ("misses", cache.misses),
+                        ("size", len(cache)),
+                        ("maxsize", cache.maxsize)])
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Trusted loading: the models loaded by from_json, from_yaml and to_model
+(and the other loading functions) are converted as usual but constructed
+without running the validators of their fields, for data that was already
+validated (e.g. read back from our own database or cache).
+
+    with related.Trusted(sample=100):
+        for store in related.from_json_lines(stream, StoreData):
+            ...
+
+With sample=N, one record in N (the first, then every Nth) is constructed
+and validated as usual, records being the models that are not constructed
+by the field of another model. A Trusted context is active in the thread
+that entered it, for the duration of the with block.
+"""
+import threading
+
+_local = threading.local()
+_lock = threading.Lock()
+
+# number of contexts entered in any thread, see interning.active
+active = 0
+
+
+class Trusted(object):
+    """
+    Context manager that skips the validators of the models constructed in
+    its with block, except for one record in sample (if any).
+
+    :param sample: validate one record in sample (default: none of them)
+    """
+
+    def __init__(self, sample=None):
+        if sample is not None and sample < 1:
+            raise ValueError("Invalid sample: %r (expected >= 1)" % sample)
+
+        self.sample = sample
+        self.records = 0
+        self.validated = 0
+
+    def __enter__(self):
+        global active
+        _stack().append(self)
+
+        with _lock:
+            active += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        global active
+        _stack().pop()
+
+        with _lock:
+            active -= 1
+
+    def validate_record(self):
+        """ Count a record, returns True if it is sampled for validation. """
+        self.records += 1
+        validate = bool(self.sample) and \
+            (self.records - 1) % self.sample == 0
+
+        if validate:
+            self.validated += 1
+        return validate
+
+
+def current_context():
+    """ Returns the innermost Trusted context of this thread, if any. """
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def construct(cls, kwargs, construct_unchecked):
+    """
+    Construct cls from keyword arguments (by attribute name): validated as
+    usual (cls(**kwargs)) unless a Trusted context is active, in which case
+    construct_unchecked(cls, kwargs) is used for the models of the records
+    that are not sampled for validation.
+    """
+    context = current_context()
+    if context is None:
+        return cls(**kwargs)
+
+    # the models of the fields of a record are validated like the record
+    depth = getattr(_local, "depth", 0)
+    if depth == 0:
+        _local.validate = context.validate_record()
+
+    _local.depth = depth + 1
+    try:
+        if _local.validate:
+            return cls(**kwargs)
+        return construct_unchecked(cls, kwargs)
+    finally:
+        _local.depth = depth
+
+
+def validating():
+    """
+    Returns False if the models constructed in this thread skip their
+    validators: within a record (see record) of a Trusted context that is
+    not sampled for validation.
+    """
+    if current_context() is None or not getattr(_local, "depth", 0):
+        return True
+    return _local.validate
+
+
+def record(func, *args):
+    """
+    Returns func(*args), called as the construction of a single record:
+    the models it constructs (e.g. the children that binary.from_bytes
+    decodes before their parent) are validated like the record, which is
+    counted once by the active Trusted context.
+    """
+    context = current_context()
+    if context is None or getattr(_local, "depth", 0):
+        return func(*args)
+
+    _local.validate = context.validate_record()
+    _local.depth = 1
+    try:
+        return func(*args)
+    finally:
+        _local.depth = 0
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
@@ -1,17 +1,44 @@
 # -*- coding: utf-8 -*-
+import sys
+from array import array
 from attr.exceptions import FrozenInstanceError
 from collections import OrderedDict
 
-try:
-    from collections.abc import (MutableSequence, MutableMapping, MutableSet)
-except ImportError:
-    from collections import (MutableSequence, MutableMapping, MutableSet)
+from collections.abc import MutableSequence, MutableMapping, MutableSet
 
 
 DEFAULT_DATE_FORMAT = "%Y-%m-%d"
 DEFAULT_DATETIME_FORMAT = "ISO_FORMAT"
 DEFAULT_TIME_FORMAT = "%H:%M:%S"
 
+# dict keeps the insertion order since python 3.7
+ORDERED_DICT = dict if sys.version_info >= (3, 7) else OrderedDict
+
+# allowed types of the values of the typed containers, by (cls, allow_none)
+_allowed_types = {}
+
+
+def allowed_types(cls, allow_none=True):
+    """
+    Returns the (shared) allowed types of the values of a typed container
+    of cls, None included if allow_none.
+    """
+    key = (cls, allow_none)
+    types = _allowed_types.get(key)
+    if types is None:
+        types = _allowed_types.setdefault(
+            key, (cls, type(None)) if allow_none else cls)
+    return types
+
+
+def _slot_names(cls):
+    """ Returns the names of the slots of cls and of its base classes. """
+    names = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return names
+
 
 class ImmutableDict(dict):
 
@@ -34,7 +61,54 @@ class ImmutableDict(dict):
         raise FrozenInstanceError()
 
 
-class TypedSequence(MutableSequence):
+class FrozenContainer(object):
+    """
+    Mixin of the typed containers, that are frozen when they belong to an
+    immutable model with cached hashes: a frozen container rejects changes
+    and is hashable, its hash is computed once.
+    """
+
+    __slots__ = ('frozen', '_hash')
+
+    # name of the attribute holding the list, set or dict of the values
+    _storage = None
+
+    def __sizeof__(self):
+        # the values themselves are not included, like for a list
+        return object.__sizeof__(self) + \
+            sys.getsizeof(getattr(self, self._storage))
+
+    def __hash__(self):
+        if not self.frozen:
+            raise TypeError("unhashable type: '%s' (not frozen)" %
+                            type(self).__name__)
+
+        if self._hash is None:
+            self._hash = hash(self._hash_key())
+        return self._hash
+
+    def __getstate__(self):
+        # the cached hash is not pickled: str hashes are salted per process
+        return dict((name, getattr(self, name))
+                    for name in _slot_names(type(self))
+                    if name != "_hash" and hasattr(self, name))
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self._hash = None
+
+    def _hash_differs(self, other):
+        """ True if both hashes are cached and differ (so not equal). """
+        return self._hash is not None and other._hash is not None and \
+            self._hash != other._hash
+
+    def _check_mutable(self):
+        if self.frozen:
+            raise FrozenInstanceError()
+
+
+class TypedSequence(FrozenContainer, MutableSequence):
     """
     Custom list type that checks the instance type of new values.
 
@@ -42,11 +116,25 @@ class TypedSequence(MutableSequence):
     http://stackoverflow.com/a/3488283
     """
 
-    def __init__(self, cls, args, allow_none=True):
+    __slots__ = ('cls', 'allowed_types', 'list')
+    _storage = 'list'
+
+    def __init__(self, cls, args, allow_none=True, check=True,
+                 frozen=False):
         self.cls = cls
-        self.allowed_types = (cls, type(None)) if allow_none else cls
-        self.list = []
-        self.extend(args)
+        self.allowed_types = allowed_types(cls, allow_none)
+
+        # check=False takes ownership of args as already type checked values
+        if check or type(args) is not list:
+            args = list(args)
+
+        if check:
+            for v in args:
+                self._check(v)
+
+        self.list = args
+        self.frozen = frozen
+        self._hash = None
 
     def __str__(self):
         return str(self.list)
@@ -58,32 +146,124 @@ class TypedSequence(MutableSequence):
         return len(self.list)
 
     def __eq__(self, other):
-        if isinstance(other, TypedSequence):
+        if self is other:
+            return True
+        elif isinstance(other, TypedSequence):
+            if self._hash_differs(other):
+                return False
             return self.list == other.list and self.cls == other.cls
         else:
             return self.list == other
 
+    __hash__ = FrozenContainer.__hash__
+
     def __getitem__(self, i):
         return self.list[i]
 
     def __delitem__(self, i):
+        self._check_mutable()
         del self.list[i]
 
     def __setitem__(self, i, v):
+        self._check_mutable()
         self._check(v)
         self.list[i] = v
 
     def insert(self, i, v):
+        self._check_mutable()
         self._check(v)
         self.list.insert(i, v)
 
+    def _hash_key(self):
+        return tuple(self.list)
+
     def _check(self, v):
         if not isinstance(v, self.allowed_types):
             raise TypeError("Invalid value %s (%s != %s)" %
                             (v, type(v), self.cls))
 
 
-class TypedMapping(MutableMapping):
+class TypedArray(TypedSequence):
+    """
+    Typed sequence of int, float or bool values that are stored unboxed in
+    an array.array buffer instead of a list of objects, see the compact
+    option of SequenceField. None values are not allowed and int values
+    must fit in 64 bits.
+    """
+
+    __slots__ = ()
+
+    # array.array type codes by class of the values
+    typecodes = {int: "q", float: "d", bool: "b"}
+
+    def __init__(self, cls, args, check=True, frozen=False):
+        typecode = self.typecode(cls)
+        self.cls = cls
+        self.allowed_types = cls
+
+        if check:
+            args = list(args)
+            for v in args:
+                self._check(v)
+
+        # check=False takes ownership of args if already an array
+        if type(args) is not array or args.typecode != typecode:
+            args = array(typecode, args)
+
+        self.list = args
+        self.frozen = frozen
+        self._hash = None
+
+    def __str__(self):
+        return str(self.tolist())
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        elif isinstance(other, TypedArray):
+            if self._hash_differs(other):
+                return False
+            return self.list == other.list and self.cls == other.cls
+        elif isinstance(other, TypedSequence):
+            return self.tolist() == other.list and self.cls == other.cls
+        else:
+            return self.tolist() == other
+
+    __hash__ = FrozenContainer.__hash__
+
+    def __iter__(self):
+        # iterates the buffer, without copying it to a list first
+        return map(bool, self.list) if self.cls is bool else iter(self.list)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return TypedArray(self.cls, self.list[i], check=False).tolist()
+
+        value = self.list[i]
+        return bool(value) if self.cls is bool else value
+
+    @classmethod
+    def typecode(cls, value_cls):
+        """ Returns the array type code of the values of class value_cls. """
+        try:
+            return cls.typecodes[value_cls]
+        except KeyError:
+            raise TypeError("Invalid class of compact values %s (not %s)" %
+                            (value_cls, ", ".join(sorted(
+                                c.__name__ for c in cls.typecodes))))
+
+    def tolist(self):
+        """ Returns the values as a list of int, float or bool objects. """
+        values = self.list.tolist()
+        if self.cls is bool:
+            values = [bool(v) for v in values]
+        return values
+
+
+class TypedMapping(FrozenContainer, MutableMapping):
     """
     Custom dict type that checks the instance type of new values.
 
@@ -91,12 +271,26 @@ class TypedMapping(MutableMapping):
     http://stackoverflow.com/a/3488283
     """
 
-    def __init__(self, cls, kwargs, key=None, allow_none=True):
+    __slots__ = ('cls', 'allowed_types', 'key', 'dict')
+    _storage = 'dict'
+
+    def __init__(self, cls, kwargs, key=None, allow_none=True, check=True,
+                 frozen=False):
         self.cls = cls
-        self.allowed_types = (cls, type(None)) if allow_none else cls
+        self.allowed_types = allowed_types(cls, allow_none)
         self.key = key
-        self.dict = OrderedDict()
-        self.update(kwargs)
+
+        # check=False takes ownership of kwargs as already type checked values
+        if check or not isinstance(kwargs, ORDERED_DICT):
+            kwargs = ORDERED_DICT(kwargs)
+
+        if check:
+            for v in kwargs.values():
+                self._check(v)
+
+        self.dict = kwargs
+        self.frozen = frozen
+        self._hash = None
 
     def __str__(self):
         return str(self.dict)
@@ -111,18 +305,26 @@ class TypedMapping(MutableMapping):
         return iter(self.dict)
 
     def __eq__(self, other):
-        if isinstance(other, TypedMapping):
+        if self is other:
+            return True
+        elif isinstance(other, TypedMapping):
+            if self._hash_differs(other):
+                return False
             return self.dict == other.dict and self.cls == other.cls
         else:
             return self.dict == other
 
+    __hash__ = FrozenContainer.__hash__
+
     def __getitem__(self, i):
         return self.dict[i]
 
     def __delitem__(self, i):
+        self._check_mutable()
         del self.dict[i]
 
     def __setitem__(self, i, v):
+        self._check_mutable()
         self._check(v)
         self.dict[i] = v
 
@@ -140,8 +342,11 @@ class TypedMapping(MutableMapping):
         if not isinstance(v, self.allowed_types):
             raise TypeError("%s is not an instance of %s" % (v, self.cls))
 
+    def _hash_key(self):
+        return frozenset(self.dict.items())
 
-class TypedSet(MutableSet):
+
+class TypedSet(FrozenContainer, MutableSet):
     """
     Custom set type that checks the instance type of new values.
 
@@ -149,12 +354,25 @@ class TypedSet(MutableSet):
     http://stackoverflow.com/a/3488283
     """
 
-    def __init__(self, cls, args, allow_none=True):
+    __slots__ = ('cls', 'allowed_types', 'set')
+    _storage = 'set'
+
+    def __init__(self, cls, args, allow_none=True, check=True,
+                 frozen=False):
         self.cls = cls
-        self.allowed_types = (cls, type(None)) if allow_none else cls
-        self.set = set()
-        for arg in args or []:
-            self.add(arg)
+        self.allowed_types = allowed_types(cls, allow_none)
+
+        # check=False takes ownership of args as already type checked values
+        if check or type(args) is not set:
+            args = set(args or [])
+
+        if check:
+            for v in args:
+                self._check(v)
+
+        self.set = args
+        self.frozen = frozen
+        self._hash = None
 
     def __str__(self):
         return str(self.set)
@@ -166,11 +384,17 @@ class TypedSet(MutableSet):
         return len(self.set)
 
     def __eq__(self, other):
-        if isinstance(other, TypedSet):
+        if self is other:
+            return True
+        elif isinstance(other, TypedSet):
+            if self._hash_differs(other):
+                return False
             return self.set == other.set and self.cls == other.cls
         else:
             return self.set == other
 
+    __hash__ = FrozenContainer.__hash__
+
     def __iter__(self):
         return iter(self.set)
 
@@ -178,13 +402,168 @@ class TypedSet(MutableSet):
         return item in self.set
 
     def add(self, v):
+        self._check_mutable()
         self._check(v)
         self.set.add(v)
 
     def discard(self, value):
+        self._check_mutable()
         self.set.discard(value)
 
     def _check(self, v):
         if not isinstance(v, self.allowed_types):
             raise TypeError("Invalid value %s (%s != %s)" %
                             (v, type(v), self.cls))
+
+    def _hash_key(self):
+        return frozenset(self.set)
+
+
+class Index(object):
+    """
+    Index of the items of a typed container by the value of one of their
+    attributes (e.g. the image of each service), see IndexedSequence.
+    Items are expected not to change the value of indexed attributes once
+    they belong to the container (e.g. immutable models).
+    """
+
+    __slots__ = ('name', 'unique', 'entries')
+
+    def __init__(self, name, unique=False):
+        self.name = name
+        self.unique = unique
+
+        # items by attribute value, in insertion order
+        self.entries = {}
+
+    def check(self, item, replaced=None):
+        """
+        Raise a ValueError if adding item (in place of replaced) breaks the
+        unique constraint. Items moved within the container (e.g. swapped)
+        are not duplicates of themselves.
+        """
+        if self.unique and item is not None:
+            value = getattr(item, self.name)
+            for indexed in self.entries.get(value, ()):
+                if indexed is not replaced and indexed is not item:
+                    raise ValueError("Duplicate %s %r (unique index)" %
+                                     (self.name, value))
+
+    def add(self, item):
+        if item is not None:
+            value = getattr(item, self.name)
+            self.entries.setdefault(value, []).append(item)
+
+    def remove(self, item):
+        if item is not None:
+            value = getattr(item, self.name)
+            items = self.entries[value]
+            for position, indexed in enumerate(items):
+                if indexed is item:
+                    del items[position]
+                    break
+
+            if not items:
+                del self.entries[value]
+
+
+class IndexedContainer(object):
+    """
+    Mixin of the typed containers with indexes on attributes of their items,
+    updated as items are added, replaced or removed.
+    """
+
+    __slots__ = ()
+
+    def find(self, name, value):
+        """ Returns the list of items whose attribute name equals value. """
+        return list(self.indexes[name].entries.get(value, ()))
+
+    def find_one(self, name, value, default=None):
+        """ Returns the first item whose attribute name equals value. """
+        items = self.indexes[name].entries.get(value)
+        return items[0] if items else default
+
+    def _init_indexes(self, indexes, items):
+        self.indexes = dict((name, Index(name, unique))
+                            for name, unique in indexes)
+        for item in items:
+            self._reindex(item)
+
+    def _reindex(self, item, replaced=None):
+        # every unique constraint is checked before any index is changed
+        indexes = self.indexes.values()
+        for index in indexes:
+            index.check(item, replaced)
+
+        for index in indexes:
+            index.remove(replaced)
+            index.add(item)
+
+    def _unindex(self, item):
+        for index in self.indexes.values():
+            index.remove(item)
+
+
+class IndexedSequence(IndexedContainer, TypedSequence):
+    """
+    TypedSequence with indexes on attributes of its items, see the index
+    and unique options of SequenceField.
+
+    :param indexes: (attribute name, unique) pairs of the indexes
+    """
+
+    __slots__ = ('indexes',)
+
+    def __init__(self, cls, args, allow_none=True, check=True, frozen=False,
+                 indexes=()):
+        TypedSequence.__init__(self, cls, args, allow_none, check, frozen)
+        self._init_indexes(indexes, self.list)
+
+    def __delitem__(self, i):
+        self._check_mutable()
+        removed = self.list[i]
+        del self.list[i]
+
+        for item in removed if isinstance(i, slice) else [removed]:
+            self._unindex(item)
+
+    def __setitem__(self, i, v):
+        self._check_mutable()
+        self._check(v)
+        self._reindex(v, self.list[i])
+        self.list[i] = v
+
+    def insert(self, i, v):
+        self._check_mutable()
+        self._check(v)
+        self._reindex(v)
+        self.list.insert(i, v)
+
+
+class IndexedMapping(IndexedContainer, TypedMapping):
+    """
+    TypedMapping with indexes on attributes of its items, see the index
+    and unique options of MappingField.
+
+    :param indexes: (attribute name, unique) pairs of the indexes
+    """
+
+    __slots__ = ('indexes',)
+
+    def __init__(self, cls, kwargs, key=None, allow_none=True, check=True,
+                 frozen=False, indexes=()):
+        TypedMapping.__init__(self, cls, kwargs, key, allow_none, check,
+                              frozen)
+        self._init_indexes(indexes, self.dict.values())
+
+    def __delitem__(self, i):
+        self._check_mutable()
+        self._unindex(self.dict[i])
+        del self.dict[i]
+
+    def __setitem__(self, i, v):
+        self._check_mutable()
+        self._check(v)
+        self._reindex(v, self.dict.get(i))
+        self.dict[i] = v
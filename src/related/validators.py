@@ -1,4 +1,5 @@
-from attr import attr, attributes
+from attr import attr, attributes, validators as attr_validators
+from six import exec_
 import re
 
 
@@ -25,9 +26,14 @@ def composite(*validators):
 @attributes(repr=False, slots=True)
 class _RegexValidator(object):
     regex = attr()
+    pattern = attr(init=False, default=None)
+
+    def __attrs_post_init__(self):
+        # compiled once, instead of looked up in the cache of re per value
+        self.pattern = re.compile(self.regex)
 
     def __call__(self, inst, attr, value):
-        if not re.match(self.regex, value):
+        if not self.pattern.match(value):
             raise TypeError(
                 "'{name}' must match {regex!r} (got {value!r}).".format(
                     name=attr.name, regex=self.regex, value=value), attr,
@@ -44,3 +50,81 @@ def regex(match_string):
 
     """
     return _RegexValidator(match_string)
+
+
+class FieldChecks(object):
+    """
+    Checks of a field value: the additional validators (if any), then an
+    instance_of(cls) check, skipped for None unless the field is required.
+
+    The checks are generated as python source, so that they can be inlined
+    in a single function instead of running a chain of validator objects
+    (optional, composite, regex, instance_of). The errors are still raised
+    by those validators, with their usual messages.
+    """
+
+    __slots__ = ('cls', 'required', 'validators')
+
+    def __init__(self, cls, required, validators=()):
+        self.cls = cls
+        self.required = required
+        self.validators = tuple(validators)
+
+    def source(self, inst, attribute, value, namespace, suffix=""):
+        """
+        Returns the lines of python source that check value, adding the
+        objects they reference to namespace (suffixed by suffix).
+
+        :param inst: expression of the instance being validated
+        :param attribute: expression of the attrs Attribute of the field
+        :param value: expression of the (converted) value
+        :param namespace: globals of the generated code
+        :param suffix: suffix of the names added to namespace
+        :return: list of source lines
+        """
+        args = "(%s, %s, %s)" % (inst, attribute, value)
+        lines = []
+
+        for i, validator in enumerate(self.validators):
+            name = "__attr_validator%s_%d" % (suffix, i)
+            namespace[name] = validator
+
+            if isinstance(validator, _RegexValidator):
+                match = "__attr_match%s_%d" % (suffix, i)
+                namespace[match] = validator.pattern.match
+                lines.append("if not %s(%s):" % (match, value))
+                lines.append("    %s%s" % (name, args))
+            else:
+                lines.append(name + args)
+
+        namespace["__attr_type" + suffix] = self.cls
+        namespace["__attr_instance_of" + suffix] = \
+            attr_validators.instance_of(self.cls)
+        lines.append("if not isinstance(%s, __attr_type%s):" % (value, suffix))
+        lines.append("    __attr_instance_of%s%s" % (suffix, args))
+
+        if not self.required:
+            lines = ["if %s is not None:" % value] + \
+                ["    " + line for line in lines]
+
+        return lines
+
+    def compile(self):
+        """ Returns a validator function running the checks. """
+        namespace = {}
+        lines = self.source("inst", "attribute", "value", namespace)
+        source = "def validate(inst, attribute, value):\n    %s\n" % \
+            "\n    ".join(lines)
+
+        exec_(compile(source, "<related field validator>", "exec"), namespace)
+        validate = namespace["validate"]
+        validate.checks = self
+        return validate
+
+
+def field(cls, required=True, *validators):
+    """A validator that executes each validator passed as arguments, then
+    checks that the value is an instance of cls (or None if not required),
+    compiled into a single function.
+    """
+    return FieldChecks(cls, required, validators).compile()
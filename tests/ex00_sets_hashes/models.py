@@ -11,3 +11,11 @@ class Person(object):
 @related.immutable
 class RoleModels(object):
     scientists = related.SetField(Person)
+
+
+@related.immutable(cache_hash=True)
+class Team(object):
+    name = related.StringField()
+    members = related.SetField(Person)
+    roles = related.SequenceField(str, required=False)
+    leads = related.MappingField(Person, "last_name", required=False)
@@ -1,5 +1,14 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+from attr.exceptions import FrozenInstanceError
+
 import related
-from .models import Person, RoleModels
+from related.types import TypedMapping
+from .models import Person, RoleModels, Team
 
 
 def test_set_construction():
@@ -44,3 +53,80 @@ def test_strict_mode():
 
     except ValueError as e:
         assert e, "Error as expected."
+
+
+TEAM = dict(name="ENIAC",
+            members=[dict(first_name="Kathleen", last_name="Antonelli"),
+                     dict(first_name="Jean", last_name="Bartik")],
+            roles=["programmer"],
+            leads={"Bartik": dict(first_name="Jean")})
+
+
+def test_cached_hash():
+    team = related.to_model(Team, TEAM)
+
+    assert hash(team) == hash(team)
+    assert team._attrs_cached_hash is not None
+    assert team.members.frozen and team.roles.frozen and team.leads.frozen
+    assert team.leads["Bartik"].last_name == "Bartik"
+
+    with pytest.raises(FrozenInstanceError):
+        team.roles.append("operator")
+
+    # deduplication of nested models
+    teams = {related.to_model(Team, TEAM) for _ in range(3)}
+    assert teams == {team}
+
+
+def test_cached_hash_equality():
+    team = related.to_model(Team, TEAM)
+    other = related.to_model(Team, dict(TEAM, roles=["operator"]))
+
+    assert team == team
+    assert team == related.to_model(Team, TEAM)
+    assert team != other
+    assert not team == other
+    assert team != "ENIAC"
+
+    # the cached hashes short-circuit equality once computed
+    hash(team), hash(other)
+    assert team != other and team == related.to_model(Team, TEAM)
+
+    # unhashable fields are compared without hashing
+    @related.mutable
+    class Member(object):
+        name = related.StringField()
+
+    @related.immutable(cache_hash=True)
+    class Seat(object):
+        member = related.ChildField(Member)
+
+    assert Seat(Member("a")) == Seat(Member("a"))
+    assert Seat(Member("a")) != Seat(Member("b"))
+
+    # an unfrozen mapping given to __init__ is frozen into a copy
+    leads = TypedMapping(Person, {}, key="last_name")
+    team = Team(name="ENIAC", members=[], leads=leads)
+    assert team.leads.frozen and not leads.frozen
+    assert team.leads is not leads and hash(team)
+
+
+def test_cached_hash_not_pickled():
+    # str hashes differ between processes with another PYTHONHASHSEED
+    script = (
+        "import pickle, sys\n"
+        "from ex00_sets_hashes.models import Person, Team\n"
+        "team = Team('t', {Person('a', 'b')}, ['r'], {'b': Person('a', 'b')})"
+        "\n"
+        "hash(team), hash(team.roles), hash(team.members), hash(team.leads)\n"
+        "sys.stdout.write(pickle.dumps(team, 2).hex())\n")
+    env = dict(os.environ, PYTHONHASHSEED="1",
+               PYTHONPATH=os.pathsep.join(sys.path))
+    data = subprocess.check_output([sys.executable, "-c", script], env=env)
+
+    team = pickle.loads(bytes.fromhex(data.decode()))
+    expected = Team("t", {Person("a", "b")}, ["r"], {"b": Person("a", "b")})
+    assert team == expected and team in {expected}
+    assert team.roles == expected.roles and team.roles in {expected.roles}
+    assert team.members == expected.members
+    assert team.leads == expected.leads
@@ -0,0 +1,32 @@
+from os.path import join, dirname
+
+from io import StringIO
+
+from .models import Compose
+from related import to_yaml_all, from_yaml_all
+
+YML_FILE = join(dirname(__file__), "docker-compose.yml")
+
+
+def test_compose_multi_document_stream():
+    original_yaml = open(YML_FILE).read().strip()
+    stream = StringIO("---\n".join([original_yaml + "\n"] * 3))
+
+    documents = from_yaml_all(stream, Compose)
+    first = next(documents)
+    assert first.services['redis'].image == "redis"
+
+    composes = [first] + list(documents)
+    assert len(composes) == 3
+    assert composes[0] == composes[2]
+
+    generated = to_yaml_all(iter(composes),
+                            suppress_empty_values=True,
+                            suppress_map_key_values=True)
+    assert generated.count("version: '2'") == 3
+    assert list(from_yaml_all(generated, Compose)) == composes
+
+
+def test_yaml_all_empty_document():
+    assert list(from_yaml_all("---\n---\na: 1\n", extra=True)) == [
+        {"extra": True}, {"a": 1, "extra": True}]
@@ -0,0 +1,39 @@
+from datetime import date
+
+from io import StringIO
+
+from .models import DayData, DayType
+from related import to_json_lines, from_json_lines
+
+DAYS = [
+    {"date": "2017-12-18", "logged_on": "19:20", "open_at": "08:00:00",
+     "closed_on": "19:00:00", "customers": 487, "day_type": "Normal",
+     "sales": 27223.65},
+    {"date": "2017-12-19", "logged_on": "18:00", "open_at": "10:30:00",
+     "closed_on": "17:30:00", "customers": 192, "day_type": "Holiday"},
+]
+
+
+def test_json_lines_round_trip():
+    days = [DayData(**day) for day in DAYS]
+
+    stream = StringIO()
+    assert to_json_lines(days, stream, buffer_size=0,
+                         suppress_empty_values=True) == 2
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    assert lines[1].startswith('{"closed_on":"17:30:00"')
+
+    stream = StringIO(stream.getvalue() + "\n\n")
+    loaded = list(from_json_lines(stream, DayData))
+    assert loaded == days
+    assert loaded[0].date == date(2017, 12, 18)
+    assert loaded[1].day_type == DayType.HOLIDAY
+
+
+def test_json_lines_dicts():
+    stream = StringIO()
+    to_json_lines(iter(DAYS), stream, flush=True)
+    lines = stream.getvalue().splitlines()
+    assert [dict(d) for d in from_json_lines(lines)] == DAYS
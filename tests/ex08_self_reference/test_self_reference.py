@@ -1,3 +1,4 @@
+import attr
 import related
 from .models import Node
 
@@ -36,3 +37,14 @@ def test_self_reference():
     assert len(root_node.node_map) == 2
     assert root_node.node_map["F"].name == "F"
     assert root_node.node_map["F"].node_child.name == "G"
+
+
+def test_resolved_class_cached():
+    converter = attr.fields(Node).node_list.converter
+    assert converter.cls is Node
+    assert converter._resolved is Node
+
+    related.converters.reset_resolved_classes()
+    assert converter._resolved is None
+    assert related.from_json(original_json, Node).node_list[0].name == "A"
+    assert converter._resolved is Node
@@ -0,0 +1,104 @@
+# coding=utf-8
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import related
+from ex06_json.models import DayData
+
+
+def make_records(count):
+    records = []
+    for i in range(count):
+        record = {"date": "2017-01-%02d" % (i % 28 + 1),
+                  "logged_on": "19:20", "open_at": "08:00:00",
+                  "closed_on": "19:00:00", "customers": i,
+                  "day_type": "Normal"}
+        records.append(json.dumps(record) if i % 2 else record)
+
+    records[5] = dict(records[4], day_type="Invalid")
+    return records
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_to_models(executor):
+    results = list(related.to_models(DayData, make_records(50), workers=2,
+                                     chunk_size=7, executor=executor))
+
+    assert [r.index for r in results] == list(range(50))
+    assert [r.value.customers for r in results if r.ok] == \
+        [i for i in range(50) if i != 5]
+
+    failed = results[5]
+    assert not failed.ok and failed.value is None
+    assert isinstance(failed.error, ValueError)
+
+
+def test_to_models_unordered():
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(related.to_models(DayData, make_records(40),
+                                         chunk_size=3, executor=pool,
+                                         ordered=False))
+
+    assert sorted(r.index for r in results) == list(range(40))
+    assert sum(1 for r in results if not r.ok) == 1
+
+
+def test_to_models_errors():
+    assert list(related.to_models(DayData, [])) == []
+
+    with pytest.raises(ValueError):
+        list(related.to_models(DayData, [{}], executor="cluster"))
+
+    # results that cannot be sent back from a process fail their chunk only
+    results = list(related.to_models(Unpicklable, [{"x": 1}], workers=1))
+    assert not results[0].ok
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_from_json_lines_file(tmpdir, executor):
+    lines = [json.dumps(r) if isinstance(r, dict) else r
+             for r in make_records(30)]
+    lines[8] = ""
+    path = tmpdir.join("days.jsonl")
+    path.write("\n".join(lines) + "\n")
+
+    results = list(related.from_json_lines_file(
+        str(path), DayData, workers=2, range_size=200, executor=executor))
+
+    expected = [related.from_json(line, DayData)
+                for index, line in enumerate(lines) if line and index != 5]
+    assert [r.value for r in results if r.ok] == expected
+    assert [r.index for r in results] == sorted(r.index for r in results)
+
+    failed = [r for r in results if not r.ok]
+    assert len(failed) == 1 and len(results) == 29
+
+    with open(str(path), "rb") as stream:
+        stream.seek(failed[0].index)
+        assert b'"Invalid"' in stream.readline()
+
+    unordered = related.from_json_lines_file(
+        str(path), DayData, range_size=100, executor=executor, ordered=False)
+    assert sorted(r.index for r in unordered) == [r.index for r in results]
+
+
+def test_from_json_lines_file_ranges(tmpdir):
+    path = tmpdir.join("empty.jsonl")
+    path.write("")
+    assert list(related.from_json_lines_file(str(path), DayData)) == []
+
+    # a failed range is reported as a single error at its start
+    path.write('{"x": 1}\n')
+    results = list(related.from_json_lines_file(str(path), Unpicklable,
+                                                workers=1))
+    assert results[0].index == 0 and not results[0].ok
+
+
+@related.immutable
+class Unpicklable(object):
+    x = related.IntegerField()
+
+    def __reduce__(self):
+        raise TypeError("not picklable")
@@ -0,0 +1,23 @@
+# coding=utf-8
+import benchmarks
+import related
+
+
+def test_datasets_load():
+    for name, dataset in benchmarks.DATASETS.items():
+        cls, data = dataset(10)
+        obj = related.from_json(related.to_json(data), cls)
+        dumped = related.to_dict(obj, **benchmarks.runner.DUMP_KWARGS)
+        assert related.to_model(cls, dumped) == obj
+
+
+def test_run_and_compare():
+    results = benchmarks.run(scale=5, repeat=1, datasets=["store"],
+                             operations=["from_json", "round_trip"])
+    assert list(results["results"]) == ["store.from_json",
+                                        "store.round_trip"]
+    assert benchmarks.compare(results, results) == []
+
+    slower = {"results": {"store.from_json": {"seconds": 1e9}}}
+    assert benchmarks.compare(slower, results, threshold=0.5)[0][:2] == \
+        ("store.from_json", "seconds")
@@ -0,0 +1,198 @@
+# coding=utf-8
+import struct
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from uuid import uuid4
+
+import attr
+import pytest
+
+import related
+from related import binary
+from ex08_self_reference.models import Node
+
+
+class Color(Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+@related.immutable(cache_hash=True)
+class Tag(object):
+    name = related.StringField()
+    color = related.ChildField(Color, required=False)
+
+
+@related.mutable
+class Record(object):
+    count = related.IntegerField()
+    ratio = related.FloatField(required=False)
+    flag = related.BooleanField(required=False)
+    price = related.DecimalField(required=False, default=Decimal("0"))
+    uid = related.UUIDField()
+    url = related.URLField(required=False)
+    day = related.DateField(required=False)
+    stamp = related.DateTimeField(required=False)
+    hour = related.TimeField(required=False)
+    code = related.RegexField("^[A-Z]*$", required=False)
+    tags = related.SequenceField(Tag, required=False)
+    colors = related.SetField(Color, required=False)
+    by_name = related.MappingField(Tag, "name", required=False)
+    values = related.SequenceField(float, compact=True, required=False)
+    words = related.SequenceField(str, required=False, lazy=True)
+
+
+@related.immutable
+class Label(object):
+    name = related.StringField()
+
+
+RECORD = dict(
+    count=-2 ** 70, ratio=0.5, flag=False, price="-12.340", url="http://a/b?c",
+    day="2020-02-29", stamp="2020-02-29T23:59:59.000001+05:30",
+    hour="12:30:00", code="AB", tags=[dict(name="a", color="red"), None],
+    colors=["green"], by_name=dict(b=dict(color="green"), c=None),
+    values=[1.5, -2.0], words=["x", None, u"é"])
+
+
+def test_round_trip():
+    record = related.to_model(Record, RECORD)
+    data = related.to_bytes(record)
+
+    assert data[:4] == b"RLB\x01"
+    assert len(data) < len(related.to_json(record, indent=None)) / 2
+    assert related.from_bytes(data, Record) == record
+    assert related.from_bytes(bytearray(data), Record) == record
+
+    empty = Record(count=0, uid=record.uid)
+    assert related.from_bytes(related.to_bytes(empty), Record) == empty
+
+
+def test_native_values():
+    values = [Decimal("NaN"), Decimal("-0"), Decimal("1E+3"),
+              Decimal("Infinity")]
+    for value in values:
+        out = bytearray()
+        binary.encode_decimal(out, value)
+        assert str(binary.decode_decimal(bytes(out), 0)[0]) == str(value)
+
+    aware = time(1, 2, 3, 4, timezone(-timedelta(hours=3, microseconds=1)))
+    out = bytearray()
+    binary.encode_time(out, aware)
+    assert binary.decode_time(bytes(out), 0) == (aware, len(out))
+
+    stamp = datetime(1, 1, 1)
+    out = bytearray()
+    binary.encode_datetime(out, stamp)
+    assert binary.decode_datetime(bytes(out), 0)[0] == stamp
+    assert binary.decode_date(b"\x01", 0) == (date(1, 1, 1), 1)
+
+
+def test_self_reference():
+    node = related.to_model(Node, dict(
+        name="root", node_child=dict(name="child"),
+        node_list=[dict(name="item", node_list=[])],
+        node_map=dict(key=dict())))
+
+    assert related.from_bytes(related.to_bytes(node), Node) == node
+    assert binary.schema(Node).startswith(
+        "ex08_self_reference.models.Node(name:str,"
+        "node_child:ex08_self_reference.models.Node,")
+
+
+def test_codecs_published_once_compiled(monkeypatch):
+    field_codec = binary.field_codec
+
+    def checked_field_codec(cls, attribute):
+        # other threads must not see the codec of cls before it is complete
+        assert "__related_binary__" not in cls.__dict__
+        return field_codec(cls, attribute)
+
+    monkeypatch.delattr(Node, "__related_binary__", raising=False)
+    monkeypatch.setattr(binary, "field_codec", checked_field_codec)
+
+    node = related.to_model(Node, dict(name="a", node_list=[dict(name="b")]))
+    assert related.from_bytes(related.to_bytes(node), Node) == node
+    assert Node.__dict__["__related_binary__"].names[0] == "name"
+
+
+def test_schema_mismatch():
+    data = related.to_bytes(Tag("a"))
+
+    @related.immutable
+    class Tag2(object):
+        name = related.StringField()
+
+    Tag2.__name__ = Tag2.__qualname__ = "Tag"
+    with pytest.raises(ValueError) as e:
+        related.from_bytes(data, Tag2)
+    assert "Schema mismatch" in str(e.value)
+
+    with pytest.raises(ValueError):
+        related.from_bytes(data, Record)
+
+    with pytest.raises(ValueError):
+        related.from_bytes(b"RL", Tag)
+
+    with pytest.raises(ValueError) as e:
+        related.from_bytes(b"RLB\x02" + data[4:], Tag)
+    assert "version 2" in str(e.value)
+
+
+def test_invalid_data():
+    data = related.to_bytes(related.to_model(Record, RECORD))
+
+    for size in (len(data) - 1, len(data) - 17, 9):
+        with pytest.raises(ValueError) as e:
+            related.from_bytes(data[:size], Record)
+        assert "Truncated" in str(e.value)
+
+    with pytest.raises(ValueError) as e:
+        related.from_bytes(data + b"\x00", Record)
+    assert "1 trailing bytes" in str(e.value)
+
+    with pytest.raises(IndexError):
+        binary.decode_uuid(uuid4().bytes[:-4], 0)
+
+
+def test_validation():
+    record = Record(count=1, uid=uuid4())
+    object.__setattr__(record, "code", "invalid")
+    data = related.to_bytes(record)
+
+    with pytest.raises(TypeError):
+        related.from_bytes(data, Record)
+
+    assert related.from_bytes(data, Record, trusted=True).code == "invalid"
+
+
+def test_unsupported_fields():
+    @related.mutable
+    class Plain(object):
+        value = attr.attrib()
+
+    @related.mutable
+    class Other(object):
+        value = related.ChildField(struct.Struct, required=False)
+
+    with pytest.raises(TypeError):
+        related.to_bytes(Plain(1))
+
+    with pytest.raises(TypeError):
+        related.to_bytes(Other())
+
+    @related.mutable
+    class Parent(object):
+        tag = related.ChildField(Label)
+        other = related.ChildField(Other)
+
+    # no half built codec is left cached, for Parent or its fields
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            related.to_bytes(Parent(Label("a"), Other()))
+        assert "__related_binary__" not in Parent.__dict__
+        assert "__related_binary__" not in Label.__dict__
+
+    assert related.from_bytes(related.to_bytes(Label("a")), Label) == \
+        Label("a")
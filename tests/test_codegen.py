@@ -0,0 +1,103 @@
+# coding=utf-8
+import attr
+import pytest
+
+import related
+from related import validators
+
+
+def check(validator):
+    return attr.attrib(validator=validator, default=None)
+
+
+@related.immutable(cache_hash=True)
+class Code(object):
+    value = related.RegexField("^[A-Z]+$")
+    count = related.IntegerField(required=False)
+
+
+@related.mutable
+class Account(object):
+    name = related.StringField()
+    _secret = related.StringField(required=False)
+    codes = related.SequenceField(Code, required=False)
+    _token = attr.attrib(default=None)
+    labels = attr.attrib(default=attr.Factory(lambda self: [self.name],
+                                              takes_self=True))
+    even = check(lambda inst, a, value: value is None or value % 2 == 0 or
+                 pytest.fail("odd"))
+
+    def __attrs_post_init__(self):
+        self.name = self.name.strip()
+
+
+def test_generated_init():
+    assert "related generated init" in Code.__init__.__code__.co_filename
+    assert Code.__init__.__qualname__ == "Code.__init__"
+
+    account = Account(" ann ", secret="s", codes=[dict(value="AB")], token=1)
+    assert (account.name, account._secret, account._token) == ("ann", "s", 1)
+    assert account.codes[0] == Code("AB")
+    assert account.labels == [" ann "]
+    assert hash(Code("AB")) == hash(Code(value="AB", count=None))
+
+    with pytest.raises(pytest.fail.Exception):
+        Account("ann", even=1)
+
+
+def test_validation_errors():
+    with pytest.raises(TypeError) as e:
+        Code("ab")
+    assert e.value.args[0] == "'value' must match '^[A-Z]+$' (got 'ab')."
+
+    with pytest.raises(TypeError) as e:
+        Account(None)
+    assert e.value.args[0].startswith("'name' must be (<class 'str'>,)")
+
+    with pytest.raises(TypeError):
+        Account(name="ann", codes=5)
+
+    attr.set_run_validators(False)
+    try:
+        assert Code(None).value is None
+    finally:
+        attr.set_run_validators(True)
+
+
+def test_field_validator():
+    regex = validators.regex("^1")
+    calls = []
+    validate = validators.field(
+        str, False, regex, validators.composite(lambda *args: calls.append(1)))
+    attribute = attr.fields(Code).value
+
+    validate(None, attribute, None)
+    validate(None, attribute, "12")
+    assert validate.checks.cls is str and calls == [1]
+
+    with pytest.raises(TypeError):
+        validate(None, attribute, "2")
+
+    attr.validate(Code("A", 1))
+    assert "composite" in repr(validators.composite())
+    assert regex.pattern.match("1") and repr(regex) == \
+        "<regex validator for '^1'>"
+
+
+def test_unsupported_classes():
+    @related.mutable
+    class KwOnly(object):
+        name = related.StringField()
+        count = attr.attrib(default=0, kw_only=True)
+
+    @related.immutable
+    class PreInit(object):
+        name = related.StringField()
+
+        def __attrs_pre_init__(self):
+            pass
+
+    # the __init__ of attrs is kept
+    assert "attrs generated init" in KwOnly.__init__.__code__.co_filename
+    assert "attrs generated init" in PreInit.__init__.__code__.co_filename
+    assert KwOnly("a", count=1).count == 1
@@ -0,0 +1,73 @@
+# coding=utf-8
+import sys
+
+import pytest
+
+import related
+
+
+@related.immutable
+class Series(object):
+    name = related.StringField()
+    values = related.SequenceField(float, compact=True)
+    counts = related.SequenceField(int, required=False, compact=True)
+    flags = related.SequenceField(bool, required=False, compact=True)
+
+
+def test_compact_sequences():
+    series = related.to_model(Series, dict(name="cpu", values=[0.5, 1, "2"],
+                                           counts=["3", 4.0], flags=[1, 0]))
+
+    assert isinstance(series.values, related.TypedArray)
+    assert isinstance(series.values, related.TypedSequence)
+    assert series.values == [0.5, 1.0, 2.0]
+    assert series.counts == [3, 4]
+    assert series.flags == [True, False]
+    assert [type(v) for v in series.flags] == [bool, bool]
+    assert list(series.counts) == [3, 4] and 4 in series.counts
+
+    assert Series("empty", []).counts == []
+
+
+def test_compact_to_dict():
+    text = '{"name": "cpu", "values": [0.5, 1.5], "counts": [], "flags": []}'
+    series = related.from_json(text, Series)
+
+    assert related.to_dict(series) == dict(
+        name="cpu", values=[0.5, 1.5], counts=[], flags=[])
+    assert related.to_dict(series, suppress_empty_values=True) == dict(
+        name="cpu", values=[0.5, 1.5])
+    assert related.from_json(related.to_json(series), Series) == series
+    assert related.to_yaml(series) == related.to_yaml(related.to_dict(series))
+    assert "".join(related.iter_json(series)) == related.to_json(series)
+
+
+def test_compact_memory():
+    values = [float(i) for i in range(10000)]
+    series = Series("memory", values)
+
+    assert sys.getsizeof(series.values.list) < sys.getsizeof(values) + \
+        sum(sys.getsizeof(v) for v in values) / 2
+
+
+def test_compact_errors():
+    with pytest.raises(TypeError):
+        related.SequenceField(str, compact=True)
+
+    with pytest.raises(TypeError):
+        Series("none", [None])
+
+    with pytest.raises(OverflowError):
+        Series("big", [], counts=[2 ** 70])
+
+
+def test_compact_projection_and_cache_hash():
+
+    @related.immutable(cache_hash=True)
+    class Frozen(object):
+        values = related.SequenceField(int, compact=True)
+
+    frozen = related.to_model(Frozen, dict(values=[1, 2]), ["values"])
+    assert frozen.values.frozen and hash(frozen) == hash(Frozen([1, 2]))
+    assert related.to_model(Frozen, dict(values=[3]), ["values.*"]) == \
+        Frozen([3])
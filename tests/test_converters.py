@@ -0,0 +1,30 @@
+# coding=utf-8
+from datetime import datetime
+import pytest
+
+from related.converters import to_datetime_field, parse_iso_datetime
+
+
+def test_datetime_iso_format():
+    converter = to_datetime_field("ISO_FORMAT", strict=True)
+    assert converter("2017-12-18T10:30:00") == datetime(2017, 12, 18, 10, 30)
+
+    first = converter("2017-12-18T10:30:00+02:00")
+    second = parse_iso_datetime("2018-01-01T00:00:00+02:00")
+    assert first.tzinfo is second.tzinfo
+
+    with pytest.raises(ValueError):
+        converter("Dec 18 2017 10:30")
+
+
+def test_datetime_formatter():
+    converter = to_datetime_field("%d/%m/%Y %H:%M", strict=True)
+    assert converter("01/02/2018 08:00") == datetime(2018, 2, 1, 8, 0)
+
+    with pytest.raises(ValueError):
+        converter("2018-02-01T08:00:00")
+
+
+def test_datetime_dateutil_fallback():
+    converter = to_datetime_field("ISO_FORMAT")
+    assert converter("Dec 18 2017 10:30") == datetime(2017, 12, 18, 10, 30)
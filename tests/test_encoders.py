@@ -0,0 +1,92 @@
+# coding=utf-8
+import json
+from io import StringIO
+from os.path import join, dirname
+
+import pytest
+
+import related
+from ex02_compose_v3_2.models import Compose
+from ex06_json.models import StoreData
+from ex08_self_reference.models import Node
+
+COMPOSE_YML = join(dirname(__file__), "ex02_compose_v3_2",
+                   "docker-compose.yml")
+STORE_JSON = join(dirname(__file__), "ex06_json", "store-data.json")
+
+OPTIONS = [
+    {},
+    {"suppress_empty_values": True},
+    {"suppress_private_attr": True, "suppress_map_key_values": True},
+    {"suppress_empty_values": True, "suppress_map_key_values": True,
+     "indent": None, "sort_keys": False},
+]
+
+
+def load_models():
+    compose = related.from_yaml(open(COMPOSE_YML).read(), Compose)
+    store = related.from_json(open(STORE_JSON).read(), StoreData)
+    node = related.from_json('{"name": "root", "node_list": [{"name": "A"}],'
+                             ' "node_map": {"B": {}}}', Node)
+    return [compose, store, node, [store, None], {"a": [], "b": None}]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_iter_json_matches_to_json(options):
+    for obj in load_models():
+        expected = related.to_json(obj, **options)
+        assert "".join(related.iter_json(obj, **options)) == expected
+
+
+def test_to_json_stream():
+    store = load_models()[1]
+    stream = StringIO()
+    written = related.to_json_stream(store, stream, buffer_size=16)
+    assert stream.getvalue() == related.to_json(store)
+    assert written == len(stream.getvalue())
+
+
+def test_model_json_encoder():
+    compose = load_models()[0]
+    expected = json.dumps(related.to_dict(compose), ensure_ascii=False)
+    assert json.dumps(compose, cls=related.ModelJSONEncoder,
+                      ensure_ascii=False) == expected
+
+    assert "".join(related.iter_json(None)) == "null"
+    with pytest.raises(TypeError):
+        "".join(related.iter_json({"a": object()}))
+
+
+@related.immutable
+class Tag(object):
+    name = related.StringField()
+    weights = related.SequenceField(float, required=False)
+
+
+@related.to_dict.register(Tag)
+def _(obj, **kwargs):
+    return {"name": obj.name, "weights": list(obj.weights or []),
+            "shape": (2, 3), 3: None, 2.5: True, True: False, None: "n"}
+
+
+@related.immutable
+class Tagged(object):
+    tags = related.MappingField(Tag, "name")
+
+
+def test_model_json_encoder_plain_values():
+    tagged = related.to_model(Tagged, {"tags": {
+        "a": {"weights": [1.5, float("nan"), float("inf"), -float("inf")]},
+    }})
+
+    for options in ({}, {"suppress_map_key_values": True}):
+        expected = related.to_json(tagged, sort_keys=False, **options)
+        assert "".join(related.iter_json(tagged, sort_keys=False,
+                                         **options)) == expected
+
+    encoder = related.ModelJSONEncoder(allow_nan=False)
+    with pytest.raises(ValueError):
+        encoder.encode(tagged)
+
+    encoder = related.ModelJSONEncoder(skipkeys=True)
+    assert encoder.encode({"a": 1, (1, 2): 2}) == '{"a": 1}'
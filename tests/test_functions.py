@@ -0,0 +1,162 @@
+# coding=utf-8
+from datetime import date
+from collections import OrderedDict
+import sys
+
+import related
+
+
+@related.mutable
+class Item(object):
+    name = related.StringField(key="title")
+    _secret = related.StringField(required=False)
+    made_on = related.DateField("%m/%d/%Y", required=False)
+
+
+def test_compiled_to_dict_cached_on_class():
+    item = Item(name="widget", secret="x", made_on=date(2018, 1, 2))
+    assert related.to_dict(item) == OrderedDict([("title", "widget"),
+                                                 ("_secret", "x"),
+                                                 ("made_on", "01/02/2018")])
+
+    serializer = Item.__dict__["__related_to_dict__"]
+    related.to_dict(item)
+    assert Item.__dict__["__related_to_dict__"] is serializer
+
+
+def test_compiled_to_dict_suppression():
+    item = Item(name="widget", secret="x")
+    assert related.to_dict(item, suppress_private_attr=True,
+                           suppress_empty_values=True) == {"title": "widget"}
+    assert isinstance(related.to_dict(item, dict_factory=dict), dict)
+
+
+def test_construction_plan():
+    plan = related.functions.construction_plan(Item)
+    assert plan is related.functions.construction_plan(Item)
+    assert plan.allowed_keys == frozenset(["title", "_secret", "made_on"])
+    assert not plan.identity
+
+    item = related.to_model(Item, {"title": "widget", "ignored": 1})
+    assert item.name == "widget"
+    assert item.made_on is None
+
+
+def test_model_converter():
+    convert = related.functions.model_converter(Item)
+    item = convert({"title": "widget"})
+    assert item.name == "widget"
+    assert convert(item) is item
+    assert convert(None) is None
+
+    assert related.functions.model_converter(int)("5") == 5
+
+
+def test_yaml_classes_cached():
+    from related.functions import ordered_dumper, ordered_loader
+
+    loader = ordered_loader()
+    assert loader is ordered_loader(None, OrderedDict)
+    assert issubclass(loader, related.functions.DEFAULT_YAML_LOADER)
+    assert ordered_loader(object_pairs_hook=dict) is not loader
+
+    dumper = ordered_dumper()
+    assert dumper is ordered_dumper()
+    assert issubclass(dumper, related.functions.DEFAULT_YAML_DUMPER)
+
+    assert related.from_yaml("b: 1\na: 2") == OrderedDict([("b", 1),
+                                                          ("a", 2)])
+
+
+def test_yaml_construction():
+    # documents are loaded like to_model, by from_yaml and from_yaml_all
+    text = "title: widget\nignored: 1\n"
+    item = related.from_yaml(text, Item)
+    assert item.name == "widget"
+    assert list(related.from_yaml_all(text, Item)) == [item]
+
+
+@related.immutable
+class Wrapper(object):
+    item = related.ChildField(Item)
+    items = related.SequenceField(Item, required=False)
+
+
+class Custom(object):
+    pass
+
+
+@related.to_dict.register(Custom)
+def _(obj, **kwargs):
+    return dict(kwargs)
+
+
+def test_serialization_options():
+    wrapper = Wrapper(item=Item(name="a"), items=[Item(name="b")])
+    options = related.functions.SerializationOptions(
+        suppress_empty_values=True, dict_factory=dict)
+
+    result = related.to_dict(wrapper, options=options)
+    assert result == {"item": {"title": "a"}, "items": [{"title": "b"}]}
+    assert type(result["item"]) is dict
+    assert result == related.to_dict(wrapper, suppress_empty_values=True)
+
+    plain = related.to_dict(wrapper, dict_factory=dict)
+    assert type(plain) is dict and plain["item"]["_secret"] is None
+
+
+def test_serialization_options_custom_to_dict():
+    kwargs = related.to_dict([Custom()], suppress_empty_values=True,
+                             extra="value")[0]
+    assert kwargs["suppress_empty_values"] is True
+    assert kwargs["extra"] == "value"
+    assert kwargs["formatter"] is None
+    assert kwargs["options"].extras == (("extra", "value"),)
+
+
+class Suppressing(object):
+    def __init__(self, item):
+        self.item = item
+
+
+@related.to_dict.register(Suppressing)
+def _(obj, **kwargs):
+    kwargs["suppress_empty_values"] = True
+    return related.to_dict(obj.item, **kwargs)
+
+
+def test_serialization_options_changed_by_custom_to_dict():
+    result = related.to_dict(dict(w=Suppressing(Item(name="x"))),
+                             dict_factory=dict, extra="value")
+    assert result == {"w": {"title": "x"}}
+
+    options = related.functions.SerializationOptions(dict_factory=dict)
+    assert related.functions.SerializationOptions.from_kwargs(
+        dict(options=options, dict_factory=dict)) is options
+
+
+@related.mutable
+class Entry(object):
+    key = related.StringField()
+
+
+@related.mutable(slots=True)
+class Slotted(object):
+    name = related.StringField()
+    entries = related.SequenceField(Entry, required=False)
+    by_key = related.MappingField(Entry, "key", required=False, lazy=True)
+
+
+def test_mutable_slots():
+    slotted = related.to_model(Slotted, dict(name="a", by_key=dict(x={})))
+    entry = Entry("x")
+
+    assert not hasattr(slotted, "__dict__")
+    assert sys.getsizeof(slotted) < \
+        sys.getsizeof(entry) + sys.getsizeof(entry.__dict__)
+
+    slotted.name = "b"
+    assert slotted.by_key["x"] == entry
+    assert related.to_dict(slotted) == dict(name="b", entries=[],
+                                            by_key=dict(x=dict(key="x")))
+    assert related.to_model(Slotted, related.to_dict(slotted)) == slotted
@@ -0,0 +1,154 @@
+# coding=utf-8
+import pytest
+from attr.exceptions import FrozenInstanceError
+
+import related
+from related.types import IndexedSequence, IndexedMapping
+
+
+@related.immutable
+class Service(object):
+    name = related.StringField()
+    image = related.StringField(required=False)
+    port = related.IntegerField(required=False)
+
+
+@related.mutable
+class Deployment(object):
+    services = related.SequenceField(Service, index="image", unique="name",
+                                     required=False)
+    by_name = related.MappingField(Service, "name", index=["image"],
+                                   unique=("port",), required=False)
+
+
+@related.immutable(cache_hash=True)
+class Frozen(object):
+    services = related.SequenceField(Service, index="image")
+
+
+SERVICES = [dict(name="web", image="nginx", port=80),
+            dict(name="api", image="python", port=8000),
+            dict(name="worker", image="python", port=8001)]
+
+
+def test_sequence_indexes():
+    deployment = related.to_model(Deployment, dict(services=SERVICES))
+    services = deployment.services
+    web, api, worker = services
+
+    assert isinstance(services, IndexedSequence)
+    assert services.find("image", "python") == [api, worker]
+    assert services.find("image", "redis") == []
+    assert services.find_one("name", "web") is web
+    assert services.find_one("name", "db") is None
+
+    with pytest.raises(KeyError):
+        services.find("port", 80)
+
+    # indexes are maintained on insert, set and delete
+    redis = Service("cache", "redis")
+    services.append(redis)
+    services[0] = Service("web", "httpd")
+    del services[1]
+    services.append(None)
+
+    assert services.find("image", "redis") == [redis]
+    assert services.find("image", "nginx") == []
+    assert services.find_one("image", "httpd").name == "web"
+    assert services.find("image", "python") == [worker]
+
+    del services[:2]
+    assert services.find("image", "httpd") == []
+    assert set(services.indexes["image"].entries) == {"redis"}
+
+
+def test_sequence_unique():
+    with pytest.raises(ValueError):
+        related.to_model(Deployment, dict(services=SERVICES + SERVICES[:1]))
+
+    deployment = related.to_model(Deployment, dict(services=SERVICES))
+    services = deployment.services
+
+    with pytest.raises(ValueError):
+        services.append(Service("api"))
+    with pytest.raises(ValueError):
+        services[0] = Service("api", "nginx")
+
+    # failed changes leave the container and its indexes untouched
+    assert [s.name for s in services] == ["web", "api", "worker"]
+    assert len(services.find("image", "nginx")) == 1
+
+    # an item can be replaced by an item with the same unique value
+    services[0] = Service("web", "httpd")
+    assert services.find_one("name", "web").image == "httpd"
+
+
+def test_sequence_unique_moves():
+    deployment = related.to_model(Deployment, dict(services=SERVICES))
+    services = deployment.services
+    web, api, worker = services
+
+    services[0], services[2] = services[2], services[0]
+    assert list(services) == [worker, api, web]
+
+    services.reverse()
+    assert list(services) == [web, api, worker]
+
+    for i, service in enumerate(sorted(services, key=lambda s: s.name)):
+        services[i] = service
+    assert list(services) == [api, web, worker]
+
+    assert services.find_one("name", "web") is web
+    assert services.indexes["name"].entries == dict(
+        web=[web], api=[api], worker=[worker])
+    assert sorted(s.name for s in services.find("image", "python")) == \
+        ["api", "worker"]
+
+
+def test_mapping_indexes():
+    by_name = dict((s["name"], dict(s)) for s in SERVICES)
+    deployment = related.to_model(Deployment, dict(by_name=by_name))
+    mapping = deployment.by_name
+
+    assert isinstance(mapping, IndexedMapping)
+    assert [s.name for s in mapping.find("image", "python")] == \
+        ["api", "worker"]
+    assert mapping.find_one("port", 80) is mapping["web"]
+
+    with pytest.raises(ValueError):
+        mapping["db"] = Service("db", "postgres", 80)
+
+    mapping["web"] = Service("web", "nginx", 80)
+    mapping["db"] = Service("db", "postgres", 5432)
+    del mapping["api"]
+
+    assert mapping.find_one("image", "postgres") is mapping["db"]
+    assert [s.name for s in mapping.find("image", "python")] == ["worker"]
+    assert mapping.find("port", 8000) == []
+
+    # a mapping without the indexes is indexed by the field
+    plain = related.TypedMapping(Service, mapping.dict, key="name")
+    assert Deployment(by_name=plain).by_name.find_one("port", 80).name == \
+        "web"
+    assert Deployment(by_name=mapping).by_name is mapping
+
+
+def test_frozen_and_projected_indexes():
+    frozen = related.to_model(Frozen, dict(services=SERVICES))
+    assert frozen.services.find("image", "python")[0].name == "api"
+
+    with pytest.raises(FrozenInstanceError):
+        frozen.services.append(Service("db"))
+    assert hash(frozen)
+
+    projected = related.to_model(Deployment, dict(services=SERVICES),
+                                 ["services.*.image", "services.*.name"])
+    assert projected.services.find_one("name", "web").port is None
+
+
+def test_invalid_indexes():
+    with pytest.raises(TypeError):
+        related.SequenceField(int, compact=True, index="real")
+
+    assert related.SequenceField(Service).converter.sequence([]).__class__ \
+        is related.TypedSequence
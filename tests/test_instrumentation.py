@@ -0,0 +1,84 @@
+# coding=utf-8
+import related
+from related import instrumentation
+
+
+@related.immutable
+class Event(object):
+    name = related.StringField()
+    at = related.DateTimeField(required=False)
+
+
+@related.immutable
+class Calendar(object):
+    events = related.SequenceField(Event)
+
+
+class Text(object):
+    pass
+
+
+@related.to_dict.register(Text)
+def _(obj, **kwargs):
+    return "text"
+
+
+EVENT = "test_instrumentation.Event"
+CALENDAR = "test_instrumentation.Calendar"
+
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    init = Event.__init__
+
+    related.to_dict(Event(name="a"))
+    assert instrumentation.snapshot() == {}
+    assert Event.__init__ is init
+
+
+def test_counters():
+    original_init = Event.__init__
+    instrumentation.enable()
+    try:
+        calendar = related.to_model(Calendar, {"events": [
+            {"name": "a", "at": "2018-01-02T03:04:05"},
+            {"name": "b", "at": "Jan 2 2018 3:04AM"},
+        ]})
+        related.to_dict(calendar)
+        related.to_dict(calendar, suppress_private_attr=True,
+                        suppress_empty_values=True)
+
+        @related.mutable
+        class Note(object):
+            text = related.ChildField(Text)
+
+        related.to_dict(Note(text=Text()))
+    finally:
+        instrumentation.disable()
+
+    assert Event.__init__ is original_init
+    assert "__related_to_dict__" not in Calendar.__dict__
+
+    counters = instrumentation.snapshot()
+    assert counters[(EVENT, None, "load")]["calls"] == 2
+    assert counters[(EVENT, "at", "load")]["calls"] == 2
+    assert counters[(EVENT, "at", "load")]["misses"] == 1
+    assert counters[(CALENDAR, "events", "load")]["calls"] == 1
+    assert counters[(EVENT, "name", "dump")]["calls"] == 4
+    assert counters[(EVENT, "at", "dump")]["misses"] == 0
+    assert counters[(CALENDAR, None, "dump")]["seconds"] > 0
+
+    note = "test_instrumentation.Note"
+    assert counters[(note, "text", "dump")]["misses"] == 1
+
+    text = instrumentation.to_prometheus()
+    assert "# TYPE related_calls_total counter" in text
+    assert ('related_fast_path_misses_total{model="%s",field="at",'
+            'direction="load"} 1' % EVENT) in text
+
+    # nothing is recorded once disabled
+    related.to_model(Event, {"name": "c"})
+    assert instrumentation.snapshot() == counters
+
+    instrumentation.reset()
+    assert instrumentation.snapshot()[(EVENT, None, "load")]["calls"] == 0
@@ -0,0 +1,148 @@
+# coding=utf-8
+import threading
+
+import related
+from related import interning
+
+
+@related.immutable
+class Address(object):
+    street = related.StringField()
+    city = related.StringField()
+
+
+@related.immutable
+class Person(object):
+    name = related.StringField()
+    address = related.ChildField(Address)
+
+
+@related.immutable(cache_hash=True)
+class Team(object):
+    name = related.StringField()
+    tags = related.SequenceField(str)
+
+
+@related.immutable(lazy=True)
+class Lazy(object):
+    address = related.ChildField(Address)
+
+
+@related.mutable
+class Directory(object):
+    people = related.SequenceField(Person)
+    teams = related.SequenceField(Team, required=False)
+    lazy = related.SequenceField(Lazy, required=False)
+
+
+ADDRESS = dict(street="1 Main St", city="Springfield")
+DATA = dict(people=[dict(name="Ann", address=dict(ADDRESS)),
+                    dict(name="Bob", address=dict(ADDRESS)),
+                    dict(name="Ann", address=dict(ADDRESS))])
+
+
+def test_disabled_by_default():
+    directory = related.to_model(Directory, DATA)
+    first, second, third = directory.people
+
+    assert first == third and first is not third
+    assert first.address is not second.address
+    assert interning.active == 0 and interning.current_table() is None
+
+
+def test_interned_models_and_strings():
+    with related.InternTable() as table:
+        directory = related.from_json(related.to_json(DATA), Directory)
+        assert interning.current_table() is table
+
+    first, second, third = directory.people
+    assert first is third
+    assert first.address is second.address
+
+    stats = table.stats()
+    assert stats["models_shared"] == 3  # 2 addresses and 1 person
+    assert stats["strings_shared"] == 5  # Ann, 2 streets and 2 cities
+    assert stats["bytes_saved"] > 0
+    assert stats["models"] == 3  # Ann, Bob and the address
+    assert interning.active == 0
+
+
+def test_reused_table():
+    table = related.InternTable()
+
+    with table:
+        first = related.from_json(related.to_json(DATA), Directory)
+    with table:
+        second = related.from_yaml(related.to_yaml(DATA), Directory)
+
+    # interned values are shared across loads, counters are per load
+    assert first.people[0] is second.people[0]
+    assert table.stats()["models_shared"] == 6
+
+    # nested with blocks of the same table keep its counters
+    with table:
+        with table:
+            related.to_model(Person, DATA["people"][0])
+        related.to_model(Person, DATA["people"][0])
+    assert table.stats()["models_shared"] == 4  # 2 persons, 2 addresses
+
+
+def test_unhashable_and_lazy_models():
+    data = dict(people=[], teams=[dict(name="a", tags=["x"])] * 2,
+                lazy=[dict(address=ADDRESS)] * 2)
+
+    with related.InternTable() as table:
+        directory = related.to_model(Directory, data)
+
+    assert directory.teams[0] is directory.teams[1]
+    assert directory.lazy[0] is not directory.lazy[1]
+    assert table.stats()["bytes_saved"] > 0
+
+    # models with unhashable values are not interned
+    unhashable = Address(street="s", city="c")
+    object.__setattr__(unhashable, "city", ["c"])
+    assert table.intern_model(unhashable) is unhashable
+
+
+@related.immutable(cache_hash=True)
+class Payment(object):
+    amount = related.DecimalField()
+    when = related.DateTimeField()
+    rates = related.SequenceField(float, required=False)
+
+
+def test_equal_but_different_values():
+    payments = [dict(amount="1.0", when="2020-01-01T00:00:00+00:00"),
+                dict(amount="1.00", when="2020-01-01T01:00:00+01:00"),
+                dict(amount="1.0", when="2020-01-01T00:00:00+00:00",
+                     rates=[0.0]),
+                dict(amount="1.0", when="2020-01-01T00:00:00+00:00",
+                     rates=[-0.0])]
+
+    with related.InternTable() as table:
+        loaded = [related.to_model(Payment, p) for p in payments]
+        again = related.to_model(Payment, payments[1])
+
+    # interning never changes the dumped data
+    assert loaded[0] == loaded[1] and again is loaded[1]
+    assert [related.to_dict(p, dict_factory=dict) for p in loaded] == \
+        [related.to_dict(related.to_model(Payment, p), dict_factory=dict)
+         for p in payments]
+    assert table.stats()["models"] == 4
+
+
+def test_tables_are_per_thread():
+    people = []
+
+    def load():
+        people.extend(related.to_model(Directory, DATA).people)
+
+    with related.InternTable() as table:
+        thread = threading.Thread(target=load)
+        thread.start()
+        thread.join()
+
+    assert people[0] is not people[2]
+    assert table.stats()["models"] == 0
+    assert interning.intern_string(None) is None
+    assert interning.intern_model(people[0]) is people[0]
@@ -0,0 +1,128 @@
+# coding=utf-8
+import pickle
+
+import pytest
+
+import related
+from related.lazy import LazyValue
+
+
+@related.immutable
+class Leaf(object):
+    name = related.StringField()
+    size = related.IntegerField(required=False)
+
+
+@related.immutable(lazy=True)
+class Tree(object):
+    name = related.StringField()
+    root = related.ChildField(Leaf, required=False)
+    leaves = related.SequenceField(Leaf, required=False)
+    by_name = related.MappingField(Leaf, "name", required=False)
+    eager = related.ChildField(Leaf, required=False, lazy=False)
+
+
+@related.mutable
+class Bag(object):
+    items = related.SequenceField(Leaf, lazy=True)
+    first = related.ChildField(Leaf, required=False)
+
+
+DATA = {
+    "name": "tree",
+    "root": {"name": "root", "size": 1},
+    "leaves": [{"name": "a"}, {"name": "b", "size": 2}],
+    "by_name": {"c": {"size": 3}},
+    "eager": {"name": "eager"},
+}
+
+
+def raw(obj, name):
+    return type(obj).__dict__[name].raw(obj)
+
+
+def test_lazy_class():
+    tree = related.to_model(Tree, DATA)
+    assert isinstance(raw(tree, "root"), LazyValue)
+    assert isinstance(raw(tree, "leaves"), LazyValue)
+    assert isinstance(raw(tree, "by_name"), LazyValue)
+    assert isinstance(tree.eager, Leaf)
+
+    assert tree.root == Leaf(name="root", size=1)
+    assert raw(tree, "root") is tree.root
+    assert [leaf.name for leaf in tree.leaves] == ["a", "b"]
+    assert tree.by_name["c"] == Leaf(name="c", size=3)
+
+    assert tree == related.to_model(Tree, DATA)
+    assert "LazyValue" not in repr(tree)
+
+
+def test_lazy_validation_on_access():
+    tree = related.to_model(Tree, dict(DATA, leaves=[{"name": None}]))
+    with pytest.raises(TypeError):
+        tree.leaves
+
+
+def test_lazy_to_dict_converts():
+    data = dict(DATA, root={"name": "root", "password": "x"})
+    eager = related.to_dict(related.to_model(Tree, data), dict_factory=dict)
+    tree = related.to_model(Tree, data)
+
+    # untouched lazy fields are dumped like the converted fields
+    result = related.to_dict(tree, dict_factory=dict)
+    assert result == eager
+    assert result["root"] == {"name": "root", "size": None}
+    assert result["by_name"] == {"c": {"name": "c", "size": 3}}
+    assert related.to_dict(related.to_model(Tree, data),
+                           suppress_map_key_values=True,
+                           suppress_empty_values=True)["by_name"] == \
+        {"c": {"size": 3}}
+
+    tree = related.to_model(Tree, data)
+    assert "".join(related.iter_json(tree)) == related.to_json(tree)
+    assert related.to_json(tree) == related.to_json(
+        related.to_model(Tree, data))
+
+
+def test_lazy_to_dict_raw_values():
+    tree = related.to_model(Tree, DATA)
+    result = related.to_dict(tree, dict_factory=dict, raw_lazy_values=True)
+
+    assert result["root"] == {"name": "root", "size": 1}
+    assert result["leaves"] == [{"name": "a"}, {"name": "b", "size": 2}]
+    assert isinstance(raw(tree, "root"), LazyValue)
+    assert repr(raw(tree, "root")) == "LazyValue({'name': 'root', 'size': 1})"
+    assert "".join(related.iter_json(tree, raw_lazy_values=True)) == \
+        related.to_json(tree, raw_lazy_values=True)
+    assert isinstance(raw(tree, "root"), LazyValue)
+
+    # accessed fields are dumped from their converted value
+    tree.by_name
+    assert related.to_dict(tree, raw_lazy_values=True)["by_name"] == \
+        related.to_dict(tree)["by_name"]
+
+
+def test_lazy_field_on_mutable_class():
+    bag = Bag(items=[{"name": "a"}], first={"name": "b"})
+    assert isinstance(raw(bag, "items"), LazyValue)
+    assert isinstance(bag.first, Leaf)
+    assert bag.items[0].name == "a"
+
+    bag.items = [Leaf(name="c")]
+    assert bag.items == [Leaf(name="c")]
+    assert Bag.items.name == "items"
+
+    with pytest.raises(AttributeError):
+        Bag.__new__(Bag).items
+
+
+def test_pickle_untouched_lazy_fields():
+    bag = Bag(items=[{"name": "a"}])
+    loaded = pickle.loads(pickle.dumps(bag))
+    assert not isinstance(raw(loaded, "items"), LazyValue)
+    assert loaded.items == [Leaf(name="a")] and loaded == bag
+
+    # the records of the process executor are pickled to the parent
+    results = list(related.to_models(Bag, [dict(items=[{"name": "a"}])],
+                                     executor="process"))
+    assert results[0].ok and results[0].value == bag
@@ -0,0 +1,154 @@
+# coding=utf-8
+import gc
+from collections import OrderedDict
+
+import pytest
+
+import related
+from related import memoize
+from related.memoize import _copy
+from related.functions import SerializationOptions, model_serializer
+
+
+@related.immutable
+class Section(object):
+    name = related.StringField()
+    values = related.SequenceField(str, required=False)
+
+
+@related.mutable
+class Response(object):
+    status = related.IntegerField()
+    config = related.ChildField(Section)
+
+
+@related.mutable
+class Catalog(object):
+    sections = related.MappingField(Section, "name")
+
+
+@pytest.fixture
+def cache():
+    yield memoize.enable(maxsize=4)
+    memoize.disable()
+
+
+def test_disabled_by_default():
+    assert not memoize.is_enabled()
+    assert memoize.info() is None
+    memoize.clear()
+
+
+def test_frozen_objects_are_cached(cache):
+    memoize.enable(maxsize=4, copy=False)
+    config = Section("config", ["a"])
+    first = related.to_dict(Response(200, config))
+    second = related.to_dict(Response(404, config))
+
+    assert first["config"] is second["config"]
+    assert second == OrderedDict([("status", 404),
+                                  ("config", first["config"])])
+    assert related.to_dict(config) is first["config"]
+
+    # mutable objects are never cached
+    assert memoize.info() == OrderedDict([("hits", 2), ("misses", 1),
+                                          ("size", 1), ("maxsize", 4)])
+
+
+def test_cached_by_options(cache):
+    config = Section("config")
+    ordered = related.to_dict(config)
+    plain = related.to_dict(config, dict_factory=dict)
+
+    assert type(ordered) is OrderedDict and type(plain) is dict
+    assert related.to_dict(config, dict_factory=dict) == plain
+    assert len(cache) == 2 and cache.hits == 1
+
+    # unhashable extras are converted without caching
+    assert related.to_dict(config, extra=[1]) == ordered
+    assert len(cache) == 2
+
+
+def test_copies(cache):
+    config = Section("config", ["a"])
+    first, second = related.to_dict(config), related.to_dict(config)
+
+    assert first == second
+    assert first is not second and first["values"] is not second["values"]
+
+    # callers can change the results, nested ones included
+    response = related.to_dict(Response(200, config))
+    response["config"]["values"].append("b")
+    first["name"] = "changed"
+    assert related.to_dict(config) == second
+    assert related.to_dict(Response(200, config))["config"] == second
+
+    @related.immutable
+    class Frozen(object):
+        config = related.ChildField(Section)
+
+    frozen = related.to_dict(Frozen(config))
+    frozen["config"]["values"].append("c")
+    assert related.to_dict(Frozen(config))["config"] == second
+
+    values = {1}
+    assert _copy(values) == values and _copy(values) is not values
+
+
+def test_suppressed_map_keys(cache):
+    catalog = related.to_model(Catalog, dict(sections=dict(a=dict())))
+    first = related.to_dict(catalog, suppress_map_key_values=True)
+    second = related.to_dict(catalog, suppress_map_key_values=True)
+
+    assert first == second == dict(sections=dict(a=dict(values=[])))
+    text = related.to_json(catalog, suppress_map_key_values=True, indent=None)
+    assert text == '{"sections": {"a": {"values": []}}}'
+    assert related.to_dict(catalog.sections["a"]) == dict(name="a",
+                                                          values=[])
+
+
+def test_eviction(cache):
+    sections = [Section(str(i)) for i in range(6)]
+    for section in sections:
+        related.to_dict(section)
+
+    assert len(cache) == 4
+    related.to_dict(sections[2])
+    related.to_dict(sections[0])
+    assert memoize.info()["hits"] == 1
+
+    # least recently used entries are evicted first
+    options = SerializationOptions()
+    assert (id(sections[2]), options) in cache._results
+    assert (id(sections[1]), options) not in cache._results
+
+    memoize.clear()
+    assert len(cache) == 0
+
+
+def test_collected_objects_are_evicted(cache):
+    related.to_dict(Section("temporary"))
+    related.to_dict(Section("temporary"), dict_factory=dict)
+    gc.collect()
+
+    assert len(cache) == 0 and not cache._objects
+
+
+def test_unreferenceable_objects():
+    cache = memoize.ToDictCache()
+    serializer = model_serializer(Section)
+
+    class NoRef(tuple):
+        __slots__ = ()
+        __setattr__ = Section.__setattr__
+
+    obj = NoRef()
+    assert cache.get(obj, SerializationOptions(), lambda o, opt: {}) == {}
+    assert len(cache) == 0
+
+    section = Section("s")
+    result = cache.get(section, SerializationOptions(), serializer)
+    del cache
+    del section
+    gc.collect()
+    assert result["name"] == "s"
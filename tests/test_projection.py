@@ -0,0 +1,222 @@
+# coding=utf-8
+import io
+import os
+
+import pytest
+from attr import Factory
+
+import related
+from related.functions import compile_projection
+
+from ex02_compose_v3_2.models import Compose
+from ex06_json.models import StoreData, DayData
+
+HERE = os.path.dirname(__file__)
+
+
+def read(*path):
+    with io.open(os.path.join(HERE, *path), encoding="utf-8") as stream:
+        return stream.read()
+
+
+@related.immutable
+class Item(object):
+    name = related.StringField()
+    count = related.IntegerField(default=1)
+    tags = related.SequenceField(str, required=False)
+
+
+@related.mutable
+class Catalog(object):
+    title = related.StringField()
+    items = related.SequenceField(Item, required=False)
+    labels = related.SetField(str, required=False)
+    featured = related.ChildField(Item, required=False)
+    by_name = related.MappingField(Item, "name", required=False)
+
+
+@related.immutable
+class Label(object):
+    text = related.StringField()
+    color = related.StringField(default=Factory(lambda: "black"))
+
+
+@related.immutable
+class Labelled(object):
+    labels = related.SetField(Label)
+    size = related.IntegerField(default=Factory(lambda self: 1,
+                                                takes_self=True))
+
+
+def test_compile_projection():
+    assert compile_projection(["services.*.image", "version"]) == {
+        "services": {"*": {"image": True}},
+        "version": True,
+    }
+    assert compile_projection(["days[*].sales", "days[*].date"]) == {
+        "days": {"*": {"sales": True, "date": True}},
+    }
+
+    # a whole subtree wins over its paths, in either order
+    assert compile_projection(["a.b", "a"]) == {"a": True}
+    assert compile_projection(["a", "a.b"]) == {"a": True}
+
+    tree = {"a": True}
+    assert compile_projection(tree) is tree
+    assert compile_projection(["", "."]) == {}
+    assert compile_projection("days[*].sales") == {"days": {"*": {
+        "sales": True}}}
+
+
+def test_from_json_projection():
+    store = related.from_json(read("ex06_json", "store-data.json"),
+                              StoreData, projection={"days[*].sales"})
+
+    assert store.name is None
+    assert store.created_on is None
+    assert [day.sales for day in store.days] == [27223.65, None]
+
+    day = store.days[0]
+    assert isinstance(day, DayData)
+    assert day.date is None and day.customers is None
+
+
+def test_from_yaml_projection():
+    compose = related.from_yaml(read("ex02_compose_v3_2",
+                                     "docker-compose.yml"),
+                                Compose, projection=["services.*.image"])
+
+    assert compose.version is None
+    assert list(compose.services) == ["web", "redis"]
+    assert compose.services["redis"].image == "redis"
+    assert compose.services["redis"].name == "redis"
+    assert compose.services["web"].image is None
+    assert compose.services["web"].ports is None
+
+
+def test_projection_of_mapping_keys():
+    compose = related.from_yaml(read("ex02_compose_v3_2",
+                                     "docker-compose.yml"),
+                                Compose, projection=["services.web"])
+
+    assert list(compose.services) == ["web"]
+    web = compose.services["web"]
+    assert web.build == "."
+    assert [port.published for port in web.ports] == [5000, 8080]
+
+    compose = related.from_yaml(read("ex02_compose_v3_2",
+                                     "docker-compose.yml"),
+                                Compose,
+                                projection=["services.web.ports.*.published"])
+
+    ports = compose.services["web"].ports
+    assert [port.published for port in ports] == [5000, 8080]
+    assert [port.target for port in ports] == [5000, None]
+
+
+def test_projection_skips_invalid_fields():
+    data = {"title": 5, "items": [{"name": "a", "count": "x"}],
+            "labels": ["x", "y"]}
+
+    with pytest.raises(ValueError):
+        related.to_model(Catalog, data)
+
+    catalog = related.to_model(Catalog, data, ["items.name", "labels"])
+    assert catalog.title is None
+    assert catalog.items[0].name == "a"
+    assert catalog.items[0].count is None
+    assert catalog.labels == {"x", "y"}
+
+
+def test_projection_validates_selected_fields():
+    with pytest.raises(TypeError):
+        related.to_model(Catalog, {}, ["title"])
+
+    with pytest.raises(TypeError):
+        related.to_model(Catalog, {"items": [{}]}, ["items.name"])
+
+    with pytest.raises(ValueError):
+        related.to_model(Catalog, {"items": [{"name": "a", "count": "x"}]},
+                         ["items"])
+
+
+@related.immutable(strict=True)
+class Code(object):
+    value = related.RegexField("^[A-Z]+$")
+    size = related.IntegerField(required=False)
+
+
+def test_projection_construction():
+    # projected models are constructed like full loads: trusted, strict
+    # and interned
+    code = related.to_model(Code, {"value": "b", "size": 1}, ["value"],
+                            trusted=True)
+    assert code.value == "b" and code.size is None
+
+    with pytest.raises(TypeError):
+        related.to_model(Code, {"value": "b"}, ["value"])
+
+    with pytest.raises(ValueError):
+        related.to_model(Code, {"value": "B", "other": 1}, ["value"])
+
+    with related.InternTable():
+        first, second = [related.to_model(Code, {"value": "B"}, ["value"])
+                         for _ in range(2)]
+    assert first is second
+
+
+def test_projection_defaults_and_children():
+    data = {"title": "t", "featured": {"name": "f", "tags": ["a"]},
+            "items": [{"name": "a"}, None]}
+    catalog = related.to_model(Catalog, data,
+                               ["items.*.count", "featured.tags"])
+
+    assert catalog.title is None
+    assert catalog.featured.name is None
+    assert catalog.featured.tags == ["a"]
+    assert [item.count for item in catalog.items[:1]] == [1]
+    assert catalog.items[1] is None
+
+    catalog = related.to_model(Catalog, {}, ["items", "labels"])
+    assert catalog.items == [] and catalog.labels == set()
+
+
+def test_from_json_lines_projection():
+    lines = ['{"title": "a", "items": [{"name": "x", "count": 2}]}', "",
+             '{"title": "b"}']
+    catalogs = list(related.from_json_lines(lines, Catalog,
+                                            projection=["items.*.count"]))
+
+    assert [catalog.title for catalog in catalogs] == [None, None]
+    assert [item.count for item in catalogs[0].items] == [2]
+    assert catalogs[0].items[0].name is None
+    assert catalogs[1].items == []
+
+
+def test_from_yaml_all_projection():
+    stream = "title: a\nlabels: [x]\n---\ntitle: b\n"
+    catalogs = list(related.from_yaml_all(stream, Catalog,
+                                          projection=["title"]))
+
+    assert [catalog.title for catalog in catalogs] == ["a", "b"]
+    assert [catalog.labels for catalog in catalogs] == [None, None]
+
+
+def test_projection_of_sets_and_factory_defaults():
+    labelled = related.to_model(Labelled, {"labels": [{"text": "a"}]},
+                                ["labels.*.color", "size"])
+
+    assert labelled.size == 1
+    assert [label.color for label in labelled.labels] == ["black"]
+    assert [label.text for label in labelled.labels] == [None]
+
+
+def test_projection_of_cached_hash_models():
+
+    @related.immutable(cache_hash=True)
+    class Point(object):
+        x = related.IntegerField()
+        y = related.IntegerField(required=False)
+
+    point = related.to_model(Point, dict(x=1, y=2), ["x"])
+    assert point == Point(1) and hash(point) == hash(Point(1))
@@ -0,0 +1,136 @@
+# coding=utf-8
+import threading
+
+import pytest
+
+import related
+from related import trust
+
+
+@related.immutable(cache_hash=True)
+class Code(object):
+    value = related.RegexField("^[A-Z]+$")
+
+
+@related.mutable
+class Record(object):
+    name = related.StringField()
+    count = related.IntegerField(default=0)
+    code = related.ChildField(Code, required=False)
+    codes = related.SequenceField(Code, required=False)
+
+    def __attrs_post_init__(self):
+        self.name = self.name and self.name.strip()
+
+
+VALID = dict(name=" a ", code=dict(value="AB"), codes=[dict(value="C")])
+INVALID = dict(name=None, count="2", code=dict(value="ab"),
+               codes=[dict(value="c")])
+
+
+def test_validated_by_default():
+    assert related.to_model(Record, VALID).name == "a"
+
+    with pytest.raises(TypeError):
+        related.to_model(Record, INVALID)
+
+    with pytest.raises(TypeError):
+        related.to_model(Record, dict(name="a", codes=[dict(value="c")]))
+
+
+def test_trusted_per_call():
+    record = related.to_model(Record, INVALID, trusted=True)
+
+    # values are converted, not validated
+    assert record.name is None and record.count == 2
+    assert record.code.value == "ab"
+    assert [code.value for code in record.codes] == ["c"]
+    assert hash(record.code)
+
+    assert related.from_json(related.to_json(INVALID), Record,
+                             trusted=True).codes[0].value == "c"
+    assert related.from_yaml(related.to_yaml(INVALID), Record,
+                             trusted=True).code.value == "ab"
+    assert trust.active == 0 and trust.current_context() is None
+
+
+def test_trusted_defaults_and_post_init():
+    record = related.to_model(Record, dict(name=" b "), trusted=True)
+    assert (record.name, record.count, record.codes) == ("b", 0, [])
+
+    with pytest.raises(TypeError):
+        related.to_model(Record, dict(count=1), trusted=True)
+
+
+def test_trusted_context():
+    lines = [related.to_json(INVALID)] * 2
+
+    with related.Trusted() as context:
+        records = list(related.from_json_lines(lines, Record))
+        assert trust.current_context() is context
+
+    assert [record.count for record in records] == [2, 2]
+    assert (context.records, context.validated) == (2, 0)
+
+    # the generator is consumed outside of the with block
+    with pytest.raises(TypeError):
+        with related.Trusted():
+            records = related.from_yaml_all(related.to_yaml(INVALID), Record)
+        list(records)
+
+
+def test_sampled_validation():
+    records = [VALID, VALID, INVALID, VALID, INVALID, VALID]
+
+    with related.Trusted(sample=3) as context:
+        loaded = [related.to_model(Record, r) for r in records[:3]]
+
+        # the 4th record is sampled, with its children
+        with pytest.raises(TypeError):
+            related.to_model(Record, dict(VALID, codes=[dict(value="c")]))
+
+        loaded.extend(related.to_model(Record, r) for r in records[4:])
+
+    assert len(loaded) == 5
+    assert (context.records, context.validated) == (6, 2)
+
+    with pytest.raises(ValueError):
+        related.Trusted(sample=0)
+
+
+def test_sampled_records_with_children():
+    bad = dict(name="b", code=dict(value="ab"), codes=[dict(value="c")])
+    good_bytes = related.to_bytes(related.to_model(Record, VALID))
+    bad_bytes = related.to_bytes(related.to_model(Record, bad, trusted=True))
+    bad_yaml = "name: b\ncode: {value: ab}\n"
+
+    # the models of a record are validated (and counted) with the record,
+    # even if constructed before it (from_bytes) or without it (projection)
+    with related.Trusted(sample=2) as context:
+        related.from_bytes(good_bytes, Record)
+        assert related.from_bytes(bad_bytes, Record).code.value == "ab"
+        related.to_model(Record, VALID, ["code", "codes"])
+        assert related.to_model(Record, bad, ["code"]).code.value == "ab"
+
+        with pytest.raises(TypeError):
+            related.from_yaml(bad_yaml, Record)
+        assert related.from_yaml(bad_yaml, Record).code.value == "ab"
+
+    assert (context.records, context.validated) == (6, 3)
+
+
+def test_trusted_per_thread():
+    errors = []
+
+    def load():
+        try:
+            related.to_model(Record, INVALID)
+        except TypeError as e:
+            errors.append(e)
+
+    with related.Trusted():
+        thread = threading.Thread(target=load)
+        thread.start()
+        thread.join()
+
+    assert len(errors) == 1
@@ -1,8 +1,12 @@
 # coding=utf-8
-from related.types import TypedSequence, TypedMapping, TypedSet, ImmutableDict
+from related.types import (
+    TypedSequence, TypedArray, TypedMapping, TypedSet, ImmutableDict,
+    ORDERED_DICT
+)
 from attr.exceptions import FrozenInstanceError
 from related.converters import str_if_not_none
 from collections import OrderedDict
+import sys
 import pytest
 
 
@@ -70,8 +74,8 @@ def test_mapping():
     dct = OrderedDict(a=1, b=2, c=3)
     map = TypedMapping(int, dct)
     assert map == dct
-    assert str(map) == str(dct)
-    assert repr(map) == repr(dct)
+    assert str(map) == str(ORDERED_DICT(dct))
+    assert repr(map) == repr(ORDERED_DICT(dct))
     assert len(map) == len(dct)
 
     del map["b"]
@@ -108,3 +112,117 @@ def test_set():
 
     with pytest.raises(TypeError):
         typed.add(5)
+
+
+def test_unchecked_construction():
+    lst = ["a", "b"]
+    seq = TypedSequence(str, lst, check=False)
+    assert seq.list is lst
+
+    with pytest.raises(TypeError):
+        TypedSequence(str, ["a", 1])
+
+    values = {"a", "b"}
+    assert TypedSet(str, values, check=False).set is values
+
+    dct = OrderedDict(a=1)
+    assert TypedMapping(int, dct, check=False).dict is dct
+
+    with pytest.raises(TypeError):
+        TypedMapping(int, dict(a="1"))
+
+
+def test_frozen_containers():
+    seq = TypedSequence(str, ["a", "b"], frozen=True)
+    dct = TypedMapping(int, OrderedDict(a=1), frozen=True)
+    values = TypedSet(str, {"a"}, frozen=True)
+
+    for frozen in (seq, dct, values):
+        assert hash(frozen) == hash(frozen) == frozen._hash
+        assert frozen == frozen
+
+    assert hash(seq) == hash(("a", "b"))
+    assert seq == TypedSequence(str, ["a", "b"], frozen=True)
+
+    # hashes of both containers are cached once they are hashed
+    others = (TypedSequence(str, ["a"], frozen=True),
+              TypedMapping(int, OrderedDict(a=2), frozen=True),
+              TypedSet(str, {"b"}, frozen=True))
+    for frozen, other in zip((seq, dct, values), others):
+        assert frozen != other
+        hash(other)
+        assert frozen != other
+
+    with pytest.raises(FrozenInstanceError):
+        seq.append("c")
+    with pytest.raises(FrozenInstanceError):
+        seq[0] = "c"
+    with pytest.raises(FrozenInstanceError):
+        del seq[0]
+    with pytest.raises(FrozenInstanceError):
+        dct["b"] = 2
+    with pytest.raises(FrozenInstanceError):
+        del dct["a"]
+    with pytest.raises(FrozenInstanceError):
+        values.add("b")
+    with pytest.raises(FrozenInstanceError):
+        values.discard("a")
+
+    assert seq.list == ["a", "b"] and dict(dct) == dict(a=1)
+
+    with pytest.raises(TypeError):
+        hash(TypedSequence(str, ["a"]))
+
+
+def test_typed_array():
+    ints = TypedArray(int, [1, 2, 3])
+    assert ints.list.typecode == "q"
+    assert ints == [1, 2, 3] and ints == TypedSequence(int, [1, 2, 3])
+    assert ints == TypedArray(int, ints.list, check=False)
+    assert ints != TypedArray(float, [1.0, 2.0, 3.0])
+    assert ints[1:] == [2, 3] and list(ints) == [1, 2, 3]
+    assert str(ints) == repr(ints) == "[1, 2, 3]"
+
+    ints.append(4)
+    ints[0] = 0
+    del ints[1]
+    assert ints.tolist() == [0, 3, 4]
+
+    with pytest.raises(TypeError):
+        ints.append(None)
+    with pytest.raises(TypeError):
+        ints.append("5")
+    with pytest.raises(TypeError):
+        TypedArray(int, [1, 1.5])
+    with pytest.raises(TypeError):
+        TypedArray(str, ["a"])
+
+    flags = TypedArray(bool, [True, False])
+    assert flags[0] is True and flags[1] is False
+    assert flags[:1] == [True] and flags.tolist() == [True, False]
+
+    frozen = TypedArray(float, [0.5], frozen=True)
+    assert hash(frozen) == hash((0.5,))
+    assert frozen == TypedArray(float, [0.5])
+    with pytest.raises(FrozenInstanceError):
+        frozen.append(1.0)
+
+    other = TypedArray(float, [1.5], frozen=True)
+    hash(other)
+    assert frozen != other and frozen is not other and frozen == frozen
+
+
+def test_slotted_containers():
+    containers = (TypedSequence(int, [1]), TypedArray(int, [1]),
+                  TypedMapping(int, dict(a=1)), TypedSet(int, {1}))
+
+    for container in containers:
+        assert not hasattr(container, "__dict__")
+        assert sys.getsizeof(container) > sys.getsizeof(container._hash)
+
+    # the allowed types are shared by the containers of a class
+    assert containers[0].allowed_types is containers[3].allowed_types
+    assert TypedSequence(int, [], allow_none=False).allowed_types is int
+
+    mapping = TypedMapping(int, dict(b=2, a=1), check=False)
+    assert type(mapping.dict) is ORDERED_DICT and list(mapping) == ["b", "a"]